@@ -1,6 +1,5 @@
 import opt_einsum as oe
 import rosnet
-from pycompss.api.api import compss_wait_on
 import cotengra as ctg
 import math
 import argparse
@@ -85,38 +84,27 @@ def main():
     print(str(info).encode("utf-8"))
     print(str(math.log2(info.largest_intermediate)))
 
-    # find optimal cuts
-    if args.cut_size or args.cut_slices or args.cut_overhead:
-        sf = ctg.SliceFinder(
-            info,
-            target_size=int(args.cut_size) if args.cut_size else None,
-            target_overhead=float(args.cut_overhead) if args.cut_overhead else None,
-            target_slices=int(args.cut_slices) if args.cut_slices else None,
-            minimize=args.cut_minimize,
-            temperature=float(args.cut_temperature),
-        )
-        ix_sl, cost_sl = sf.search()
-        print(cost_sl)
-
-        signatures = eq.split("->")[0].split(",")
-        for i, (sign, tensor) in enumerate(zip(signatures, fakes)):
-            if any(label in ix_sl for label in sign):
-                blockshape = tuple(
-                    map(
-                        lambda x: 1 if x[1] else tensor.shape[x[0]],
-                        enumerate(label in ix_sl for label in sign),
-                    )
-                )
-                fakes[i].blockshape = blockshape
-
     # initialize tensors
-    tensors = [rosnet.rand(fake.shape, fake.blockshape) for fake in fakes]
+    tensors = [rosnet.rand(fake.shape) for fake in fakes]
+    itemsize = tensors[0].dtype.itemsize
 
-    # contract tn
+    # contract tn, slicing it to fit the cuts
     start = time.time()
-    a = oe.contract(eq, *tensors, optimize=opt, backend="rosnet")
+    a = rosnet.contract(
+        eq,
+        *tensors,
+        optimize=path,
+        memory_limit=int(args.cut_size) * itemsize if args.cut_size else None,
+        target_slices=int(args.cut_slices) if args.cut_slices else None,
+        slicing="cotengra",
+        slicing_options=dict(
+            target_overhead=float(args.cut_overhead) if args.cut_overhead else None,
+            minimize=args.cut_minimize,
+            temperature=float(args.cut_temperature),
+        ),
+    )
 
-    amplitude = compss_wait_on(a._blocks[()])
+    amplitude = np.asarray(a)
     end = time.time()
     print(f"Amplitude: {amplitude}")
     print(f"Time={end-start}", flush=True)
@@ -5,12 +5,18 @@ from rosnet.dispatch import *
 import rosnet.dispatch.linalg as linalg
 
 # NumPy methods whose output type cannot be inferred. defaults to BlockArray.
+# NOTE `rosnet.array` is the constructor, submodules are still importable (i.e. `from rosnet.array.shared import SharedArray`)
 # for other kinds of arrays, use `autoray.do(..., like="rosnet.CLASSNAME")`
 from rosnet.array.block import (
+    array,
     zeros,
     ones,
     full,
     rand,
 )
 
+from rosnet.core.executor import executor
+from rosnet.array.lazy import lazy, compute
+from rosnet.contraction import contract
+
 from rosnet.extra import *
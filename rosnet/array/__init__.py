@@ -1,4 +1,6 @@
 from rosnet.array.block import BlockArray
+from rosnet.array.lazy import LazyArray
+from rosnet.array.shared import SharedArray
 
 try:
     from rosnet.array.compss import COMPSsArray
@@ -1,4 +1,9 @@
+import bisect
+import functools
+import itertools
 import logging
+import operator
+import os
 import sys
 from copy import deepcopy
 from math import prod
@@ -6,12 +11,13 @@ from typing import Generic, Optional, Sequence, Tuple, Type, TypeVar
 
 import autoray
 import numpy as np
-from multimethod import multimethod
 from rosnet import dispatch as dispatcher
+from rosnet.core.executor import SequentialExecutor, get_executor
 from rosnet.core.interface import Array, ArrayConvertable
-from rosnet.core.macros import todo
-from rosnet.core.mixin import ArrayFunctionMixin
-from rosnet.core.util import isunique, join_idx, measure_shape, nest_level, result_shape, space
+from rosnet.core.kernel import tensordot_accumulate, tensordot_batched
+from rosnet.core.mixin import ArrayFunctionMixin, recording
+from rosnet.core.util import chunk_offsets, isunique, measure_shape, nest_level, normalize_axes, normalize_axis, normalize_chunks, rechunk_plan, result_shape, space, split_bounds
+from rosnet.tuning import mem
 
 logger = logging.getLogger(__name__)
 
@@ -33,7 +39,7 @@ class BlockArray(np.lib.mixins.NDArrayOperatorsMixin, ArrayFunctionMixin, Generi
     Implementation notes
     --------------------
     - All blocks are expected to have the same type and `dtype`.
-    - All blocks are expected to be equally sized.
+    - Blocks may be irregularly sized, but all the blocks in a slab of the grid must have the same size along the axis of the slab (like Dask chunks). The size of the blocks along each axis is given by `chunks`.
     - Automatic parametric type detection works only on Python 3.9 or later. On earlier versions, you must
     """
 
@@ -47,6 +53,7 @@ class BlockArray(np.lib.mixins.NDArrayOperatorsMixin, ArrayFunctionMixin, Generi
         else:
             raise ValueError("invalid constructor")
 
+        self.__check_chunks()
         self.__orig_class__ = GenericAlias(self.__class__, self.data.flat[0].__class__)
 
     def __init_with_list__(self, blocks: list, grid: Optional[Sequence[int]] = None):
@@ -84,6 +91,13 @@ class BlockArray(np.lib.mixins.NDArrayOperatorsMixin, ArrayFunctionMixin, Generi
                 else:
                     raise ValueError("blocks must provide an array-like interface")
 
+    def __check_chunks(self):
+        chunks = self.chunks
+        for idx in np.ndindex(*self.grid):
+            expected = tuple(c[i] for c, i in zip(chunks, idx))
+            if tuple(self.data[idx].shape) != expected:
+                raise ValueError(f"block {idx} has shape {tuple(self.data[idx].shape)} but {expected} was expected from the chunks of the grid")
+
     def __init_with_array__(self, arr):
         """Constructor."""
 
@@ -111,42 +125,91 @@ class BlockArray(np.lib.mixins.NDArrayOperatorsMixin, ArrayFunctionMixin, Generi
             return type(x)
 
     def __str__(self):
-        return "BlockArray(shape=%r, grid=%r, blockshape=%r, dtype=%r)" % (
+        return "BlockArray(shape=%r, grid=%r, chunks=%r, dtype=%r)" % (
             self.shape,
             self.grid,
-            self.blockshape,
+            self.chunks,
             self.dtype,
         )
 
-    @multimethod
-    def __getitem__(self, index: Sequence[int]):
-        # TODO advanced indexing
-        if len(index) != self.ndim:
-            raise IndexError(f"Invalid indexing: index={index}")
+    def __getitem__(self, key):
+        """Selects a subarray. Only the blocks touched by the selection are read.
+
+        Basic indexing (integers, slices and ellipsis) and a single 1-D advanced index (integer or boolean array) return a new `BlockArray` whose blocks are the touched blocks sliced (views, for `numpy.ndarray` blocks). Blocks completely covered by the selection are reused. Indexing with several advanced indices gathers the bounding box of the selection and returns a `numpy.ndarray`.
+        """
+        sels = _parse_key(key, self.shape)
 
-        gid = [i // s for i, s in zip(key, self.blockshape)]
-        bid = [i % s for i, s in zip(key, self.blockshape)]
+        if _is_fallback(sels):
+            bbox, key = _bounding_key(sels)
+            return np.asarray(self[bbox])[key]
 
-        return self.data[gid][bid]
+        runs = [_split_axis(sel, off) for sel, off in zip(sels, chunk_offsets(self.chunks))]
 
-    @multimethod
-    def __setitem__(self, key: Sequence[int], value):
-        # TODO advanced indexing
-        if len(key) != self.ndim:
-            raise IndexError(f"Invalid indexing: key={key}")
+        # case: single element
+        if all(isinstance(sel, int) for sel in sels):
+            bid, local = zip(*((r[0][0], r[0][1]) for r in runs))
+            return self.data[bid][local]
 
-        gid = [i // s for i, s in zip(key, self.blockshape)]
-        bid = [i % s for i, s in zip(key, self.blockshape)]
+        order = _result_axes(sels)
+        grid = np.empty(tuple(len(runs[ax]) for ax in order), dtype=object)
+        for gid in np.ndindex(grid.shape):
+            bid, local = _block_selection(runs, order, gid)
+            block = self.data[bid]
+            grid[gid] = block if all(isinstance(i, slice) and i == slice(None) for i in local) else block[local]
 
-        self.data[gid][bid] = value
+        return BlockArray(grid)
+
+    def __setitem__(self, key, value):
+        "Assigns `value` to a subarray. Only the blocks touched by the selection are written."
+        # NOTE in lazy mode, recorded operations that read this array must run before the write
+        graph = recording.get()
+        if graph is not None:
+            graph.record(operator.setitem, None, (self, key, value), {})
+            return
+
+        sels = _parse_key(key, self.shape)
+
+        if _is_fallback(sels):
+            bbox, key = _bounding_key(sels)
+            region = np.array(self[bbox])
+            region[key] = value
+            self[bbox] = region
+            return
+
+        runs = [_split_axis(sel, off) for sel, off in zip(sels, chunk_offsets(self.chunks))]
+        order = _result_axes(sels)
+        grid = tuple(len(runs[ax]) for ax in order)
+
+        value = np.asarray(value)
+        if value.ndim != 0:
+            value = np.broadcast_to(value, tuple(sum(r[2] for r in runs[ax]) for ax in order))
+        offsets = [tuple(itertools.accumulate((r[2] for r in runs[ax]), initial=0)) for ax in order]
+
+        for gid in np.ndindex(grid):
+            bid, local = _block_selection(runs, order, gid)
+            if value.ndim == 0:
+                self.data[bid][local] = value
+            else:
+                self.data[bid][local] = value[tuple(slice(off[i], off[i + 1]) for off, i in zip(offsets, gid))]
 
     @property
     def shape(self) -> Tuple[int]:
-        return tuple(np.multiply(self.grid, self.blockshape))
+        return tuple(sum(c) for c in self.chunks)
 
     @property
     def blockshape(self) -> Tuple[int]:
-        return self.data.flat[0].shape
+        "Shape of the first block. If chunks are regular, it is the shape of all blocks but the trailing ones."
+        return tuple(self.data.flat[0].shape)
+
+    @property
+    def chunks(self) -> Tuple[Tuple[int, ...], ...]:
+        "Size of the blocks along each axis."
+        return tuple(tuple(self.data[(0,) * i + (j,) + (0,) * (self.ndim - i - 1)].shape[i] for j in range(n)) for i, n in enumerate(self.grid))
+
+    @property
+    def isregular(self) -> bool:
+        "Whether all the blocks have the same shape."
+        return all(len(set(c)) == 1 for c in self.chunks)
 
     @property
     def nblock(self) -> int:
@@ -178,7 +241,7 @@ class BlockArray(np.lib.mixins.NDArrayOperatorsMixin, ArrayFunctionMixin, Generi
 
     @property
     def ndim(self) -> int:
-        return len(self.shape)
+        return self.data.ndim
 
     @property
     def dtype(self) -> np.dtype:
@@ -186,8 +249,8 @@ class BlockArray(np.lib.mixins.NDArrayOperatorsMixin, ArrayFunctionMixin, Generi
 
     def __deepcopy__(self, memo):
         grid = np.empty_like(self.data)
-        for i in self.nblock:
-            grid.flat[i] = deepcopy(self.data.flat[i])
+        for i in range(self.nblock):
+            grid.flat[i] = deepcopy(self.data.flat[i], memo)
 
         return BlockArray(grid)
 
@@ -195,37 +258,358 @@ class BlockArray(np.lib.mixins.NDArrayOperatorsMixin, ArrayFunctionMixin, Generi
         "Returns a numpy.ndarray. Uses class-parametric specialization with multimethod."
         return dispatcher.to_numpy(self)
 
-    @todo
     def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
-        pass
+        """Applies `ufunc` blockwise through the executor of the context.
+
+        Operands are broadcasted at the grid level: blocks of operands with a broadcasted axis are reused along that axis, `numpy.ndarray` operands are sliced to the blocks of the result and scalars are passed to every block. Operands whose chunks differ from those of the result are rechunked first.
+        """
+        graph = recording.get()
+        if graph is not None:
+            return graph.record(ufunc, method, inputs, kwargs)
+
+        # defer to lazy arrays
+        if method != "__call__" or any(getattr(type(x), "__lazy__", False) for x in inputs):
+            return NotImplemented
+
+        # defer to other classes overriding ufuncs
+        if any(hasattr(type(x), "__array_ufunc__") and not isinstance(x, (BlockArray, np.ndarray, np.generic)) for x in inputs + kwargs.get("out", ())):
+            return NotImplemented
+
+        return _ufunc_call(ufunc, inputs, **kwargs)
+
+
+def _ufunc_call(ufunc: np.ufunc, inputs, out=None, where=True, **kwargs):
+    inputs = [x if isinstance(x, BlockArray) or np.ndim(x) == 0 else np.asarray(x) for x in inputs]
+    operands = inputs
+    if isinstance(where, BlockArray) or np.ndim(where) != 0:
+        operands = inputs + [where if isinstance(where, BlockArray) else np.asarray(where)]
+    else:
+        kwargs["where"] = where
+
+    shape = np.broadcast_shapes(*(_shape(x) for x in operands))
+    if out is not None and any(_shape(o) != shape for o in out):
+        raise ValueError(f"non-broadcastable output operand with shape {[_shape(o) for o in out]} doesn't match the broadcast shape {shape}")
+
+    # chunks of the result, taken from the output operands or from the first operand that spans each axis
+    ndim = len(shape)
+    blockarrays = [x for x in (*(out or ()), *operands) if isinstance(x, BlockArray)]
+    chunks = []
+    for axis, n in enumerate(shape):
+        candidates = (x.chunks[axis - ndim + x.ndim] for x in blockarrays if axis >= ndim - x.ndim and x.shape[axis - ndim + x.ndim] == n)
+        chunks.append(next(candidates, (n,)))
+    chunks = tuple(chunks)
+
+    def align(x):
+        if not isinstance(x, BlockArray):
+            return x
+        lead = ndim - x.ndim
+        return dispatcher.rechunk(x, tuple(chunks[lead + i] if x.shape[i] == shape[lead + i] else x.chunks[i] for i in range(x.ndim)))
+
+    operands = [align(x) for x in operands]
+    offsets = chunk_offsets(chunks)
+    grid = tuple(len(c) for c in chunks)
+
+    gids = list(np.ndindex(grid))
+    blocks = [[_broadcast_block(x, gid, offsets, shape) for x in operands] for gid in gids]
+    outs = [[_broadcast_block(x, gid, offsets, shape) for x in out] for gid in gids] if out is not None else [None] * len(gids)
+
+    fn = functools.partial(_ufunc_block, ufunc=ufunc, kwargs=kwargs)
+    results = get_executor().map(fn, blocks, outs)
+
+    if out is not None:
+        # NOTE out blocks may be copies if the executor runs in other processes
+        for res, out_blocks in zip(results, outs):
+            for r, o in zip((res,) if ufunc.nout == 1 else res, out_blocks):
+                if r is not o:
+                    o[...] = r
+        return out[0] if ufunc.nout == 1 else out
+
+    arrays = []
+    for i in range(ufunc.nout):
+        data = np.empty(grid, dtype=object)
+        for gid, res in zip(gids, results):
+            data[gid] = res if ufunc.nout == 1 else res[i]
+        arrays.append(BlockArray(data))
+
+    return arrays[0] if ufunc.nout == 1 else tuple(arrays)
+
+
+def _broadcast_block(x, gid, offsets, shape):
+    "Returns the block of operand `x` that takes part in the block `gid` of a broadcasted operation of shape `shape`."
+    if len(_shape(x)) == 0:
+        return x
+
+    lead = len(shape) - x.ndim
+    if isinstance(x, BlockArray):
+        return x.data[tuple(gid[lead + i] if x.shape[i] == shape[lead + i] else 0 for i in range(x.ndim))]
+
+    return x[tuple(slice(offsets[lead + i][gid[lead + i]], offsets[lead + i][gid[lead + i] + 1]) if x.shape[i] == shape[lead + i] else slice(None) for i in range(x.ndim))]
+
+
+def _shape(x) -> Tuple[int, ...]:
+    return x.shape if isinstance(x, BlockArray) else tuple(np.shape(x))
+
+
+def _ufunc_block(operands, out, ufunc, kwargs):
+    inputs = operands[: ufunc.nin]
+    if len(operands) > ufunc.nin:
+        kwargs = {**kwargs, "where": operands[ufunc.nin]}
+    if out is not None:
+        kwargs = {**kwargs, "out": tuple(out)}
+
+    return ufunc(*inputs, **kwargs)
+
+
+def _parse_key(key, shape) -> list:
+    """Normalizes an indexing key into one selector per axis: `int`, `slice` or `numpy.ndarray` of integers.
+
+    Negative integers are wrapped and boolean arrays are converted into integer arrays, one for each axis they span.
+    """
+    if not isinstance(key, tuple):
+        key = (key,)
+
+    sels = []
+    for k in key:
+        if k is None:
+            raise IndexError("BlockArray does not support numpy.newaxis")
+        elif k is Ellipsis or isinstance(k, slice):
+            sels.append(k)
+        elif isinstance(k, (bool, np.bool_)):
+            # NOTE `bool` is a subclass of `int`, but NumPy treats boolean scalars as a new axis
+            raise IndexError("BlockArray does not support boolean scalar indices")
+        elif isinstance(k, (int, np.integer)):
+            sels.append(int(k))
+        else:
+            k = np.asarray(k)
+            if k.size == 0 and k.dtype != bool:
+                k = k.astype(np.intp)
+
+            if k.dtype == bool and k.ndim > 0:
+                sels.extend(np.nonzero(k))
+            elif np.issubdtype(k.dtype, np.integer):
+                sels.append(int(k) if k.ndim == 0 else k)
+            else:
+                raise IndexError("only integers, slices, ellipsis and integer or boolean arrays are valid indices")
+
+    ellipsis = [i for i, k in enumerate(sels) if k is Ellipsis]
+    if len(ellipsis) > 1:
+        raise IndexError("an index can only have a single ellipsis ('...')")
+
+    for i in ellipsis:
+        sels[i : i + 1] = [slice(None)] * (len(shape) - len(sels) + 1)
+
+    if len(sels) > len(shape):
+        raise IndexError(f"too many indices for array: array is {len(shape)}-dimensional, but {len(sels)} were indexed")
+
+    sels += [slice(None)] * (len(shape) - len(sels))
+
+    for axis, (k, n) in enumerate(zip(sels, shape)):
+        if isinstance(k, int):
+            if not -n <= k < n:
+                raise IndexError(f"index {k} is out of bounds for axis {axis} with size {n}")
+            sels[axis] = k % n
+        elif isinstance(k, np.ndarray):
+            if np.any((k < -n) | (k >= n)):
+                raise IndexError(f"index out of bounds for axis {axis} with size {n}")
+            sels[axis] = np.where(k < 0, k + n, k)
+
+    return sels
+
+
+def _is_fallback(sels) -> bool:
+    "Whether the selection cannot be computed blockwise, i.e. there are several advanced indices."
+    arrays = [sel for sel in sels if isinstance(sel, np.ndarray)]
+    return len(arrays) > 1 or any(arr.ndim != 1 for arr in arrays)
+
+
+def _bounding_key(sels):
+    "Returns a basic indexing key to the bounding box of the selection and the key to apply on the bounding box."
+    bbox, key = [], []
+    for sel in sels:
+        if isinstance(sel, int):
+            bbox.append(slice(sel, sel + 1))
+            key.append(0)
+        elif isinstance(sel, slice):
+            bbox.append(sel)
+            key.append(slice(None))
+        elif sel.size == 0:
+            bbox.append(slice(0, 0))
+            key.append(sel)
+        else:
+            lo = int(sel.min())
+            bbox.append(slice(lo, int(sel.max()) + 1))
+            key.append(sel - lo)
+
+    return tuple(bbox), tuple(key)
+
+
+def _split_axis(sel, offsets) -> list:
+    """Splits the selector of an axis into the blocks it touches.
+
+    Returns a list of `(block, local selector, length)` tuples, one for each touched block in order of selection.
+    """
+    if isinstance(sel, int):
+        j = bisect.bisect_right(offsets, sel) - 1
+        return [(j, sel - offsets[j], 1)]
+
+    idx = np.arange(*sel.indices(offsets[-1])) if isinstance(sel, slice) else sel
+    if idx.size == 0:
+        return [(0, slice(0, 0) if isinstance(sel, slice) else idx, 0)]
+
+    blocks = np.searchsorted(offsets, idx, side="right") - 1
+    bounds = [0, *(np.flatnonzero(np.diff(blocks)) + 1), idx.size]
+
+    runs = []
+    for begin, end in zip(bounds[:-1], bounds[1:]):
+        j = int(blocks[begin])
+        local = idx[begin:end] - offsets[j]
+
+        if isinstance(sel, slice):
+            step = sel.step or 1
+            first, last = int(local[0]), int(local[-1])
+            if step == 1 and first == 0 and last == offsets[j + 1] - offsets[j] - 1:
+                local = slice(None)
+            elif step > 0:
+                local = slice(first, last + 1, step)
+            else:
+                local = slice(first, last - 1 if last > 0 else None, step)
+
+        runs.append((j, local, end - begin))
+
+    return runs
+
+
+def _result_axes(sels) -> list:
+    """Returns the axes of the array that remain in the result of the selection, in the order of the result.
+
+    As in NumPy, if advanced indices (arrays and integers) are not adjacent, the dimension of the advanced index goes first.
+    """
+    kept = [axis for axis, sel in enumerate(sels) if not isinstance(sel, int)]
+    advanced = [axis for axis, sel in enumerate(sels) if isinstance(sel, np.ndarray)]
+
+    if advanced:
+        advanced += [axis for axis, sel in enumerate(sels) if isinstance(sel, int)]
+        if max(advanced) - min(advanced) + 1 != len(advanced):
+            kept.remove(advanced[0])
+            kept.insert(0, advanced[0])
+
+    return kept
+
+
+def _block_selection(runs, order, gid):
+    "Returns the block index and the local key of the block at position `gid` of the result grid."
+    choice = [r[0] for r in runs]
+    for axis, i in zip(order, gid):
+        choice[axis] = runs[axis][i]
+
+    return tuple(c[0] for c in choice), tuple(c[1] for c in choice)
 
 
 @dispatcher.to_numpy.register
-def to_numpy(arr: BlockArray) -> np.ndarray:
-    return np.block(arr.data.tolist())
+def to_numpy(arr: BlockArray, out: Optional[np.ndarray] = None, memmap=None) -> np.ndarray:
+    """Gathers the blocks of `arr` into a single `numpy.ndarray`.
+
+    Blocks are fetched one at a time and copied straight into their place of the output, so at most one block is held in memory besides the result.
+
+    Arguments
+    ---------
+    - out: numpy.ndarray, optional. Preallocated output of shape `arr.shape`.
+    - memmap: str or path-like, optional. Writes the result to a `.npy` file and returns it as a `numpy.memmap`. Allows gathering arrays larger than memory.
+    """
+    if out is not None and memmap is not None:
+        raise ValueError("'out' and 'memmap' arguments are mutually exclusive")
+
+    if memmap is not None:
+        out = np.lib.format.open_memmap(memmap, mode="w+", dtype=arr.dtype, shape=arr.shape)
+    elif out is None:
+        out = np.empty(arr.shape, dtype=arr.dtype)
+    elif out.shape != arr.shape:
+        raise ValueError(f"output shape {out.shape} does not match array shape {arr.shape}")
+
+    offsets = chunk_offsets(arr.chunks)
+    for bid in np.ndindex(arr.grid):
+        key = tuple(slice(offsets[i][j], offsets[i][j + 1]) for i, j in enumerate(bid))
+        out[key] = np.asarray(arr.data[bid])
+
+    if isinstance(out, np.memmap):
+        out.flush()
 
+    return out
 
-def zeros(shape, dtype=None, order="C", blockshape=None, inner="numpy") -> BlockArray:
-    return full(shape, 0, dtype=dtype, order=order, blockshape=blockshape, inner=inner)
 
+def zeros(shape, dtype=None, order="C", blockshape=None, inner="numpy", executor=None) -> BlockArray:
+    return full(shape, 0, dtype=dtype or np.float64, order=order, blockshape=blockshape, inner=inner, executor=executor)
 
-def ones(shape, dtype=None, order="C", blockshape=None, inner="numpy") -> BlockArray:
-    return full(shape, 1, dtype=dtype, order=order, blockshape=blockshape, inner=inner)
 
+def ones(shape, dtype=None, order="C", blockshape=None, inner="numpy", executor=None) -> BlockArray:
+    return full(shape, 1, dtype=dtype or np.float64, order=order, blockshape=blockshape, inner=inner, executor=executor)
 
-def full(shape, fill_value, dtype=None, order="C", blockshape=None, inner="numpy") -> BlockArray:
+
+def full(shape, fill_value, dtype=None, order="C", blockshape=None, inner="numpy", executor=None) -> BlockArray:
+    """Returns a new `BlockArray` filled with `fill_value`.
+
+    `blockshape` gives either the size of the blocks along each axis (trailing blocks keep the remainder) or the explicit chunks of each axis (i.e. `((2, 2, 1), 3)`).
+    """
     dtype = dtype or np.dtype(type(fill_value))
-    blockshape = blockshape or shape
-    grid = tuple(s // bs for s, bs in zip(shape, blockshape))
+    chunks = normalize_chunks(shape, blockshape)
 
-    blocks = np.empty(grid, dtype=object)
-    it = np.nditer(blocks, flags=["refs_ok", "multi_index"], op_flags=["writeonly"])
+    fn = functools.partial(_full_block, fill_value=fill_value, dtype=dtype, order=order, inner=inner)
+    blocks = get_executor(executor).map(fn, _blockshapes(chunks))
 
-    with it:
-        for block in it:
-            block[()] = autoray.do("full", blockshape, fill_value, dtype=dtype, order=order, like=inner)
+    return BlockArray(blocks, grid=tuple(len(c) for c in chunks))
 
-    return BlockArray(blocks)
+
+def _blockshapes(chunks):
+    "Returns the shape of each block of the grid described by `chunks`, in C-order."
+    return [tuple(c[i] for c, i in zip(chunks, idx)) for idx in space(len(c) for c in chunks)]
+
+
+def _full_block(blockshape, fill_value, dtype, order, inner):
+    return autoray.do("full", blockshape, fill_value, dtype=dtype, order=order, like=inner)
+
+
+@dispatcher.rechunk.register
+def rechunk(arr: BlockArray, blockshape, executor=None) -> BlockArray:
+    """Returns `arr` divided in blocks of shape `blockshape` (or with explicit chunks, as in `full`).
+
+    Each target block is assembled from the pieces of the source blocks that overlap it, so peak memory is bounded by the blocks in flight. Source blocks that are also target blocks are reused.
+    """
+    chunks = normalize_chunks(arr.shape, blockshape)
+    if chunks == arr.chunks:
+        return arr
+
+    grid = np.empty(tuple(len(c) for c in chunks), dtype=object)
+    tasks = []
+    for tid, shape, pieces in rechunk_plan(arr.chunks, chunks):
+        if _is_whole_block(pieces):
+            grid[tid] = arr.data[pieces[0][0]]
+        else:
+            tasks.append((tid, shape, pieces))
+
+    fn = functools.partial(_assemble_block, dtype=arr.dtype)
+    blocks = get_executor(executor).map(
+        fn,
+        [shape for _, shape, _ in tasks],
+        [[arr.data[bid] for bid, _, _ in pieces] for _, _, pieces in tasks],
+        [[(src, dst) for _, src, dst in pieces] for _, _, pieces in tasks],
+    )
+    for (tid, _, _), block in zip(tasks, blocks):
+        grid[tid] = block
+
+    return BlockArray(grid)
+
+
+def _is_whole_block(pieces) -> bool:
+    "Whether a rechunked block is exactly a block of the source array."
+    return len(pieces) == 1 and all(k == slice(None) for k in (*pieces[0][1], *pieces[0][2]))
+
+
+def _assemble_block(shape, blocks, keys, dtype):
+    "Assembles a block from pieces of other blocks."
+    out = np.empty(shape, dtype=dtype)
+    for block, (src, dst) in zip(blocks, keys):
+        out[dst] = block[src]
+    return out
 
 
 @dispatcher.zeros_like.register
@@ -249,131 +633,455 @@ def empty_like(prototype: BlockArray, dtype=None, order="K", subok=True, shape=N
 
 
 @dispatcher.reshape.register
-def reshape(a: BlockArray, shape, order="F", inplace=True):
+def reshape(a: BlockArray, shape, order="F", inplace=False, executor=None):
     a = a if inplace else deepcopy(a)
 
     # TODO reshape blocks? or blockshape? for now, blockshape
-    for i, block in enumerate(a.data.flat):
-        a.data.flat[i] = autoray.do("reshape", block, shape, order=order)
-
-    a.__blockshape = shape
+    fn = functools.partial(_reshape_block, shape=shape, order=order)
+    for i, block in enumerate(get_executor(executor).map(fn, a.data.flat)):
+        a.data.flat[i] = block
 
     return a
 
 
+def _reshape_block(block, shape, order):
+    return autoray.do("reshape", block, shape, order=order)
+
+
 @dispatcher.transpose.register
-def transpose(a: BlockArray, axes=None, inplace=True):
-    # pylint: disable=protected-access
+def transpose(a: BlockArray, axes=None, inplace=False, executor=None):
+    if axes is None:
+        axes = tuple(range(a.ndim))[::-1]
+
     if not isunique(axes):
         raise ValueError("'axes' must be a unique list: %s" % axes)
 
-    a = a if inplace else deepcopy(a)
+    # NOTE blocks are transposed in new grid, so the input array is left untouched when not in-place
+    fn = functools.partial(autoray.do, "transpose", axes=axes)
+    blocks = np.empty_like(a.data)
+    for i, block in enumerate(get_executor(executor).map(fn, a.data.flat)):
+        blocks.flat[i] = block
 
-    for i, block in enumerate(a.data.flat):
-        a.data.flat[i] = autoray.do("transpose", block, axes)
+    blocks = np.transpose(blocks, axes)
 
-    a.data = np.transpose(a.data, axes)
-    a.__blockshape = tuple(a.__blockshape[i] for i in axes)
+    if inplace:
+        a.data = blocks
+        return a
 
-    return a
+    return BlockArray(blocks)
+
+
+def _align(arrays: Sequence[BlockArray], axis: Optional[int] = None, executor=None) -> list:
+    """Returns `arrays` with the chunks of the first array on every axis but `axis`, casted to a common dtype.
+
+    Arrays that are already aligned are returned as they are. Otherwise, only the blocks crossing a misaligned boundary are moved.
+    """
+    ref = arrays[0]
+    if any(arr.ndim != ref.ndim or any(i != axis and n != m for i, (n, m) in enumerate(zip(arr.shape, ref.shape))) for arr in arrays):
+        raise ValueError(f"all the input array dimensions except for the concatenation axis must match exactly: {[arr.shape for arr in arrays]}")
+
+    dtype = np.result_type(*(arr.dtype for arr in arrays))
+
+    aligned = []
+    for arr in arrays:
+        arr = dispatcher.rechunk(arr, tuple(arr.chunks[i] if i == axis else c for i, c in enumerate(ref.chunks)))
+        if arr.dtype != dtype:
+            fn = functools.partial(_astype_block, dtype=dtype)
+            arr = BlockArray(list(get_executor(executor).map(fn, arr.data.flat)), grid=arr.grid)
+        aligned.append(arr)
+
+    return aligned
+
+
+def _astype_block(block, dtype):
+    return block.astype(dtype)
+
+
+@dispatcher.concatenate.register
+def concatenate(arrays: Sequence[BlockArray], axis=0, executor=None) -> BlockArray:
+    """Joins a sequence of arrays along an existing axis.
+
+    The result reuses the blocks of the inputs: grids are concatenated and no data is moved. If the chunks of the other axes differ between arrays, the blocks crossing a misaligned boundary are rechunked first.
+    """
+    (axis,) = normalize_axis(axis, arrays[0].ndim)
+    arrays = _align(arrays, axis, executor)
+    return BlockArray(np.concatenate([arr.data for arr in arrays], axis=axis))
+
+
+@dispatcher.stack.register
+def stack(arrays: Sequence[BlockArray], axis=0, out=None, executor=None) -> BlockArray:
+    """Joins a sequence of arrays of the same shape along a new axis.
+
+    Every block is reshaped to have a new axis of length 1, and the grids are stacked along it, so blocks are not copied (for `numpy.ndarray` blocks).
+    """
+    if out is not None:
+        raise NotImplementedError("'out' is not supported")
+
+    (axis,) = normalize_axis(axis, arrays[0].ndim + 1)
+    arrays = _align(arrays, executor=executor)
+
+    grids = []
+    for arr in arrays:
+        shapes = [block.shape[:axis] + (1,) + block.shape[axis:] for block in arr.data.flat]
+        grid = np.empty_like(arr.data)
+        for i, block in enumerate(get_executor(executor).map(functools.partial(_reshape_block, order="C"), arr.data.flat, shapes)):
+            grid.flat[i] = block
+        grids.append(grid)
+
+    return BlockArray(np.stack(grids, axis=axis))
+
+
+@dispatcher.split.register
+def split(ary: BlockArray, indices_or_sections, axis=0) -> list:
+    """Splits an array into multiple subarrays along `axis`, as `numpy.split`.
+
+    Blocks lying between two split points are reused in the subarrays. Only the blocks crossing a split point are sliced (views, for `numpy.ndarray` blocks).
+    """
+    (axis,) = normalize_axis(axis, ary.ndim)
+    return [ary[(slice(None),) * axis + (slice(start, stop),)] for start, stop in split_bounds(ary.shape[axis], indices_or_sections)]
 
 
 @dispatcher.tensordot.register
 def tensordot(a: Sequence[Array], b: Sequence[Array], axes) -> Array:
+    if all(isinstance(x, np.ndarray) for x in itertools.chain(a, b)):
+        return tensordot_accumulate(a, b, axes)
+
     return sum(np.tensordot(ai, bi, axes) for ai, bi in zip(a, b))
 
 
+def _tensordot_blocks(a, b, axes):
+    "Calls the specialized `tensordot` routine for the inner blocks of an output block."
+    return dispatcher.tensordot(a, b, axes)
+
+
+# blocks of at most this number of elements are contracted with batched `numpy.matmul` calls by default
+BATCH_THRESHOLD = 4096
+
+
+@functools.lru_cache(maxsize=256)
+def _tensordot_plan(grid_a: Tuple[int, ...], grid_b: Tuple[int, ...], axes: Tuple[Tuple[int, ...], Tuple[int, ...]]):
+    """Pairs the blocks of a blocked `tensordot`.
+
+    Returns the grid of the result and two arrays `ids_a` and `ids_b` of flat block indices (C-order), such that the output block `i * len(ids_b) + j` contracts blocks `ids_a[i]` of `a` with blocks `ids_b[j]` of `b`.
+    """
+    outer_a = [i for i in range(len(grid_a)) if i not in axes[0]]
+    outer_b = [i for i in range(len(grid_b)) if i not in axes[1]]
+    inner = prod(grid_a[i] for i in axes[0])
+
+    ids_a = np.arange(prod(grid_a)).reshape(grid_a).transpose(outer_a + list(axes[0])).reshape(-1, inner)
+    ids_b = np.arange(prod(grid_b)).reshape(grid_b).transpose(outer_b + list(axes[1])).reshape(-1, inner)
+    ids_a.flags.writeable = ids_b.flags.writeable = False
+
+    grid = tuple(grid_a[i] for i in outer_a) + tuple(grid_b[i] for i in outer_b)
+    return grid, ids_a, ids_b
+
+
+def _fit_tensordot(a: BlockArray, b: BlockArray, axes, memory_limit: int) -> Tuple[BlockArray, BlockArray]:
+    "Rechunks `a` and `b` so that contracting any pair of their blocks fits in `memory_limit` bytes."
+    axes = normalize_axes(axes, a.ndim)
+    blockshape_a = tuple(max(c) for c in a.chunks)
+    blockshape_b = tuple(max(c) for c in b.chunks)
+    dtype = np.result_type(a.dtype, b.dtype)
+
+    bs_a, bs_b = mem.tensordot_blockshape(blockshape_a, blockshape_b, axes, dtype, memory_limit)
+    if bs_a != blockshape_a:
+        a = dispatcher.rechunk(a, bs_a)
+    if bs_b != blockshape_b:
+        b = dispatcher.rechunk(b, bs_b)
+
+    return a, b
+
+
+def _tensordot_blocks_of(a: BlockArray, b: BlockArray, axes):
+    """Normalizes `axes` and pairs the blocks of a blocked `tensordot`.
+
+    Returns the normalized axes, the grid of the result and the lists of blocks of `a` (one per row of output blocks) and of `b` (one per column), such that the output block `(i, j)` (in C-order) contracts `blocks_a[i]` with `blocks_b[j]`.
+    """
+    axes_a, axes_b = normalize_axes(axes, a.ndim)
+    axes = tuple(i % a.ndim for i in axes_a), tuple(i % b.ndim for i in axes_b)
+
+    chunks_a, chunks_b = a.chunks, b.chunks
+    for i, j in zip(*axes):
+        if chunks_a[i] != chunks_b[j]:
+            raise ValueError(f"chunks of contracted axes do not match: {chunks_a[i]} (axis {i}) != {chunks_b[j]} (axis {j})")
+
+    grid, ids_a, ids_b = _tensordot_plan(a.grid, b.grid, axes)
+    return axes, grid, a.data.ravel()[ids_a].tolist(), b.data.ravel()[ids_b].tolist()
+
+
+def _tensordot_batch(pairs, axes) -> list:
+    return tensordot_batched([x for x, _ in pairs], [y for _, y in pairs], axes)
+
+
 @dispatcher.tensordot.register
-def tensordot(a: BlockArray, b: BlockArray, axes):
-    # pylint: disable=protected-access
-    # TODO assertions
-
-    outer_axes = [list(set(range(i.ndim)) - set(ax)) for ax, i in zip(axes, (a, b))]
-    outer_iter_a, inner_iter_a = np.nested_iters(
-        a.data,
-        [outer_axes[0], axes[0]],
-        op_flags=["readonly"],
-        flags=["multi_index", "refs_ok"],
-    )
-    outer_iter_b, inner_iter_b = np.nested_iters(
-        b.data,
-        [outer_axes[1], axes[1]],
-        op_flags=["readonly"],
-        flags=["multi_index", "refs_ok"],
-    )
+def tensordot(a: BlockArray, b: BlockArray, axes, executor=None, batch: Optional[bool] = None, memory_limit: Optional[int] = None):
+    """Blocked `tensordot`. Each output block is computed by the specialized `tensordot` of the block sequences it depends on.
+
+    Arguments
+    ---------
+    - executor: str or Executor, optional. Executor that computes the output blocks.
+    - batch: bool, optional. Contract blocks of the same shape together with batched `numpy.matmul` calls instead of one call per output block, with one batch per worker of `executor`. Defaults to batching `numpy.ndarray` blocks of at most `BATCH_THRESHOLD` elements when `executor` is sequential.
+    - memory_limit: int, optional. Maximum bytes used by the contraction of a pair of blocks. If exceeded, operands are rechunked into smaller blocks (see `rosnet.tuning.mem.tensordot_blockshape`).
+    """
+    if memory_limit is not None:
+        a, b = _fit_tensordot(a, b, axes, memory_limit)
+
+    axes, grid, blocks_a, blocks_b = _tensordot_blocks_of(a, b, axes)
+    pairs = list(itertools.product(blocks_a, blocks_b))
+
+    executor = get_executor(executor)
+    if batch is None:
+        # NOTE a single batch runs in the calling thread, so it is only the default when blocks are not spread over workers anyway
+        blocks = itertools.chain(a.data.flat, b.data.flat)
+        batch = isinstance(executor, SequentialExecutor) and all(isinstance(x, np.ndarray) and x.size <= BATCH_THRESHOLD for x in blocks)
+
+    if batch:
+        # one batch per worker
+        n = min(getattr(executor, "max_workers", 1), len(pairs))
+        bounds = [len(pairs) * i // n for i in range(n + 1)]
+        chunks = [pairs[start:stop] for start, stop in zip(bounds, bounds[1:])]
+        results = [block for chunk in executor.map(functools.partial(_tensordot_batch, axes=axes), chunks) for block in chunk]
+    else:
+        # call specialized tensordot routine for each output block
+        fn = functools.partial(_tensordot_blocks, axes=axes)
+        results = executor.map(fn, (x for x, _ in pairs), (y for _, y in pairs))
+
+    res = np.empty(grid, dtype=object)
+    for i, block in enumerate(results):
+        res.flat[i] = block
+
+    return BlockArray(res)
+
+
+def _tree_reduce(a: BlockArray, fn, combine, axis=None, keepdims=False, executor=None):
+    """Reduces `a` along `axis` with a pairwise tree of block operations.
+
+    `fn(block, axis, keepdims)` reduces each block and `combine(x, y)` merges two partial results. Each level of the tree merges neighbouring blocks concurrently, so the depth grows logarithmically with the number of blocks along the reduced axes.
+    """
+    axis = normalize_axis(axis, a.ndim)
+    executor = get_executor(executor)
+
+    grid = np.empty(a.grid, dtype=object)
+    for i, block in enumerate(executor.map(functools.partial(fn, axis=axis, keepdims=True), a.data.flat)):
+        grid.flat[i] = block
+
+    for ax in axis:
+        while grid.shape[ax] > 1:
+            n = grid.shape[ax]
+            left = np.take(grid, range(0, n - 1, 2), axis=ax)
+            right = np.take(grid, range(1, n, 2), axis=ax)
+
+            merged = np.empty(left.shape, dtype=object)
+            for i, block in enumerate(executor.map(combine, left.flat, right.flat)):
+                merged.flat[i] = block
+
+            # the odd block out is merged in the next level
+            if n % 2:
+                merged = np.concatenate([merged, np.take(grid, [n - 1], axis=ax)], axis=ax)
+            grid = merged
+
+    if keepdims:
+        return BlockArray(grid)
+
+    if len(axis) == a.ndim:
+        return np.asarray(grid.flat[0]).reshape(())[()]
 
-    grid = np.empty(outer_iter_a.shape + outer_iter_b.shape, dtype=object)
-
-    for _ in outer_iter_a:
-        for _ in outer_iter_b:
-            idx = outer_iter_a.multi_index + outer_iter_b.multi_index
-
-            bid_a = (
-                join_idx(
-                    outer_iter_a.multi_index,
-                    inner_iter_a.multi_index,
-                    axes[0],
-                )
-                for _ in inner_iter_a
-            )
-            bid_b = (
-                join_idx(
-                    outer_iter_b.multi_index,
-                    inner_iter_b.multi_index,
-                    axes[1],
-                )
-                for _ in inner_iter_b
-            )
-
-            # call specialized tensordot routine
-            grid[idx] = tensordot([a.data[i] for i in bid_a], [b.data[i] for i in bid_b], axes)
-
-            # reset inner block iterators
-            inner_iter_a.reset()
-            inner_iter_b.reset()
-        outer_iter_b.reset()
+    grid = grid.reshape(tuple(n for i, n in enumerate(grid.shape) if i not in axis))
+    for i, block in enumerate(grid.flat):
+        grid.flat[i] = _reshape_block(block, tuple(n for j, n in enumerate(block.shape) if j not in axis), "C")
 
     return BlockArray(grid)
 
 
-# @todo
-# @implements(np.array, BlockArray)
-# def array(
-#     arr: np.ndarray,
-#     dtype=None,
-#     blockshape=None,
-#     copy=True,
-#     order="K",
-#     subok=False,
-#     ndmin=0,
-# ):
-#     """
-#     `dtype`, `copy`, `order`, `subok` and `ndmin` ignored at the moment.
-#     """
-#     shape = arr.shape
-#     blockshape = shape if blockshape is None else blockshape
-#     grid = [s // bs for s, bs in zip(shape, blockshape)]
-
-#     blocks = []
-#     for bidx in space(grid):
-#         idx_begin = [x * y for x, y in zip(blockshape, bidx)]
-#         idx_end = [x + y for x, y in zip(blockshape, idx_begin)]
-#         idx = tuple(slice(b, e) for b, e in zip(idx_begin, idx_end))
-#         block = arr[idx]
-#         blocks.append(COMPSsArray(block, shape=blockshape, dtype=arr.dtype))
-
-#     blocks = ndarray_from_list(blocks, grid)
-#     return BlockArray(blocks)
-
-
-def rand(shape, blockshape=None, inner="numpy"):
-    blockshape = shape if blockshape is None else blockshape
-    grid = tuple(s // bs for s, bs in zip(shape, blockshape))
-    blocks = np.empty_like(grid, dtype=object)
-    it = np.nditer(blocks, flags=["refs_ok", "multi_index"], op_flags=["writeonly"])
-
-    with it:
-        for block in it:
-            block[()] = autoray.do("random.rand", *blockshape, like=inner)
+def _reduce_block(block, axis, keepdims, reduction, **kwargs):
+    return reduction(block, axis=axis, keepdims=keepdims, **kwargs)
 
-    return BlockArray(blocks)
+
+def _norm_block(block, axis, keepdims, ord):
+    block = np.abs(block)
+    if ord == np.inf:
+        return np.max(block, axis=axis, keepdims=keepdims)
+    if ord == -np.inf:
+        return np.min(block, axis=axis, keepdims=keepdims)
+    if ord == 0:
+        return np.sum(block != 0, axis=axis, keepdims=keepdims, dtype=block.dtype)
+    if ord == 1:
+        return np.sum(block, axis=axis, keepdims=keepdims)
+    return np.sum(block**ord, axis=axis, keepdims=keepdims)
+
+
+@dispatcher.sum.register
+def _(a: BlockArray, axis=None, dtype=None, out=None, keepdims=False, executor=None):
+    if out is not None:
+        raise NotImplementedError("'out' argument is not supported")
+
+    fn = functools.partial(_reduce_block, reduction=np.sum, dtype=dtype)
+    return _tree_reduce(a, fn, np.add, axis=axis, keepdims=keepdims, executor=executor)
+
+
+@dispatcher.prod.register
+def _(a: BlockArray, axis=None, dtype=None, out=None, keepdims=False, executor=None):
+    if out is not None:
+        raise NotImplementedError("'out' argument is not supported")
+
+    fn = functools.partial(_reduce_block, reduction=np.prod, dtype=dtype)
+    return _tree_reduce(a, fn, np.multiply, axis=axis, keepdims=keepdims, executor=executor)
+
+
+@dispatcher.max.register
+def _(a: BlockArray, axis=None, out=None, keepdims=False, executor=None):
+    if out is not None:
+        raise NotImplementedError("'out' argument is not supported")
+
+    fn = functools.partial(_reduce_block, reduction=np.max)
+    return _tree_reduce(a, fn, np.maximum, axis=axis, keepdims=keepdims, executor=executor)
+
+
+@dispatcher.min.register
+def _(a: BlockArray, axis=None, out=None, keepdims=False, executor=None):
+    if out is not None:
+        raise NotImplementedError("'out' argument is not supported")
+
+    fn = functools.partial(_reduce_block, reduction=np.min)
+    return _tree_reduce(a, fn, np.minimum, axis=axis, keepdims=keepdims, executor=executor)
+
+
+@dispatcher.mean.register
+def _(a: BlockArray, axis=None, dtype=None, out=None, keepdims=False, executor=None):
+    if out is not None:
+        raise NotImplementedError("'out' argument is not supported")
+
+    if dtype is None and a.dtype.kind in "biu":
+        dtype = np.float64
+
+    count = prod(a.shape[i] for i in normalize_axis(axis, a.ndim))
+    return dispatcher.sum(a, axis=axis, dtype=dtype, keepdims=keepdims, executor=executor) / count
+
+
+@dispatcher.linalg.norm.register
+def _(x: BlockArray, ord=None, axis=None, keepdims=False, executor=None):
+    """Vector norms and the Frobenius norm of `x`, computed with a tree reduction over blocks.
+
+    Matrix norms other than the Frobenius norm are not supported.
+    """
+    axes = normalize_axis(axis, x.ndim)
+    if ord is None or (ord == "fro" and len(axes) == 2):
+        ord = 2
+    elif len(axes) != 1 and not (axis is None and x.ndim == 1):
+        raise NotImplementedError(f"matrix norm of order {ord} is not supported")
+    elif isinstance(ord, str):
+        raise ValueError(f"invalid norm order '{ord}' for vectors")
+
+    combine = np.maximum if ord == np.inf else np.minimum if ord == -np.inf else np.add
+    res = _tree_reduce(x, functools.partial(_norm_block, ord=ord), combine, axis=axis, keepdims=keepdims, executor=executor)
+
+    if ord in (0, 1, np.inf, -np.inf):
+        return res
+    if ord == 2:
+        return np.sqrt(res)
+    return res ** (1 / ord)
+
+
+@dispatcher.count_nonzero.register
+def count_nonzero(a: BlockArray, axis=None, keepdims=False, executor=None):
+    "Counts the non-zero elements of `a` along `axis`, with a count per block followed by a tree reduction."
+    fn = functools.partial(_reduce_block, reduction=np.count_nonzero)
+    return _tree_reduce(a, fn, np.add, axis=axis, keepdims=keepdims, executor=executor)
+
+
+@dispatcher.cumsum.register
+def cumsum(a: BlockArray, axis=None, dtype=None, out=None, executor=None) -> BlockArray:
+    """Cumulative sum of `a` along `axis`, computed as a parallel prefix scan.
+
+    Blocks are scanned locally and concurrently. Then, an exclusive scan of the block totals (the last slice of each scanned block) gives the offset of every block, which is added blockwise. Only the block totals, one slice per block, are combined sequentially.
+
+    Arguments
+    ---------
+    - a: BlockArray.
+    - axis: int, optional. Axis along which the cumulative sum is computed. Can only be None for 1-D arrays.
+    - dtype: numpy.dtype, optional. Same as in `numpy.cumsum`.
+    """
+    if out is not None:
+        raise NotImplementedError("'out' argument is not supported")
+
+    if axis is None and a.ndim != 1:
+        raise NotImplementedError("cumsum over the flattened array is only supported for 1-D arrays")
+
+    (axis,) = normalize_axis(0 if axis is None else axis, a.ndim)
+    executor = get_executor(executor)
+
+    grid = np.empty(a.grid, dtype=object)
+    for i, block in enumerate(executor.map(functools.partial(_cumsum_block, axis=axis, dtype=dtype), a.data.flat)):
+        grid.flat[i] = block
+
+    # exclusive scan of block totals along `axis`
+    last = (slice(None),) * axis + (slice(-1, None),)
+    ids = [idx for idx in np.ndindex(grid.shape) if idx[axis] > 0]
+    offsets = {}
+    for idx in sorted(ids, key=lambda idx: idx[axis]):
+        prev = idx[:axis] + (idx[axis] - 1,) + idx[axis + 1 :]
+        total = grid[prev][last]
+        offsets[idx] = total if prev not in offsets else offsets[prev] + total
+
+    for idx, block in zip(ids, executor.map(np.add, [grid[idx] for idx in ids], [offsets[idx] for idx in ids])):
+        grid[idx] = block
+
+    return BlockArray(grid)
+
+
+def _cumsum_block(block, axis, dtype):
+    return np.cumsum(block, axis=axis, dtype=dtype)
+
+
+def array(arr, blockshape=None, inner="numpy", executor=None) -> BlockArray:
+    """Splits `arr` into a `BlockArray` of blocks of shape `blockshape`.
+
+    Blocks are views of `arr`, so wrapping a `numpy.ndarray` or a `numpy.memmap` neither copies nor reads any data. Data is only copied when blocks are converted to another kind of array with `inner` (i.e. `"rosnet.array.compss"` ships them to COMPSs).
+
+    Arguments
+    ---------
+    - arr: array-like, str or path-like. If a path to a `.npy` file is given, it is memory-mapped in read-only mode.
+    - blockshape: Sequence[int] or chunks, optional. Same as in `full`. Defaults to a single block.
+    - inner: str. Module of the blocks. Defaults to "numpy".
+    """
+    if isinstance(arr, (str, os.PathLike)):
+        arr = np.load(arr, mmap_mode="r")
+    elif isinstance(arr, BlockArray):
+        return arr if blockshape is None else dispatcher.rechunk(arr, blockshape)
+
+    arr = np.asanyarray(arr)
+    chunks = normalize_chunks(arr.shape, blockshape or arr.shape)
+    offsets = chunk_offsets(chunks)
+
+    grid = np.empty(tuple(len(c) for c in chunks), dtype=object)
+    for bid in np.ndindex(grid.shape):
+        # NOTE the trailing ellipsis keeps 0-d blocks as arrays instead of scalars
+        grid[bid] = arr[tuple(slice(offsets[i][j], offsets[i][j + 1]) for i, j in enumerate(bid)) + (Ellipsis,)]
+
+    if inner != "numpy":
+        fn = functools.partial(_array_block, inner=inner)
+        for i, block in enumerate(get_executor(executor).map(fn, grid.flat)):
+            grid.flat[i] = block
+
+    return BlockArray(grid)
+
+
+def _array_block(block, inner):
+    return autoray.do("array", block, like=inner)
+
+
+def rand(shape, blockshape=None, inner="numpy", executor=None):
+    chunks = normalize_chunks(shape, blockshape)
+
+    fn = functools.partial(_rand_block, inner=inner)
+    blocks = get_executor(executor).map(fn, _blockshapes(chunks))
+
+    return BlockArray(blocks, grid=tuple(len(c) for c in chunks))
+
+
+def _rand_block(blockshape, inner):
+    return autoray.do("random.rand", *blockshape, like=inner)
+
+
+# NOTE registers the linear algebra routines of BlockArray
+from rosnet.array.block import linalg
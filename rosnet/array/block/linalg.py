@@ -0,0 +1,279 @@
+import functools
+import itertools
+from math import prod
+from typing import Optional
+
+import numpy as np
+from rosnet import dispatch as dispatcher
+from rosnet.array.block import BlockArray, _reshape_block, array
+from rosnet.core.executor import get_executor
+from rosnet.core.util import normalize_axis
+
+
+def _concatenate(blocks: list, axis: int):
+    "Concatenates a few blocks into one. Goes through `rechunk`, so it works for any kind of block."
+    if len(blocks) == 1:
+        return blocks[0]
+
+    grid = np.empty(tuple(len(blocks) if i == axis else 1 for i in range(blocks[0].ndim)), dtype=object)
+    for i, block in enumerate(blocks):
+        grid.flat[i] = block
+
+    arr = BlockArray(grid)
+    return dispatcher.rechunk(arr, arr.shape).data.flat[0]
+
+
+def _single_block(block) -> BlockArray:
+    grid = np.empty((1,) * block.ndim, dtype=object)
+    grid.flat[0] = block
+    return BlockArray(grid)
+
+
+def _conj(x):
+    return np.conj(x) if x.dtype.kind == "c" else x
+
+
+def _qr_stacked(blocks: list, mode: str):
+    return np.linalg.qr(_concatenate(blocks, axis=0), mode=mode)
+
+
+def _dot(a, b):
+    return a if b is None else np.tensordot(a, b, 1)
+
+
+def _split_qr(res, m: int, n: int, mode: str):
+    "Returns the reduced `Q`, the trailing columns of a complete `Q` (or None) and the reduced `R` of a QR factorization of a `m` x `n` matrix."
+    if mode == "r":
+        return None, None, res
+
+    q, r = res
+    k = min(m, n)
+    if mode == "complete":
+        return q[:, :k], q[:, k:] if m > k else None, r[:k]
+    return q, None, r
+
+
+@dispatcher.linalg.qr.register
+def qr(a: BlockArray, mode="reduced", executor=None):
+    """QR factorization of a tall-skinny `BlockArray` by TSQR.
+
+    Row blocks are factorized independently and their `R` factors are merged pairwise up a binary tree, where each level factorizes the stacked `R` factors of two nodes. `Q` is then rebuilt down the tree with small matrix products, so no step handles more than one row block of `a`.
+
+    Arguments
+    ---------
+    - mode: str. One of "reduced", "complete" or "r", as in `numpy.linalg.qr`. `Q` is returned as a `BlockArray` with the row chunks of `a` and `R` as a single block. In "complete" mode, `R` is a `BlockArray` whose row chunks match the column chunks of `Q`.
+    - executor: str or Executor, optional. Executor that runs the block factorizations.
+    """
+    if a.ndim != 2:
+        raise NotImplementedError(f"QR factorization of {a.ndim}-dimensional BlockArray is not supported")
+
+    if mode not in ("reduced", "complete", "r"):
+        raise ValueError(f'mode must be one of "reduced", "complete" or "r" but is {mode}')
+
+    if a.grid[1] > 1:
+        a = dispatcher.rechunk(a, (a.chunks[0], a.shape[1]))
+
+    executor = get_executor(executor)
+    n = a.shape[1]
+    fn = functools.partial(_qr_stacked, mode=mode)
+
+    # up-sweep: nodes of the reduction tree as (rows of R, children, reduced Q, trailing columns of complete Q)
+    nodes, frontier = [], []
+    rows = [a.data[i, 0] for i in range(a.grid[0])]
+    for i, res in enumerate(executor.map(fn, [[block] for block in rows])):
+        m = a.chunks[0][i]
+        q, t, r = _split_qr(res, m, n, mode)
+        nodes.append((min(m, n), (), q, t))
+        frontier.append((i, r))
+
+    while len(frontier) > 1:
+        groups = [frontier[i : i + 2] for i in range(0, len(frontier), 2)]
+        results = iter(executor.map(fn, [[r for _, r in group] for group in groups if len(group) > 1]))
+
+        frontier = []
+        for group in groups:
+            if len(group) == 1:
+                frontier.append(group[0])
+                continue
+
+            s = sum(nodes[i][0] for i, _ in group)
+            q, t, r = _split_qr(next(results), s, n, mode)
+            nodes.append((min(s, n), tuple(i for i, _ in group), q, t))
+            frontier.append((len(nodes) - 1, r))
+
+    root, r = frontier[0]
+    if mode == "r":
+        return r
+
+    # down-sweep: columns of Q are grouped in segments, the first one being the reduced Q and the rest the trailing columns of complete factorizations
+    widths = [nodes[root][0]]
+    factors = {root: {0: None}}
+    leaves = []
+    for v in reversed(range(len(nodes))):
+        _, children, q, t = nodes[v]
+        incoming = factors.pop(v)
+
+        if not children:
+            leaves.append((v, incoming, t))
+            continue
+
+        products = {seg: _dot(q, f) for seg, f in incoming.items()}
+        if t is not None:
+            products[len(widths)] = t
+            widths.append(t.shape[1])
+
+        offset = 0
+        for child in children:
+            k = nodes[child][0]
+            factors[child] = {seg: x[offset : offset + k] for seg, x in products.items()}
+            offset += k
+
+    leaves.sort(key=lambda x: x[0])
+    for v, _, t in leaves:
+        if t is not None:
+            widths.append(t.shape[1])
+
+    pending = [(v, seg, f) for v, incoming, _ in leaves for seg, f in incoming.items()]
+    products = executor.map(_dot, [nodes[v][2] for v, _, _ in pending], [f for _, _, f in pending])
+
+    dtype = nodes[0][2].dtype
+    grid = np.empty((len(rows), len(widths)), dtype=object)
+    for (v, seg, _), block in zip(pending, products):
+        grid[v, seg] = block
+
+    seg = len(widths) - sum(t is not None for _, _, t in leaves)
+    for v, _, t in leaves:
+        if t is not None:
+            grid[v, seg] = t
+            seg += 1
+
+    for i, j in np.ndindex(grid.shape):
+        if grid[i, j] is None:
+            grid[i, j] = np.zeros_like(rows[i], dtype=dtype, shape=(a.chunks[0][i], widths[j]))
+
+    Q = BlockArray(grid)
+    if mode == "reduced":
+        return Q, r
+
+    blocks = np.empty((len(widths), 1), dtype=object)
+    blocks[0, 0] = r
+    for i in range(1, len(widths)):
+        blocks[i, 0] = np.zeros_like(r, shape=(widths[i], n))
+
+    return Q, BlockArray(blocks)
+
+
+@dispatcher.linalg.rsvd.register
+def rsvd(a: BlockArray, k: int, oversample: int = 10, n_iter: int = 2, seed=None, executor=None):
+    """Truncated SVD of rank `k` by randomized range finding.
+
+    The range of `a` is sampled with a Gaussian test matrix and refined with `n_iter` power iterations, using blockwise products orthonormalized by TSQR. Only the small `R` factor (of order `k + oversample`) is factorized as a single block, so the cost is O(mnk) and the data stays distributed.
+
+    Returns `U` (`BlockArray` with the row chunks of `a`), `s` (`numpy.ndarray`) and `Vh` (`BlockArray` with the column chunks of `a`).
+    """
+    if a.ndim != 2:
+        raise ValueError(f"rsvd requires a 2-dimensional BlockArray but it has {a.ndim} dimensions")
+
+    m, n = a.shape
+    k = min(k, m, n)
+    l = min(k + oversample, m, n)
+
+    rng = np.random.default_rng(seed)
+    dtype = np.float32 if a.dtype in (np.float32, np.complex64) else np.float64
+    omega = array(rng.standard_normal((n, l), dtype=dtype), blockshape=(a.chunks[1], l))
+
+    y = dispatcher.tensordot(a, omega, 1, executor=executor)
+    for _ in range(n_iter):
+        q, _ = qr(y, executor=executor)
+        z, _ = qr(dispatcher.tensordot(_conj(a), q, ([0], [0]), executor=executor), executor=executor)
+        y = dispatcher.tensordot(a, z, 1, executor=executor)
+    q, _ = qr(y, executor=executor)
+
+    # B = Q^H A is factorized through the TSQR of B^H = Qb Rb, so that A ~ (Q Ub) s (Wh Qb^H) with Rb^H = Ub s Wh
+    qb, rb = qr(dispatcher.tensordot(_conj(a), q, ([0], [0]), executor=executor), executor=executor)
+    ub, s, wh = np.linalg.svd(_conj(np.transpose(rb)), full_matrices=False)
+
+    u = dispatcher.tensordot(q, _single_block(ub[:, :k]), 1, executor=executor)
+    vh = np.transpose(dispatcher.tensordot(_conj(qb), _single_block(np.transpose(wh[:k])), 1, executor=executor))
+
+    return u, np.asarray(s)[:k], vh
+
+
+@dispatcher.schmidt.register
+def schmidt(a: BlockArray, axes_v, chi: Optional[int] = None, absorb: str = "both", **kwargs):
+    """Truncated Schmidt decomposition, such that `a ~ tensordot(u, v, ([-1], [-1]))`.
+
+    Axes `axes_v` of `a` go to `v` and the rest to `u`, both followed by a new axis of size `chi`. Blocks are matricized locally (rows and columns are grouped by block) and the matrix is factorized by `linalg.rsvd`.
+
+    Arguments
+    ---------
+    - axes_v: int or Sequence[int]. Axes of `a` that go to `v`.
+    - chi: int, optional. Number of singular values kept. Defaults to all of them.
+    - absorb: str. Factor that absorbs the singular values: "u", "v" or "both" (their square root to each one).
+    - kwargs: passed to `linalg.rsvd`.
+    """
+    if absorb not in ("u", "v", "both"):
+        raise ValueError(f'absorb must be one of "u", "v" or "both" but is {absorb}')
+
+    axes_v = normalize_axis(axes_v, a.ndim)
+    axes_u = tuple(i for i in range(a.ndim) if i not in axes_v)
+    if not axes_u or not axes_v:
+        raise ValueError("both u and v must keep at least one axis")
+
+    t = np.transpose(a, axes_u + axes_v)
+    nu = len(axes_u)
+    grid_u, grid_v = t.grid[:nu], t.grid[nu:]
+
+    mat = np.empty((prod(grid_u), prod(grid_v)), dtype=object)
+    for idx in np.ndindex(*t.grid):
+        block = t.data[idx]
+        shape = (prod(block.shape[:nu]), prod(block.shape[nu:]))
+        mat[np.ravel_multi_index(idx[:nu], grid_u), np.ravel_multi_index(idx[nu:], grid_v)] = _reshape_block(block, shape, "C")
+    mat = BlockArray(mat)
+
+    chi = min(chi or min(mat.shape), *mat.shape)
+    u, s, vh = rsvd(mat, chi, **kwargs)
+    v = np.transpose(vh)
+
+    def unmatricize(x: BlockArray, grid, chunks) -> BlockArray:
+        blocks = np.empty(grid + (1,), dtype=object)
+        for idx in np.ndindex(*grid):
+            shape = tuple(c[i] for c, i in zip(chunks, idx)) + (chi,)
+            blocks[idx + (0,)] = _reshape_block(x.data[np.ravel_multi_index(idx, grid), 0], shape, "C")
+        return BlockArray(blocks)
+
+    u = unmatricize(u, grid_u, t.chunks[:nu])
+    v = unmatricize(v, grid_v, t.chunks[nu:])
+
+    if absorb == "u":
+        u = u * s
+    elif absorb == "v":
+        v = v * s
+    else:
+        u, v = u * np.sqrt(s), v * np.sqrt(s)
+
+    return u, v
+
+
+def _kron_block(a, b):
+    return np.kron(a, b)
+
+
+@dispatcher.kron.register
+def kron(a: BlockArray, b: BlockArray, executor=None) -> BlockArray:
+    """Blocked Kronecker product. Each output block is the Kronecker product of a block of `a` and the whole of `b`, so the output has the grid of `a` and the full product is never gathered.
+
+    The products of a block of `b` are not contiguous in the output, so `b` (usually the small factor) is merged into a single block first.
+    """
+    if a.ndim != b.ndim:
+        raise NotImplementedError("Kronecker product of BlockArrays with different number of dimensions is not supported")
+
+    if b.nblock > 1:
+        b = dispatcher.rechunk(b, b.shape)
+    block_b = b.data.flat[0]
+
+    res = np.empty(a.grid, dtype=object)
+    for i, block in enumerate(get_executor(executor).map(_kron_block, a.data.flat, itertools.repeat(block_b, a.nblock))):
+        res.flat[i] = block
+
+    return BlockArray(res)
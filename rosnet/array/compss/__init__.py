@@ -1,7 +1,9 @@
 import functools
+import itertools
 import logging
+import operator
 from copy import deepcopy
-from math import prod
+from math import isqrt, prod
 from typing import Optional, Sequence, Tuple, Union
 
 import numpy as np
@@ -10,13 +12,12 @@ from pycompss.api.api import compss_delete_object, compss_wait_on
 from pycompss.runtime.management.classes import Future as COMPSsFuture
 from rosnet import dispatch as dispatcher
 from rosnet import tuning
-from rosnet.array.block import BlockArray
+from rosnet.array.block import BlockArray, _fit_tensordot, _tensordot_blocks_of
 from rosnet.array.maybe import MaybeArray
 from rosnet.core.interface import Array, ArrayConvertable, AsyncArray
 from rosnet.core.log import log_args
-from rosnet.core.macros import todo
-from rosnet.core.util import isunique, result_shape
-from rosnet.core.mixin import ArrayFunctionMixin
+from rosnet.core.util import isunique, normalize_axes, normalize_axis, normalize_chunks, rechunk_plan, result_shape, split_bounds, summa_plan
+from rosnet.core.mixin import ArrayFunctionMixin, recording
 
 from . import task
 
@@ -127,11 +128,27 @@ class COMPSsArray(np.lib.mixins.NDArrayOperatorsMixin, ArrayFunctionMixin):
         return f"COMPSsArray<id={id(self)}, data=id({id(self.data)}), shape={self.shape}, dtype={self.dtype}>"
 
     @log_args(logger)
-    def __getitem__(self, idx) -> COMPSsFuture:
-        return compss_wait_on(task.getitem(self.data, idx))
+    def __getitem__(self, idx) -> Union["COMPSsArray", np.generic]:
+        """Returns a new `COMPSsArray` with the selection or the value of the element if `idx` selects a single element.
+
+        NOTE The selection is computed by a task, so it is not a view.
+        """
+        # infer the resulting shape without allocating memory
+        shape = np.broadcast_to(np.empty((), dtype=bool), self.shape)[idx].shape
+
+        if shape == ():
+            return compss_wait_on(task.getitem(self.data, idx))
+
+        return COMPSsArray(task.getitem(self.data, idx), shape=shape, dtype=self.dtype)
 
     @log_args(logger)
     def __setitem__(self, key, value):
+        # NOTE in lazy mode, recorded operations that read this array must run before the write
+        graph = recording.get()
+        if graph is not None:
+            graph.record(operator.setitem, None, (self, key, value), {})
+            return
+
         task.setitem(self.data, key, value)
 
     @property
@@ -179,11 +196,16 @@ class COMPSsArray(np.lib.mixins.NDArrayOperatorsMixin, ArrayFunctionMixin):
 
     @log_args(logger)
     def __array__(self) -> np.ndarray:
-        return np.array(dispatcher.to_numpy(self.data))
+        return np.asarray(dispatcher.to_numpy(self.data))
 
     @log_args(logger)
     def __array_ufunc__(self, ufunc: np.ufunc, method: str, *inputs, **kwargs):
-        if ufunc.nin > 2:
+        graph = recording.get()
+        if graph is not None:
+            return graph.record(ufunc, method, inputs, kwargs)
+
+        # defer to lazy arrays
+        if ufunc.nin > 2 or any(getattr(type(x), "__lazy__", False) for x in inputs):
             return NotImplemented
 
         # get COMPSs reference if COMPSsArray
@@ -268,20 +290,28 @@ def to_numpy(arr: COMPSsArray):
     return dispatcher.to_numpy(arr.data)
 
 
-@dispatcher.to_numpy.register
+@dispatcher.rechunk.register
 @log_args(logger)
-def _(arr: BlockArray[COMPSsArray]):
-    blocks = np.empty_like(arr.data, dtype=object)
-    it = np.nditer(
-        arr.data,
-        flags=["refs_ok", "multi_index"],
-        op_flags=["readonly"],
-        op_axes=[tuple(range(arr.ndim))],
-    )
-    with it:
-        for x in it:
-            blocks[it.multi_index] = dispatcher.to_numpy(x[()])
-    return np.block(blocks.tolist())
+def rechunk(arr: BlockArray[COMPSsArray], blockshape) -> BlockArray[COMPSsArray]:
+    """Returns `arr` divided in blocks of shape `blockshape`.
+
+    Only the pieces of the source blocks that feed a target block are extracted (by one task per piece) and sent to the task assembling the target block, so no data passes through the master.
+    """
+    chunks = normalize_chunks(arr.shape, blockshape)
+    if chunks == arr.chunks:
+        return arr
+
+    grid = np.empty(tuple(len(c) for c in chunks), dtype=object)
+    for tid, shape, pieces in rechunk_plan(arr.chunks, chunks):
+        if len(pieces) == 1 and all(k == slice(None) for k in (*pieces[0][1], *pieces[0][2])):
+            grid[tid] = arr.data[pieces[0][0]]
+            continue
+
+        blocks = [arr.data[bid] if all(k == slice(None) for k in src) else arr.data[bid][src] for bid, src, _ in pieces]
+        ref = task.assemble([block.data for block in blocks], [dst for _, _, dst in pieces], shape, arr.dtype)
+        grid[tid] = COMPSsArray(ref, shape=shape, dtype=arr.dtype)
+
+    return BlockArray(grid)
 
 
 @log_args(logger)
@@ -300,6 +330,11 @@ def full(shape, fill_value, dtype=None, order="C") -> COMPSsArray:
     return COMPSsArray(ref, shape=shape, dtype=dtype or np.dtype(type(fill_value)))
 
 
+@log_args(logger)
+def array(arr) -> COMPSsArray:
+    return COMPSsArray(arr)
+
+
 @dispatcher.zeros_like.register
 @log_args(logger)
 def zeros_like(a: COMPSsArray, dtype=None, order="K", subok=True, shape=None) -> Union[np.ndarray, COMPSsArray]:
@@ -395,18 +430,45 @@ def transpose(a: COMPSsArray, axes=None, inplace=False):
         return COMPSsArray(ref, shape=shape, dtype=a.dtype)
 
 
-@todo
 @dispatcher.stack.register
 @log_args(logger)
 def stack(arrays: Sequence[COMPSsArray], axis=0, out=None) -> COMPSsArray:
-    pass
+    if out is not None:
+        raise NotImplementedError("'out' is not supported")
+
+    if any(arr.shape != arrays[0].shape for arr in arrays):
+        raise ValueError("all input arrays must have the same shape")
+
+    (axis,) = normalize_axis(axis, arrays[0].ndim + 1)
+    shape = arrays[0].shape[:axis] + (len(arrays),) + arrays[0].shape[axis:]
+    dtype = np.result_type(*(arr.dtype for arr in arrays))
+
+    ref = task.stack([arr.data for arr in arrays], axis=axis)
+    return COMPSsArray(ref, shape=shape, dtype=dtype)
+
+
+@dispatcher.concatenate.register
+@log_args(logger)
+def concatenate(arrays: Sequence[COMPSsArray], axis=0) -> COMPSsArray:
+    (axis,) = normalize_axis(axis, arrays[0].ndim)
+    if any(arr.ndim != arrays[0].ndim or any(i != axis and n != m for i, (n, m) in enumerate(zip(arr.shape, arrays[0].shape))) for arr in arrays):
+        raise ValueError("all the input array dimensions except for the concatenation axis must match exactly")
+
+    offsets = list(itertools.accumulate((arr.shape[axis] for arr in arrays), initial=0))
+    shape = arrays[0].shape[:axis] + (offsets[-1],) + arrays[0].shape[axis + 1 :]
+    dtype = np.result_type(*(arr.dtype for arr in arrays))
+    keys = [(slice(None),) * axis + (slice(start, stop),) for start, stop in zip(offsets[:-1], offsets[1:])]
+
+    ref = task.assemble([arr.data for arr in arrays], keys, shape, dtype)
+    return COMPSsArray(ref, shape=shape, dtype=dtype)
 
 
-@todo
 @dispatcher.split.register
 @log_args(logger)
 def split(array: COMPSsArray, indices_or_sections, axis=0) -> Sequence[COMPSsArray]:
-    pass
+    "Splits `array` into multiple subarrays along `axis`. Each subarray is selected by a task of its own, so they are extracted in parallel."
+    (axis,) = normalize_axis(axis, array.ndim)
+    return [array[(slice(None),) * axis + (slice(start, stop),)] for start, stop in split_bounds(array.shape[axis], indices_or_sections)]
 
 
 @dispatcher.tensordot.register(COMPSsArray, ArrayConvertable)
@@ -417,19 +479,48 @@ def tensordot(a: Union[COMPSsArray, ArrayConvertable], b: Union[COMPSsArray, Arr
     return dispatcher.tensordot[(COMPSsArray, COMPSsArray)](a, b, axes)
 
 
+def _single_block(arr: COMPSsArray) -> BlockArray[COMPSsArray]:
+    grid = np.empty((1,) * arr.ndim, dtype=object)
+    grid.flat[0] = arr
+    return BlockArray(grid)
+
+
 @dispatcher.tensordot.register
 @log_args(logger)
-def tensordot(a: COMPSsArray, b: COMPSsArray, axes) -> COMPSsArray:
+def tensordot(a: COMPSsArray, b: COMPSsArray, axes, memory_limit: Optional[int] = None) -> Union[COMPSsArray, BlockArray[COMPSsArray]]:
+    """Contracts `a` and `b` in a single task.
+
+    If the task would need more than `memory_limit` bytes, the operands are split into blocks that fit and contracted with the "accumulate" schedule, returning a `BlockArray[COMPSsArray]`.
+    """
     dtype = np.result_type(a.dtype, b.dtype)
     shape = result_shape(a.shape, b.shape, axes)
 
+    if memory_limit is not None:
+        axes = normalize_axes(axes, a.ndim)
+        if tuning.mem.tensordot(a, b, axes) > memory_limit:
+            bs_a, bs_b = tuning.mem.tensordot_blockshape(a.shape, b.shape, axes, dtype, memory_limit)
+            a = dispatcher.rechunk(_single_block(a), bs_a)
+            b = dispatcher.rechunk(_single_block(b), bs_b)
+            return dispatcher.tensordot(a, b, axes, method="accumulate")
+
     ref = task.tensordot.tensordot(a.data, b.data, axes)
     return COMPSsArray(ref, shape=shape, dtype=dtype)
 
 
 @dispatcher.tensordot.register
 @log_args(logger)
-def tensordot(a: Sequence[COMPSsArray], b: Sequence[COMPSsArray], axes, method="sequential") -> COMPSsArray:
+def tensordot(a: Sequence[COMPSsArray], b: Sequence[COMPSsArray], axes, method="sequential", fanin: int = 2) -> COMPSsArray:
+    """Computes `sum(np.tensordot(ai, bi, axes) for ai, bi in zip(a, b))`.
+
+    Arguments
+    ---------
+    - method: str.
+        - "sequential": a single task computes and accumulates all the products.
+        - "commutative": one task per product, accumulated in-place on a shared result.
+        - "commutative-but-first": same as "commutative", but the first product initializes the result.
+        - "tree": one task per product, summed in parallel by a tree of tasks.
+    - fanin: int. Only for "tree". Number of partial results summed by each task of the tree.
+    """
     dtype = np.result_type(a[0].dtype, b[0].dtype)
     shape = result_shape(a[0].shape, b[0].shape, axes)
 
@@ -446,11 +537,119 @@ def tensordot(a: Sequence[COMPSsArray], b: Sequence[COMPSsArray], axes, method="
         ref = task.tensordot.tensordot(a[0].data, b[0].data, axes)
         for ia, ib in zip(a[1:], b[1:]):
             task.tensordot.commutative(ref, ia.data, ib.data, axes)
+    elif method == "tree":
+        if fanin < 2:
+            raise ValueError(f"fanin must be at least 2 but is {fanin}")
+
+        refs = [task.tensordot.tensordot(ia.data, ib.data, axes) for ia, ib in zip(a, b)]
+        while len(refs) > 1:
+            groups = (refs[i : i + fanin] for i in range(0, len(refs), fanin))
+            refs = [task.add(group) if len(group) > 1 else group[0] for group in groups]
+        ref = refs[0]
     else:
         raise ValueError("invalid method")
     return COMPSsArray(ref, shape=shape, dtype=dtype)
 
 
+@dispatcher.tensordot.register
+@log_args(logger)
+def tensordot(
+    a: BlockArray[COMPSsArray],
+    b: BlockArray[COMPSsArray],
+    axes,
+    method="blocks",
+    splits: int = 1,
+    fanin: int = 2,
+    procs: Optional[Tuple[int, int]] = None,
+    memory_limit: Optional[int] = None,
+    **kwargs,
+) -> BlockArray[COMPSsArray]:
+    """Blocked `tensordot` of distributed arrays.
+
+    Arguments
+    ---------
+    - method: str. Schedule of the block contractions.
+        - "blocks": one task per output block, which receives all the blocks of `a` and `b` it depends on.
+        - "tree": one task per block product, summed by a tree of tasks with fan-in `fanin` for each output block.
+        - "summa": SUMMA schedule (see `rosnet.core.util.summa_plan`). Output blocks are divided into tiles on a `procs` grid of processes, and at each inner step every tile is updated by one task that receives the panels of `a` and `b` it needs. Each block of `a` is sent once per column of processes and each block of `b` once per row of processes, instead of once per output block that uses it.
+        - "accumulate": one task per block product, accumulated in-place on the output block with a commutative task. No task holds more than one block of each operand and the output block. Tasks are placed by the COMPSs scheduler, so blocks are not assigned to owners and an input block is still sent to every task that uses it.
+    - splits: int. Only for "accumulate". Number of partial accumulators of each output block. The inner blocks are divided among them, so they accumulate concurrently, and they are summed pairwise at the end.
+    - fanin: int. Only for "tree". Number of partial results summed by each task of the tree.
+    - procs: (int, int), optional. Only for "summa". Shape of the grid of processes. Defaults to about the square root of the number of output blocks along each axis.
+    - memory_limit: int, optional. Maximum bytes used by the contraction of a pair of blocks. If exceeded, operands are rechunked into smaller blocks (see `rosnet.tuning.mem.tensordot_blockshape`). As a "blocks" task receives all the pairs of blocks of its output block, "blocks" is replaced by "accumulate" so that no task exceeds the limit.
+    - kwargs: passed to the "blocks" schedule.
+    """
+    if memory_limit is not None:
+        a, b = _fit_tensordot(a, b, axes, memory_limit)
+        if method == "blocks":
+            method = "accumulate"
+
+    if method == "blocks":
+        return dispatcher.tensordot[(BlockArray, BlockArray)](a, b, axes, **kwargs)
+    elif method == "tree":
+        axes, grid, blocks_a, blocks_b = _tensordot_blocks_of(a, b, axes)
+        res = np.empty(grid, dtype=object)
+        for i, (row, col) in enumerate(itertools.product(blocks_a, blocks_b)):
+            res.flat[i] = dispatcher.tensordot(row, col, axes, method="tree", fanin=fanin)
+        return BlockArray(res)
+    elif method == "summa":
+        return _summa(a, b, axes, procs)
+    elif method != "accumulate":
+        raise ValueError(f'method must be one of "blocks", "tree", "summa" or "accumulate" but is {method}')
+
+    axes, grid, blocks_a, blocks_b = _tensordot_blocks_of(a, b, axes)
+    k = len(blocks_a[0])
+    splits = max(1, min(splits, k))
+
+    partials = [[None] * splits for _ in range(len(blocks_a) * len(blocks_b))]
+    for l in range(k):
+        r = l * splits // k
+        for i, row in enumerate(blocks_a):
+            for j, col in enumerate(blocks_b):
+                acc = partials[i * len(blocks_b) + j]
+                if acc[r] is None:
+                    acc[r] = dispatcher.tensordot(row[l], col[l], axes)
+                else:
+                    task.tensordot.commutative(acc[r].data, row[l].data, col[l].data, axes)
+
+    res = np.empty(grid, dtype=object)
+    for i, copies in enumerate(partials):
+        while len(copies) > 1:
+            copies = [np.add(x, y) for x, y in zip(copies[::2], copies[1::2])] + copies[len(copies) - len(copies) % 2 :]
+        res.flat[i] = copies[0]
+
+    return BlockArray(res)
+
+
+def _summa(a: BlockArray[COMPSsArray], b: BlockArray[COMPSsArray], axes, procs: Optional[Tuple[int, int]]) -> BlockArray[COMPSsArray]:
+    axes, grid, blocks_a, blocks_b = _tensordot_blocks_of(a, b, axes)
+    rows, cols, inner = len(blocks_a), len(blocks_b), len(blocks_a[0])
+    procs = procs or (max(1, isqrt(rows)), max(1, isqrt(cols)))
+    dtype = np.result_type(a.dtype, b.dtype)
+
+    # output blocks in C-order, accumulated in-place by the tasks of their tile
+    res = np.empty(grid, dtype=object)
+    for i, (row, col) in enumerate(itertools.product(blocks_a, blocks_b)):
+        res.flat[i] = zeros(result_shape(row[0].shape, col[0].shape, axes), dtype=dtype)
+
+    for l, tile_rows, tile_cols in summa_plan(rows, cols, inner, procs):
+        acc = [res.flat[i * cols + j].data for i in tile_rows for j in tile_cols]
+        task.tensordot.panel(acc, [blocks_a[i][l].data for i in tile_rows], [blocks_b[j][l].data for j in tile_cols], axes)
+
+    return BlockArray(res)
+
+
+@dispatcher.kron.register
+@log_args(logger)
+def kron(a: COMPSsArray, b: COMPSsArray) -> COMPSsArray:
+    if a.ndim != b.ndim:
+        raise NotImplementedError("Kronecker product of arrays with different number of dimensions is not supported")
+
+    ref = task.kron(a.data, b.data)
+    shape = tuple(i * j for i, j in zip(a.shape, b.shape))
+    return COMPSsArray(ref, shape=shape, dtype=np.result_type(a.dtype, b.dtype))
+
+
 @dispatcher.linalg.svd.register
 @log_args(logger)
 def svd(a: COMPSsArray, full_matrices=True, compute_uv=True, hermitian=False) -> Union[Tuple[COMPSsArray, COMPSsArray, COMPSsArray], COMPSsArray]:
@@ -525,30 +724,74 @@ def cumsum(a: COMPSsArray, axis=None, dtype=None, out=None):
         task.cumsum_out(out.data, a.data, axis=axis, dtype=dtype)
     else:
         ref = task.cumsum(a.data, axis=axis, dtype=dtype)
-        shape = tuple(filter(lambda x: x[0] != axis, enumerate(a.shape)))
-        dtype = dtype or a.dtype
+        shape = a.shape if axis is not None else (a.size,)
+        dtype = np.cumsum(np.ones(1, dtype=a.dtype), dtype=dtype).dtype
         return COMPSsArray(ref, shape=shape, dtype=dtype)
 
 
 @dispatcher.count_nonzero.register
 @log_args(logger)
 def count_nonzero(a: COMPSsArray, axis=None, keepdims=False) -> Union[int, COMPSsArray]:
+    axes = normalize_axis(axis, a.ndim)
+    shape = tuple(1 if i in axes else n for i, n in enumerate(a.shape) if keepdims or i not in axes)
+
     ref = task.count_nonzero(a.data, axis, keepdims)
+    if len(shape) == 0:
+        return compss_wait_on(ref)
 
-    if axis is None:
-        ret = compss_wait_on(ref)
-        return ret
-    else:
-        shape = list(a.shape)
-        if keepdims:
-            shape[axis] = 1
-        else:
-            del shape[axis]
+    return COMPSsArray(ref, shape=shape, dtype=np.intp)
+
+
+def _reduction(func, a: COMPSsArray, axis=None, keepdims=False, **kwargs) -> Union[np.generic, COMPSsArray]:
+    axes = normalize_axis(axis, a.ndim)
+    shape = tuple(1 if i in axes else n for i, n in enumerate(a.shape) if keepdims or i not in axes)
+    dtype = func(np.ones(1, dtype=a.dtype), **kwargs).dtype
 
-        shape = tuple(shape)
+    ref = task.operate(func, a.data, axis=axis, keepdims=keepdims, **kwargs)
+    if len(shape) == 0:
+        return compss_wait_on(ref)
 
-        ret = COMPSsArray(ref, shape=shape, dtype=np.int0)
-        return ret
+    return COMPSsArray(ref, shape=shape, dtype=dtype)
+
+
+@dispatcher.sum.register
+@log_args(logger)
+def _(a: COMPSsArray, axis=None, dtype=None, out=None, keepdims=False):
+    if out is not None:
+        raise NotImplementedError("'out' argument is not supported")
+    return _reduction(np.sum, a, axis, keepdims, dtype=dtype)
+
+
+@dispatcher.prod.register
+@log_args(logger)
+def _(a: COMPSsArray, axis=None, dtype=None, out=None, keepdims=False):
+    if out is not None:
+        raise NotImplementedError("'out' argument is not supported")
+    return _reduction(np.prod, a, axis, keepdims, dtype=dtype)
+
+
+@dispatcher.max.register
+@log_args(logger)
+def _(a: COMPSsArray, axis=None, out=None, keepdims=False):
+    if out is not None:
+        raise NotImplementedError("'out' argument is not supported")
+    return _reduction(np.max, a, axis, keepdims)
+
+
+@dispatcher.min.register
+@log_args(logger)
+def _(a: COMPSsArray, axis=None, out=None, keepdims=False):
+    if out is not None:
+        raise NotImplementedError("'out' argument is not supported")
+    return _reduction(np.min, a, axis, keepdims)
+
+
+@dispatcher.mean.register
+@log_args(logger)
+def _(a: COMPSsArray, axis=None, dtype=None, out=None, keepdims=False):
+    if out is not None:
+        raise NotImplementedError("'out' argument is not supported")
+    return _reduction(np.mean, a, axis, keepdims, dtype=dtype)
 
 
 @dispatcher.einsum.register
@@ -1,6 +1,7 @@
 import functools
 
-from pycompss.api.parameter import IN, INOUT
+import numpy as np
+from pycompss.api.parameter import COLLECTION_IN, IN, INOUT, Depth, Type
 from rosnet.core import log
 from rosnet.tuning.task import autotune
 
@@ -27,3 +28,13 @@ def ioperate(func, a, *args, **kwargs):
 @log.trace
 def ufunc_out(out, ufunc, *args, **kwargs):
     ufunc(*args, out=out, **kwargs)
+
+
+@autotune(arrays={Type: COLLECTION_IN, Depth: 1}, returns=1)
+@log.trace
+def add(arrays):
+    "Sum of arrays, accumulated in a single output."
+    res = np.add(arrays[0], arrays[1])
+    for arr in arrays[2:]:
+        res += arr
+    return res
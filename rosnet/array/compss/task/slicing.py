@@ -17,3 +17,13 @@ def split(block: Array, n: int, axis: int):
 @log.trace
 def stack(arrays: Sequence[Array], axis=0, out=None) -> np.ndarray:
     return np.stack(arrays, axis=axis, out=out)
+
+
+@autotune(blocks={Type: COLLECTION_IN, Depth: 1}, returns=1)
+@log.trace
+def assemble(blocks: Sequence[Array], keys, shape, dtype) -> np.ndarray:
+    "Assembles a block from pieces of other blocks, where `keys` are the locations of the pieces in the new block."
+    out = np.empty(shape, dtype=dtype)
+    for block, key in zip(blocks, keys):
+        out[key] = block
+    return out
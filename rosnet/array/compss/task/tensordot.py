@@ -2,10 +2,11 @@ import os
 from typing import Sequence, Union
 
 import numpy as np
-from pycompss.api.parameter import COLLECTION_IN, COMMUTATIVE, IN, Depth, Type
+from pycompss.api.parameter import COLLECTION_IN, COLLECTION_INOUT, COMMUTATIVE, IN, Depth, Type
 from rosnet.array.maybe import MaybeArray
 from rosnet.core import log
 from rosnet.core.interface import Array
+from rosnet.core.kernel import tensordot_accumulate
 from rosnet.tuning.task import autotune
 
 
@@ -18,7 +19,7 @@ def _fix_blas_threads():
 @log.trace
 def sequential(a: Sequence[Array], b: Sequence[Array], axes):
     _fix_blas_threads()
-    return sum(np.tensordot(ba, bb, axes) for ba, bb in zip(a, b))
+    return tensordot_accumulate(a, b, axes)
 
 
 @autotune(ba=IN, bb=IN, returns=1)
@@ -46,4 +47,21 @@ def tensordot(ba: Array, bb: Array, axes):
 @log.trace
 def commutative(res: Array, a: Array, b: Array, axes):
     _fix_blas_threads()
-    res += np.tensordot(a, b, axes)
+    if isinstance(res, np.ndarray) and res.flags.c_contiguous:
+        tensordot_accumulate([a], [b], axes, out=res)
+    else:
+        res += np.tensordot(a, b, axes)
+
+
+@autotune(acc={Type: COLLECTION_INOUT, Depth: 1}, a={Type: COLLECTION_IN, Depth: 1}, b={Type: COLLECTION_IN, Depth: 1}, returns=0)
+@log.trace
+def panel(acc: Sequence[Array], a: Sequence[Array], b: Sequence[Array], axes):
+    "Accumulates the products of a row panel `a` and a column panel `b` into the tile `acc` of output blocks (in C-order)."
+    _fix_blas_threads()
+    for i, ai in enumerate(a):
+        for j, bj in enumerate(b):
+            res = acc[i * len(b) + j]
+            if isinstance(res, np.ndarray) and res.flags.c_contiguous:
+                tensordot_accumulate([ai], [bj], axes, out=res)
+            else:
+                res += np.tensordot(ai, bj, axes)
@@ -0,0 +1,467 @@
+import inspect
+import operator
+from contextlib import contextmanager
+from math import prod
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from rosnet import dispatch as dispatcher
+from rosnet.array.block import BlockArray
+from rosnet.core.mixin import recording
+from rosnet.core.util import normalize_axes, result_shape
+
+_MISSING = object()
+
+
+class Graph:
+    """Expression graph of the operations recorded in lazy mode.
+
+    Identical operations on identical operands are recorded once (common-subexpression elimination), and chains of transpositions or reshapes are folded as they are recorded, so that inverse pairs cancel out.
+    """
+
+    def __init__(self):
+        self.nodes: Dict[tuple, "LazyArray"] = {}
+
+    def record(self, func, method: Optional[str], args, kwargs) -> "LazyArray":
+        """Records the call of `func` (a NumPy function, or a ufunc if `method` is given) and returns its lazy result.
+
+        If an identical call was already recorded, its result is returned instead.
+        """
+        args, kwargs = tuple(args), dict(kwargs)
+
+        if kwargs.get("out") is not None or method == "at" or func is operator.setitem:
+            return self._mutate(func, method, args, kwargs)
+
+        folded = _fold(self, func, method, args, kwargs)
+        if folded is not None:
+            return folded
+
+        key = (func, method, _freeze(args), _freeze(kwargs))
+        node = self.nodes.get(key)
+        if node is None:
+            node = LazyArray(self, func, method, args, kwargs)
+            self.nodes[key] = node
+        return node
+
+    def _mutate(self, func, method, args, kwargs):
+        """Runs an operation that writes into its operands (i.e. with `out` or item assignment) eagerly.
+
+        Recorded operations that depend on the written arrays are computed first, so that they see their previous values, and are forgotten, so that later identical operations see the new values.
+        """
+        out = kwargs.get("out")
+        targets = [x for x in _flatten(out if out is not None else args[0]) if x is not None]
+
+        # NOTE nodes are recorded after their operands, so a single pass finds all the dependents
+        affected = {id(x) for x in targets}
+        for node in self.nodes.values():
+            if any(id(x) in affected for x in _flatten((node.args, node.kwargs))):
+                affected.add(id(node))
+
+        readers = [node for node in self.nodes.values() if id(node) in affected and not node.computed]
+        operands = [x for x in _flatten((args, kwargs)) if isinstance(x, LazyArray)]
+        compute(*readers, *operands)
+
+        self.nodes = {key: node for key, node in self.nodes.items() if id(node) not in affected}
+
+        token = recording.set(None)
+        try:
+            args, kwargs = _substitute(args, {}), _substitute(kwargs, {})
+            res = func(*args, **kwargs) if method in (None, "__call__") else getattr(func, method)(*args, **kwargs)
+        finally:
+            recording.reset(token)
+
+        if out is None:
+            return res
+
+        # lazy outputs take the written values
+        outs = out if isinstance(out, tuple) else (out,)
+        results = res if len(outs) > 1 else (res,)
+        for target, value in zip(outs, results):
+            if isinstance(target, LazyArray):
+                target._value = value
+        results = tuple(target if isinstance(target, LazyArray) else value for target, value in zip(outs, results))
+        return results if len(outs) > 1 else results[0]
+
+    def compute(self, *arrays):
+        return compute(*arrays)
+
+
+class LazyArray(np.lib.mixins.NDArrayOperatorsMixin):
+    """Deferred result of an operation recorded in lazy mode (see `rosnet.lazy`).
+
+    Operations on a `LazyArray` are recorded too, even out of the lazy context. The graph is submitted when the array is materialized (i.e. with `numpy.asarray`) or when `compute` is called.
+    """
+
+    __lazy__ = True
+
+    def __init__(self, graph: Graph, func, method: Optional[str], args: tuple, kwargs: dict):
+        self.graph = graph
+        self.func = func
+        self.method = method
+        self.args = args
+        self.kwargs = kwargs
+        self._value = _MISSING
+
+        # NOTE the reshape of a `BlockArray` reshapes its blocks, so shapes are not inferred through it
+        self.blocked = any(_blocked(x) for x in _flatten((args, kwargs)))
+        self._shape, self._dtype = _infer(func, method, args, kwargs)
+
+    def __repr__(self) -> str:
+        name = getattr(self.func, "__name__", repr(self.func))
+        return f"LazyArray<{name}{'.' + self.method if self.method not in (None, '__call__') else ''}, shape={self._shape}, dtype={self._dtype}>"
+
+    @property
+    def computed(self) -> bool:
+        return self._value is not _MISSING
+
+    @property
+    def shape(self) -> Tuple[int, ...]:
+        "Shape of the result. Computes the array if it cannot be inferred."
+        if self._shape is None:
+            value = self.compute()
+            self._shape = tuple(value.shape if hasattr(value, "shape") else np.shape(value))
+        return self._shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        "Type of the result. Computes the array if it cannot be inferred."
+        if self._dtype is None:
+            self._dtype = np.dtype(self.compute().dtype)
+        return self._dtype
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        return prod(self.shape)
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        return self.graph.record(ufunc, method, inputs, kwargs)
+
+    def __array_function__(self, func, types, args, kwargs):
+        return self.graph.record(func, None, args, kwargs)
+
+    def __getitem__(self, key):
+        return self.graph.record(operator.getitem, None, (self, key), {})
+
+    def transpose(self, *axes):
+        axes = axes[0] if len(axes) == 1 and not isinstance(axes[0], int) else axes or None
+        return self.graph.record(np.transpose, None, (self, axes), {})
+
+    @property
+    def T(self) -> "LazyArray":
+        return self.transpose()
+
+    def reshape(self, shape, order="C") -> "LazyArray":
+        return self.graph.record(np.reshape, None, (self, shape), {"order": order})
+
+    def conj(self) -> "LazyArray":
+        return np.conj(self)
+
+    def compute(self):
+        "Computes the array and returns the result."
+        return compute(self)[0]
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        return np.asarray(self.compute(), dtype=dtype)
+
+    def __bool__(self):
+        return bool(self.compute())
+
+    def __int__(self):
+        return int(self.compute())
+
+    def __float__(self):
+        return float(self.compute())
+
+    def __complex__(self):
+        return complex(self.compute())
+
+
+@dispatcher.to_numpy.register
+def to_numpy(arr: LazyArray):
+    return dispatcher.to_numpy(arr.compute())
+
+
+@contextmanager
+def lazy():
+    """Defers the operations on arrays of `rosnet` (i.e. `BlockArray`, `COMPSsArray`) within the context.
+
+    NumPy functions and operators on these arrays are recorded into an expression graph and return `LazyArray`. Nothing is submitted until the results are materialized or `compute` is called. Then, identical subexpressions run once and inverse transpositions and reshapes are skipped.
+
+    Operations that write into an array (i.e. in-place operators, `out` or item assignment) are not deferred: the recorded operations that depend on that array are computed first and then the operation runs eagerly.
+
+    Example
+    -------
+    >>> with rosnet.lazy():
+    ...     c = np.tensordot(a, b, 1)
+    ...     d = np.transpose(np.transpose(c)) + np.tensordot(a, b, 1)
+    >>> rosnet.compute(d)  # `tensordot` runs once and both transpositions are skipped
+    """
+    graph = Graph()
+    token = recording.set(graph)
+    try:
+        yield graph
+    finally:
+        recording.reset(token)
+
+
+def compute(*arrays) -> list:
+    """Computes the `LazyArray` in `arrays` together, so that shared subexpressions run once.
+
+    Intermediate results are dropped as soon as their last consumer has run. Arguments that are not `LazyArray` are returned as they are.
+    """
+    order = _toposort([arr for arr in arrays if isinstance(arr, LazyArray)])
+
+    # number of consumers of every node, to drop intermediates after their last use
+    consumers = {}
+    for node in order:
+        if not node.computed:
+            for child in {id(child) for child in _children(node)}:
+                consumers[child] = consumers.get(child, 0) + 1
+
+    roots = {id(arr) for arr in arrays}
+    values = {}
+    token = recording.set(None)
+    try:
+        for node in order:
+            if node.computed:
+                values[id(node)] = node._value
+                continue
+
+            args, kwargs = _substitute(node.args, values), _substitute(node.kwargs, values)
+            values[id(node)] = node.func(*args, **kwargs) if node.method in (None, "__call__") else getattr(node.func, node.method)(*args, **kwargs)
+
+            for child in {id(child) for child in _children(node)}:
+                consumers[child] -= 1
+                if consumers[child] == 0 and child not in roots:
+                    del values[child]
+    finally:
+        recording.reset(token)
+
+    for arr in arrays:
+        if isinstance(arr, LazyArray) and not arr.computed:
+            arr._value = values[id(arr)]
+
+    return [arr._value if isinstance(arr, LazyArray) else arr for arr in arrays]
+
+
+def _flatten(obj):
+    "Yields the items of nested tuples, lists and dicts."
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, (tuple, list)):
+            stack.extend(reversed(obj))
+        elif isinstance(obj, dict):
+            stack.extend(reversed(list(obj.values())))
+        else:
+            yield obj
+
+
+def _children(node: LazyArray) -> List[LazyArray]:
+    "Lazy operands of `node`, as many times as they appear."
+    return [x for x in _flatten((node.args, node.kwargs)) if isinstance(x, LazyArray)]
+
+
+def _toposort(roots: List[LazyArray]) -> List[LazyArray]:
+    "Nodes needed to compute `roots`, with operands before their consumers. Nodes already computed are leaves."
+    order, visited = [], set()
+    stack = [(root, False) for root in reversed(roots)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded:
+            order.append(node)
+            continue
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+
+        stack.append((node, True))
+        if not node.computed:
+            stack.extend((child, False) for child in reversed(_children(node)) if id(child) not in visited)
+    return order
+
+
+def _substitute(obj, values):
+    "Replaces the `LazyArray` in `obj` by their values, or by their computed values if missing in `values`."
+    if isinstance(obj, LazyArray):
+        return values[id(obj)] if id(obj) in values else obj._value
+    if isinstance(obj, tuple):
+        return tuple(_substitute(x, values) for x in obj)
+    if isinstance(obj, list):
+        return [_substitute(x, values) for x in obj]
+    if isinstance(obj, dict):
+        return {k: _substitute(v, values) for k, v in obj.items()}
+    return obj
+
+
+def _freeze(obj):
+    "Hashable description of an operand. Arrays are compared by identity and everything else by value."
+    if isinstance(obj, tuple):
+        return ("tuple",) + tuple(_freeze(x) for x in obj)
+    if isinstance(obj, list):
+        return ("list",) + tuple(_freeze(x) for x in obj)
+    if isinstance(obj, dict):
+        return ("dict",) + tuple(sorted((k, _freeze(v)) for k, v in obj.items()))
+    if isinstance(obj, slice):
+        return ("slice", _freeze(obj.start), _freeze(obj.stop), _freeze(obj.step))
+    if isinstance(obj, (bool, int, float, complex, str, bytes, type(None), type(Ellipsis), np.generic, np.dtype, type)):
+        return (type(obj), obj)
+    return ("id", id(obj))
+
+
+def _shape_of(x) -> Optional[Tuple[int, ...]]:
+    "Shape of `x` if known without computing it."
+    if isinstance(x, LazyArray):
+        return x._shape
+    return tuple(x.shape) if hasattr(x, "shape") else np.shape(x)
+
+
+def _dtype_of(x):
+    if isinstance(x, LazyArray):
+        return x._dtype
+    return x.dtype if hasattr(x, "dtype") else np.result_type(x)
+
+
+def _transpose_axes(x, axes) -> Optional[Tuple[int, ...]]:
+    if axes is not None:
+        return tuple(axes)
+    shape = _shape_of(x)
+    return None if shape is None else tuple(reversed(range(len(shape))))
+
+
+def _reshape_shape(x, shape) -> Optional[Tuple[int, ...]]:
+    "Target shape of a reshape, with -1 resolved. None if unknown."
+    shape = (shape,) if isinstance(shape, int) else tuple(shape)
+    if -1 not in shape:
+        return shape
+
+    source = _shape_of(x)
+    if source is None or _blocked(x):
+        return None
+    known = prod(n for n in shape if n != -1)
+    return tuple(prod(source) // known if n == -1 else n for n in shape)
+
+
+def _type_of(x) -> Optional[type]:
+    "Type of `x` if known without computing it. Reshapes and transpositions keep the type of their operand."
+    if not isinstance(x, LazyArray):
+        return type(x)
+    if x.computed:
+        return type(x._value)
+    if x.func in (np.reshape, np.transpose):
+        return _type_of(x.args[0])
+    return None
+
+
+def _reshape_order(x, kwargs) -> Optional[str]:
+    "Order of a reshape of `x`: the given one, or else the default of the implementation it dispatches to. None if unknown."
+    if "order" in kwargs:
+        return kwargs["order"]
+
+    cls = _type_of(x)
+    if cls is None:
+        return None
+    try:
+        # NOTE implementations differ (i.e. `BlockArray` defaults to "F")
+        return inspect.signature(dispatcher.reshape[(cls,)]).parameters["order"].default
+    except Exception:
+        return "C"
+
+
+def _fold(graph: Graph, func, method, args, kwargs) -> Optional["LazyArray"]:
+    """Simplifies chains of transpositions and reshapes. Returns the simplified result, or None if there is nothing to simplify.
+
+    - A transposition of a transposition is a single transposition, which is skipped if it is the identity.
+    - A reshape of a reshape in the same order is a single reshape, which is skipped if it gives back the shape of the source.
+    """
+    if func is np.transpose and method is None and not kwargs.keys() - {"axes"}:
+        x, axes = args[0], kwargs.get("axes", args[1] if len(args) > 1 else None)
+        axes = _transpose_axes(x, axes)
+        if axes is None:
+            return None
+
+        if isinstance(x, LazyArray) and x.func is np.transpose and not x.computed:
+            inner = _transpose_axes(x.args[0], x.args[1] if len(x.args) > 1 else x.kwargs.get("axes"))
+            if inner is None:
+                return None
+            x, axes = x.args[0], tuple(inner[i] for i in axes)
+
+        if axes == tuple(range(len(axes))):
+            return x
+        if x is not args[0]:
+            return graph.record(np.transpose, None, (x, axes), {})
+        return None
+
+    if func is np.reshape and method is None and len(args) == 2 and not kwargs.keys() - {"order"}:
+        x, shape, order = args[0], args[1], _reshape_order(args[0], kwargs)
+        target = _reshape_shape(x, shape)
+        if order is None:
+            return None
+
+        if isinstance(x, LazyArray) and x.func is np.reshape and not x.computed and _reshape_order(x.args[0], x.kwargs) == order:
+            x = x.args[0]
+
+        # NOTE a `BlockArray` of many blocks is reshaped block by block, so its shape is not the one to compare with
+        single = not _blocked(x) or (isinstance(x, BlockArray) and x.data.size == 1)
+        if single and target is not None and target == _shape_of(x):
+            return x
+        if x is not args[0]:
+            return graph.record(np.reshape, None, (x, shape), {"order": order})
+        return None
+
+    return None
+
+
+def _infer(func, method, args, kwargs):
+    "Infers the shape and dtype of the result of an operation without running it. Returns None for the unknowns."
+    try:
+        if isinstance(func, np.ufunc) and method == "__call__" and func.nout == 1 and "out" not in kwargs:
+            operands = args[: func.nin]
+            shapes = [_shape_of(x) for x in operands]
+            dtypes = [_dtype_of(x) for x in operands]
+            if any(s is None for s in shapes) or any(d is None for d in dtypes):
+                return None, None
+            dtype = func(*(np.zeros((), dtype=d) for d in dtypes), **{k: v for k, v in kwargs.items() if k == "dtype"}).dtype
+            return np.broadcast_shapes(*shapes), dtype
+
+        if func is np.transpose:
+            shape, axes = _shape_of(args[0]), _transpose_axes(args[0], args[1] if len(args) > 1 else kwargs.get("axes"))
+            if shape is None or axes is None:
+                return None, _dtype_of(args[0])
+            return tuple(shape[i] for i in axes), _dtype_of(args[0])
+
+        if func is np.reshape and len(args) == 2:
+            if _blocked(args[0]):
+                return None, _dtype_of(args[0])
+            return _reshape_shape(args[0], args[1]), _dtype_of(args[0])
+
+        if func is np.tensordot:
+            a, b = args[0], args[1]
+            axes = args[2] if len(args) > 2 else kwargs.get("axes", 2)
+            shape_a, shape_b = _shape_of(a), _shape_of(b)
+            dtype = None if _dtype_of(a) is None or _dtype_of(b) is None else np.result_type(_dtype_of(a), _dtype_of(b))
+            if shape_a is None or shape_b is None:
+                return None, dtype
+            axes_a, axes_b = normalize_axes(axes, len(shape_a))
+            axes_a = tuple(i % len(shape_a) for i in axes_a)
+            axes_b = tuple(i % len(shape_b) for i in axes_b)
+            return result_shape(shape_a, shape_b, (axes_a, axes_b)), dtype
+
+        if func is operator.getitem:
+            shape, key = _shape_of(args[0]), args[1]
+            if shape is None or any(isinstance(k, LazyArray) for k in (key if isinstance(key, tuple) else (key,))):
+                return None, _dtype_of(args[0])
+            return np.broadcast_to(np.empty((), dtype=bool), shape)[key].shape, _dtype_of(args[0])
+    except (TypeError, ValueError, IndexError):
+        pass
+
+    return None, None
+
+
+def _blocked(x) -> bool:
+    "Whether `x` is (or derives from) a `BlockArray`."
+    return isinstance(x, BlockArray) or (isinstance(x, LazyArray) and x.blocked)
@@ -0,0 +1,202 @@
+import functools
+import logging
+import os
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from math import prod
+from multiprocessing import shared_memory
+from typing import Callable, Iterable, List, Optional
+
+import autoray
+import numpy as np
+from rosnet.core.executor import EXECUTORS, Executor, executor
+
+logger = logging.getLogger(__name__)
+
+
+class Segment:
+    """A `multiprocessing.shared_memory` segment.
+
+    Only one process owns the segment and unlinks it once no array in that process references it. Other processes just attach to it.
+    """
+
+    # one segment object per name and process, so views and attachments share ownership
+    __opened: "weakref.WeakValueDictionary[str, Segment]" = weakref.WeakValueDictionary()
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        self.shm = shm
+        self.owner = owner
+        Segment.__opened[shm.name] = self
+
+    @classmethod
+    def create(cls, nbytes: int) -> "Segment":
+        # NOTE shared memory segments cannot be empty
+        return cls(shared_memory.SharedMemory(create=True, size=max(nbytes, 1)), owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "Segment":
+        segment = cls.__opened.get(name, None)
+        if segment is None:
+            segment = cls(shared_memory.SharedMemory(name=name), owner=False)
+        return segment
+
+    @property
+    def name(self) -> str:
+        return self.shm.name
+
+    @property
+    def address(self) -> int:
+        return np.frombuffer(self.shm.buf, dtype=np.uint8, count=1).__array_interface__["data"][0]
+
+    def __del__(self):
+        try:
+            self.shm.close()
+            if self.owner:
+                self.shm.unlink()
+        except (BufferError, FileNotFoundError):
+            pass
+
+
+def _attach(name: str, shape, dtype, strides, offset: int) -> "SharedArray":
+    segment = Segment.attach(name)
+    arr = np.ndarray(shape, dtype=dtype, buffer=segment.shm.buf, offset=offset, strides=strides).view(SharedArray)
+    arr.segment = segment
+    return arr
+
+
+class SharedArray(np.ndarray):
+    """A `numpy.ndarray` whose data lives in a `multiprocessing.shared_memory` segment.
+
+    When pickled, only a handle to the segment is serialized, so worker processes attach to the block instead of receiving a copy. Views of a `SharedArray` are also `SharedArray`s, while the result of any computation is a plain `numpy.ndarray`.
+    """
+
+    segment: Optional[Segment] = None
+
+    def __new__(cls, shape, dtype=float, order="C"):
+        dtype = np.dtype(dtype)
+        segment = Segment.create(prod(shape) * dtype.itemsize)
+        arr = super().__new__(cls, shape, dtype=dtype, buffer=segment.shm.buf, order=order)
+        arr.segment = segment
+        return arr
+
+    @classmethod
+    def from_array(cls, arr) -> "SharedArray":
+        "Copies `arr` into a new shared memory segment."
+        if isinstance(arr, SharedArray) and arr.segment is not None:
+            return arr
+
+        arr = np.asarray(arr)
+        res = cls(arr.shape, dtype=arr.dtype)
+        np.copyto(res, arr)
+        return res
+
+    def __array_finalize__(self, obj):
+        # views keep a reference to the segment they come from
+        self.segment = getattr(obj, "segment", None)
+
+    def __array_wrap__(self, arr, context=None, return_scalar=False):
+        # results of computations are not allocated in shared memory
+        arr = arr.view(np.ndarray)
+        return arr[()] if return_scalar else arr
+
+    def __reduce__(self):
+        if self.segment is None:
+            return (np.asarray, (self.view(np.ndarray).copy(),))
+
+        offset = self.__array_interface__["data"][0] - self.segment.address
+        return (_attach, (self.segment.name, self.shape, self.dtype.str, self.strides, offset))
+
+    def __repr__(self) -> str:
+        name = self.segment.name if self.segment is not None else None
+        return f"SharedArray<segment={name}, shape={self.shape}, dtype={self.dtype}>"
+
+
+def full(shape, fill_value, dtype=None, order="C") -> SharedArray:
+    arr = SharedArray(shape, dtype=dtype or np.dtype(type(fill_value)), order=order)
+    arr.fill(fill_value)
+    return arr
+
+
+def zeros(shape, dtype=None, order="C") -> SharedArray:
+    return full(shape, 0, dtype=dtype or np.float64, order=order)
+
+
+def ones(shape, dtype=None, order="C") -> SharedArray:
+    return full(shape, 1, dtype=dtype or np.float64, order=order)
+
+
+def rand(*shape) -> SharedArray:
+    arr = SharedArray(shape, dtype=np.float64)
+    arr[...] = np.random.random_sample(shape)
+    return arr
+
+
+# NOTE allows `inner="rosnet.array.shared"` in BlockArray constructors
+for name, fn in [("array", SharedArray.from_array), ("full", full), ("zeros", zeros), ("ones", ones), ("random.rand", rand)]:
+    autoray.autoray._FUNCS[__name__, name] = fn
+
+
+def _share(x):
+    "Moves results to shared memory and releases their ownership to the receiving process."
+    if isinstance(x, np.ndarray):
+        x = SharedArray.from_array(x)
+        x.segment.owner = False
+    elif isinstance(x, tuple) and hasattr(x, "_fields"):
+        # NOTE named tuples (e.g. the result of `numpy.linalg.qr`) take their fields as positional arguments
+        x = type(x)(*(_share(i) for i in x))
+    elif isinstance(x, (list, tuple)):
+        x = type(x)(_share(i) for i in x)
+    return x
+
+
+def _adopt(x):
+    if isinstance(x, SharedArray) and x.segment is not None:
+        x.segment.owner = True
+    elif isinstance(x, (list, tuple)):
+        for i in x:
+            _adopt(i)
+    return x
+
+
+def _call_shared(fn: Callable, *args):
+    # NOTE forked workers inherit the executor of the parent, so block operations nested in `fn` would submit to the pool from within it
+    with executor("sequential"):
+        return _share(fn(*args))
+
+
+def _init_worker():
+    # NOTE forked workers inherit the random state of the parent
+    np.random.seed()
+
+
+class ProcessExecutor(Executor):
+    """Runs block operations on a pool of processes.
+
+    Useful for block operations that hold the GIL (i.e. small blocks or Python-heavy functions). Blocks are exchanged through shared memory: `SharedArray` arguments are attached by the workers and results are returned as `SharedArray`s, so only segment handles are pickled. Blocks of any other type are pickled as usual.
+
+    Arguments
+    ---------
+    - max_workers: int, optional. Number of processes. Defaults to the number of cores.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.__pool = None
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self.__pool is None:
+            self.__pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker)
+        return self.__pool
+
+    def map(self, fn: Callable, *iterables: Iterable) -> List:
+        fn = functools.partial(_call_shared, fn)
+        return [_adopt(x) for x in self.pool.map(fn, *iterables)]
+
+    def shutdown(self):
+        if self.__pool is not None:
+            self.__pool.shutdown(wait=True)
+            self.__pool = None
+
+
+EXECUTORS["processes"] = ProcessExecutor
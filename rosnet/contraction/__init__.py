@@ -0,0 +1,175 @@
+import logging
+from typing import Optional, Union
+
+import numpy as np
+import opt_einsum as oe
+from rosnet import dispatch as dispatcher
+from rosnet.array.block import BlockArray
+from rosnet.array.block import array as block_array
+from rosnet.core.executor import get_executor
+from rosnet.core.interface import Array
+from rosnet.contraction.cache import PathCache, settings
+from rosnet.contraction.plan import Plan, Task
+from rosnet.contraction.slicing import cost, find_slices, peak_size
+
+logger = logging.getLogger(__name__)
+
+
+def contract(
+    eq: str,
+    *arrays,
+    optimize="auto",
+    memory_limit: Optional[int] = None,
+    target_slices: Optional[int] = None,
+    slicing="auto",
+    slicing_options: Optional[dict] = None,
+    cache: Union[bool, PathCache] = True,
+    executor=None,
+):
+    """Contracts a tensor network given in Einstein notation, slicing it so that every slice fits in `memory_limit`.
+
+    The contraction is compiled into a `Plan` by `compile_plan` and run by `execute`. Intermediates that do not depend on some sliced index are computed once and shared by those slices, and every block is released as soon as its last consumer is submitted. The expected peak memory is logged before execution starts.
+
+    Arguments
+    ---------
+    - eq: str. Contraction in Einstein notation, as in `numpy.einsum`.
+    - arrays: numpy.ndarray, BlockArray or Array. Input tensors.
+    - optimize: str, list or opt_einsum.paths.PathOptimizer. Contraction path or optimizer, as in `opt_einsum.contract`.
+    - memory_limit: int, optional. Maximum size in bytes of a tensor in a slice.
+    - target_slices: int, optional. Minimum number of slices.
+    - slicing: str. Method of `find_slices`.
+    - slicing_options: dict, optional. Other arguments of `find_slices` (i.e. options of `cotengra.SliceFinder`).
+    - cache: bool or PathCache. Where to look up (and store) the path and the sliced indices. If True, uses a `PathCache` in `$ROSNET_CACHE_DIR` (or `~/.cache/rosnet`). Explicit paths are not cached.
+
+    Returns
+    -------
+    `BlockArray` with blocks of size 1 along sliced output indices, or the scalar result if the output has no indices.
+    """
+    plan = compile_plan(eq, *arrays, optimize=optimize, memory_limit=memory_limit, target_slices=target_slices, slicing=slicing, slicing_options=slicing_options, cache=cache)
+    logger.info(plan.report())
+    return execute(plan, arrays, executor)
+
+
+def compile_plan(
+    eq: str,
+    *arrays,
+    optimize="auto",
+    memory_limit: Optional[int] = None,
+    target_slices: Optional[int] = None,
+    slicing="auto",
+    slicing_options: Optional[dict] = None,
+    cache: Union[bool, PathCache] = True,
+) -> Plan:
+    """Finds the contraction path and the sliced indices of a contraction, and compiles them into a `Plan`.
+
+    The sliced indices are chosen by `rosnet.contraction.slicing.find_slices`. Arguments are the same as in `contract`. Only the shapes and dtypes of `arrays` are used.
+    """
+    shapes = [tuple(arr.shape) for arr in arrays]
+    itemsize = np.result_type(*(arr.dtype for arr in arrays)).itemsize
+
+    cache = PathCache() if cache is True else None if cache is False else cache
+    key, entry = None, None
+    if cache is not None and not isinstance(optimize, (list, tuple)):
+        chunks = [arr.chunks if isinstance(arr, BlockArray) else None for arr in arrays]
+        key = PathCache.key(eq=eq, shapes=shapes, chunks=chunks, itemsize=itemsize, optimize=settings(optimize), memory_limit=memory_limit, target_slices=target_slices, slicing=slicing, slicing_options=slicing_options)
+        entry = cache.get(key)
+
+    if entry is not None:
+        # NOTE entries that do not describe a valid contraction of `eq` are treated as misses
+        try:
+            path, info = oe.contract_path(eq, *shapes, shapes=True, optimize=[tuple(ids) for ids in entry["path"]])
+            inputs, output, size_dict = _network(info)
+            sliced = sorted(entry["sliced"])
+            if len(shapes) - sum(len(ids) - 1 for ids in path) != 1:
+                raise ValueError(f"incomplete path {path}")
+            if not all(c in size_dict for c in sliced):
+                raise ValueError(f"unknown sliced indices {sliced}")
+        except (KeyError, TypeError, ValueError, IndexError) as e:
+            logger.warning(f"ignoring invalid contraction path in cache: {e}")
+            entry = None
+
+    if entry is None:
+        path, info = oe.contract_path(eq, *shapes, shapes=True, optimize=optimize)
+        inputs, output, size_dict = _network(info)
+        sliced = sorted(find_slices(inputs, output, size_dict, path, itemsize=itemsize, memory_limit=memory_limit, target_slices=target_slices, method=slicing, **(slicing_options or {})))
+
+        if key is not None:
+            try:
+                cache.put(key, {"path": [list(ids) for ids in path], "sliced": sliced})
+            except OSError as e:
+                logger.warning(f"could not store contraction path in cache: {e}")
+
+    logger.info(f"sliced indices={sliced}, peak size={peak_size(inputs, output, size_dict, path, frozenset(sliced))}, cost={cost(inputs, output, size_dict, path, frozenset(sliced))}")
+
+    steps = [(ids, eq) for ids, _, eq, _, _ in info.contraction_list]
+    return Plan.compile(inputs, output, steps, sliced, size_dict, itemsize)
+
+
+def execute(plan: Plan, arrays, executor=None):
+    """Runs a compiled `Plan` on `arrays`.
+
+    Inputs are laid out as `BlockArray` with blocks of size 1 along sliced indices, so that every slice of the network is a selection of one block per input. The tasks of a stage are submitted together (through `executor`, or as COMPSs tasks for `COMPSsArray` blocks). Then, the blocks whose last consumer is in that stage are dropped, which deletes the COMPSs objects of `COMPSsArray` blocks.
+    """
+    executor = get_executor(executor)
+
+    arrays = [_layout(arr, blockshape) for arr, blockshape in zip(arrays, plan.blockshapes)]
+    blocks = {ref: arrays[i].data[idx] for ref, (i, idx) in plan.leaves.items()}
+    del arrays
+
+    for stage, release in zip(plan.stages, plan.release):
+        results = executor.map(_run, stage, [[blocks[ref] for ref in task.inputs] for task in stage])
+        for task, block in zip(stage, results):
+            blocks[task.output] = block
+
+        for ref in release:
+            del blocks[ref]
+
+    deps, refs = plan.result
+    if not plan.output:
+        return np.asarray(blocks[refs[()]]).reshape(())[()]
+
+    grid = np.empty(tuple(plan.size_dict[c] if c in plan.sliced else 1 for c in plan.output), dtype=object)
+    for values, ref in refs.items():
+        grid[tuple(values[deps.index(c)] if c in deps else 0 for c in plan.output)] = blocks[ref]
+
+    return BlockArray(grid)
+
+
+def _network(info):
+    "Returns the input indices, output indices and dimension of every index of a `opt_einsum.contract.PathInfo`."
+    return info.input_subscripts.split(","), info.output_subscript, {c: int(n) for c, n in info.size_dict.items()}
+
+
+def _run(task: Task, operands: list):
+    return np.add(*operands) if task.eq is None else _pairwise(task.eq, *operands)
+
+
+def _layout(arr, blockshape) -> BlockArray:
+    "Returns `arr` as a `BlockArray` divided in blocks of shape `blockshape`."
+    if isinstance(arr, BlockArray):
+        return dispatcher.rechunk(arr, blockshape)
+
+    if isinstance(arr, Array) and not isinstance(arr, np.ndarray):
+        grid = np.empty((1,) * arr.ndim, dtype=object)
+        grid.flat[0] = arr
+        return dispatcher.rechunk(BlockArray(grid), blockshape)
+
+    return block_array(arr, blockshape=blockshape)
+
+
+def _pairwise(eq: str, *operands):
+    "Contracts one step. Pure contractions go through `tensordot` (and a transposition if needed), others through `einsum`."
+    inputs, output = eq.split("->")
+    inputs = inputs.split(",")
+
+    if len(operands) == 2 and all(len(set(term)) == len(term) for term in inputs):
+        a, b = inputs
+        shared = [c for c in a if c in b]
+        if all(c not in output for c in shared) and all(c in output for c in a + b if c not in shared):
+            res = np.tensordot(*operands, ([a.index(c) for c in shared], [b.index(c) for c in shared]))
+            inds = [c for c in a + b if c not in shared]
+            if inds != list(output):
+                res = np.transpose(res, [inds.index(c) for c in output])
+            return res
+
+    return np.einsum(eq, *operands)
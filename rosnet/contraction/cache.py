@@ -0,0 +1,97 @@
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE = 64 * 2**20
+
+
+class PathCache:
+    """Persistent cache of contraction paths and sliced indices, stored as one JSON file per entry.
+
+    When the total size of the entries exceeds `max_size`, the least recently used entries are removed. Entries that cannot be read are treated as misses.
+
+    Arguments
+    ---------
+    - directory: str or os.PathLike, optional. Where entries are stored. Defaults to `$ROSNET_CACHE_DIR` or `~/.cache/rosnet`.
+    - max_size: int, optional. Maximum size in bytes of all the entries. Defaults to 64 MiB.
+    """
+
+    def __init__(self, directory: Optional[Union[str, os.PathLike]] = None, max_size: int = DEFAULT_MAX_SIZE):
+        if directory is None:
+            directory = os.environ.get("ROSNET_CACHE_DIR", Path.home() / ".cache" / "rosnet")
+        self.directory = Path(directory)
+        self.max_size = max_size
+
+    @staticmethod
+    def key(**kwargs) -> str:
+        "Hashes the JSON-serializable description of a contraction into a key."
+        return hashlib.sha256(json.dumps(kwargs, sort_keys=True, default=str).encode()).hexdigest()
+
+    def __path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        path = self.__path(key)
+        try:
+            with open(path) as file:
+                value = json.load(file)
+
+            # NOTE the modification time tracks the last use, for eviction
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+
+        logger.debug(f"path cache hit: {key}")
+        return value
+
+    def put(self, key: str, value: dict):
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        # write to a temporary file first, so that concurrent readers never see partial entries
+        tmp = self.directory / f".{key}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, "w") as file:
+                json.dump(value, file)
+            os.replace(tmp, self.__path(key))
+        finally:
+            tmp.unlink(missing_ok=True)
+
+        self.evict()
+
+    def evict(self):
+        "Removes the least recently used entries until they fit in `max_size`."
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        size = sum(s for _, s, _ in entries)
+        for _, s, path in sorted(entries, key=lambda entry: entry[0]):
+            if size <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            size -= s
+
+    def clear(self):
+        for path in self.directory.glob("*.json"):
+            path.unlink(missing_ok=True)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.directory.glob("*.json"))
+
+
+def settings(optimize) -> Union[str, dict, list]:
+    "Describes a path optimizer by its JSON-serializable settings, so that equally configured optimizers share cache entries."
+    if isinstance(optimize, (str, list, tuple)) or optimize is None:
+        return optimize
+
+    attrs = {k: v for k, v in vars(optimize).items() if not k.startswith("_") and isinstance(v, (str, int, float, bool, type(None), list, tuple))}
+    return {"type": f"{type(optimize).__module__}.{type(optimize).__qualname__}", **attrs}
@@ -0,0 +1,161 @@
+import itertools
+from math import prod
+from typing import Dict, List, Optional, Sequence, Tuple
+
+
+class Task:
+    """Operation on blocks of a compiled contraction.
+
+    Arguments
+    ---------
+    - eq: str, optional. Einstein notation of a contraction step. If None, the task sums its inputs.
+    - inputs: Tuple[int, ...]. Identifiers of the operands.
+    - output: int. Identifier of the result.
+    - nbytes: int. Size in bytes of the result.
+    """
+
+    def __init__(self, eq: Optional[str], inputs: Tuple[int, ...], output: int, nbytes: int):
+        self.eq = eq
+        self.inputs = inputs
+        self.output = output
+        self.nbytes = nbytes
+
+    def __repr__(self) -> str:
+        return f"Task(eq={self.eq!r}, inputs={self.inputs}, output={self.output}, nbytes={self.nbytes})"
+
+
+class Plan:
+    """Task graph of a sliced contraction, with the lifetime of every block.
+
+    Tasks are grouped in stages of independent tasks that are submitted together. Every block (input or intermediate) is released right after the stage of its last consumer is submitted, so the expected memory in use is known before execution.
+
+    Use `Plan.compile` to build it and `rosnet.contraction.execute` to run it.
+    """
+
+    def __init__(self, inputs, output, sliced, size_dict, itemsize):
+        self.inputs: List[str] = list(inputs)
+        self.output: str = output
+        self.sliced: List[str] = list(sliced)
+        self.size_dict: Dict[str, int] = dict(size_dict)
+        self.itemsize: int = itemsize
+
+        # `leaves[ref] = (input, block index)` for every input block used
+        self.leaves: Dict[int, Tuple[int, Tuple[int, ...]]] = {}
+        self.stages: List[List[Task]] = []
+        # identifiers of the blocks to release after each stage
+        self.release: List[List[int]] = []
+        # sliced indices the result depends on, and the identifier of the result block for each of their values
+        self.result: Tuple[Tuple[str, ...], Dict[Tuple[int, ...], int]] = ((), {})
+        self.nbytes: Dict[int, int] = {}
+
+    @property
+    def blockshapes(self) -> List[Tuple[int, ...]]:
+        "Blockshape of every input, with blocks of size 1 along sliced indices."
+        return [tuple(1 if c in self.sliced else self.size_dict[c] for c in term) for term in self.inputs]
+
+    @property
+    def tasks(self) -> List[Task]:
+        return [task for stage in self.stages for task in stage]
+
+    @classmethod
+    def compile(cls, inputs: Sequence[str], output: str, steps, sliced: Sequence[str], size_dict: Dict[str, int], itemsize: int = 8) -> "Plan":
+        """Compiles the pairwise `steps` of a contraction (as in `opt_einsum.contract.PathInfo.contraction_list`) sliced along `sliced`.
+
+        Every operand is a mapping from the values of the sliced indices it depends on to its block. A step is computed once per value of the sliced indices of its operands, so slice-invariant subtrees are shared by all the slices. Sliced indices that are contracted away are summed by a pairwise tree right after the step that removes them.
+        """
+        plan = cls(inputs, output, sliced, size_dict, itemsize)
+        counter = itertools.count()
+
+        def nbytes(term):
+            return prod(size_dict[c] for c in term if c not in sliced) * itemsize
+
+        operands = []
+        for i, term in enumerate(inputs):
+            deps = tuple(c for c in sliced if c in term)
+            blocks = {}
+            for key in _space(deps, size_dict):
+                blocks[key] = next(counter)
+                plan.leaves[blocks[key]] = (i, tuple(key[deps.index(c)] if c in deps else 0 for c in term))
+                plan.nbytes[blocks[key]] = nbytes(term)
+            operands.append((deps, blocks))
+
+        for ids, eq in steps:
+            pieces = [operands.pop(i) for i in ids]
+            deps = tuple(c for c in sliced if any(c in d for d, _ in pieces))
+            term = eq.split("->")[1]
+
+            stage, blocks = [], {}
+            for key in _space(deps, size_dict):
+                task = Task(eq, tuple(refs[tuple(key[deps.index(c)] for c in d)] for d, refs in pieces), next(counter), nbytes(term))
+                stage.append(task)
+                blocks[key] = task.output
+            plan.stages.append(stage)
+
+            # sum the sliced indices that no other operand needs
+            if any(c not in term for c in deps):
+                live = tuple(c for c in deps if c in term)
+                groups = {}
+                for key, ref in blocks.items():
+                    groups.setdefault(tuple(key[deps.index(c)] for c in live), []).append(ref)
+
+                while any(len(group) > 1 for group in groups.values()):
+                    stage = []
+                    for key, group in groups.items():
+                        merged = []
+                        for a, b in zip(group[0::2], group[1::2]):
+                            stage.append(Task(None, (a, b), next(counter), nbytes(term)))
+                            merged.append(stage[-1].output)
+                        groups[key] = merged + group[-1:] if len(group) % 2 else merged
+                    plan.stages.append(stage)
+
+                deps, blocks = live, {key: group[0] for key, group in groups.items()}
+
+            operands.append((deps, blocks))
+
+        plan.result = operands[0]
+        for task in plan.tasks:
+            plan.nbytes[task.output] = task.nbytes
+
+        # lifetimes: a block is released after the stage of its last consumer
+        last = {}
+        for i, stage in enumerate(plan.stages):
+            for task in stage:
+                for ref in task.inputs:
+                    last[ref] = i
+        plan.release = [[] for _ in plan.stages]
+        for ref, i in last.items():
+            plan.release[i].append(ref)
+
+        return plan
+
+    def memory(self) -> List[int]:
+        """Expected bytes in use during each stage.
+
+        All the input blocks are in use from the start. A stage holds the blocks alive before it plus the blocks it produces, and then frees the blocks whose last consumer is in the stage.
+        """
+        live = sum(self.nbytes[ref] for ref in self.leaves)
+        res = []
+        for stage, release in zip(self.stages, self.release):
+            live += sum(task.nbytes for task in stage)
+            res.append(live)
+            live -= sum(self.nbytes[ref] for ref in release)
+        return res
+
+    def peak_memory(self, nodes: int = 1) -> int:
+        """Expected peak of bytes in use per node, if blocks are evenly spread over `nodes` nodes.
+
+        A node never holds less than the largest task, i.e. its operands and its result.
+        """
+        memory = self.memory() or [sum(self.nbytes[ref] for ref in self.leaves)]
+        largest = max((task.nbytes + sum(self.nbytes[ref] for ref in task.inputs) for task in self.tasks), default=0)
+        return max(-(-max(memory) // nodes), largest)
+
+    def report(self, nodes: int = 1) -> str:
+        return f"Plan(tasks={len(self.tasks)}, stages={len(self.stages)}, sliced={self.sliced}, nodes={nodes}, peak memory per node={self.peak_memory(nodes)} bytes)"
+
+    def __repr__(self) -> str:
+        return self.report()
+
+
+def _space(deps, size_dict):
+    return itertools.product(*(range(size_dict[c]) for c in deps))
@@ -0,0 +1,123 @@
+from math import prod
+from typing import Dict, FrozenSet, Optional, Sequence, Tuple
+
+try:
+    import cotengra as ctg
+except ImportError:
+    ctg = None
+
+
+def terms(inputs: Sequence[str], output: str, path: Sequence[Tuple[int, ...]]) -> list:
+    "Returns the index sets of the inputs and of every intermediate produced by contracting `inputs` along `path`, in order of appearance."
+    operands = [set(term) for term in inputs]
+    res = list(operands)
+    for ids in path:
+        pieces = [operands.pop(i) for i in sorted(ids, reverse=True)]
+
+        # an index is kept if the output or any other operand still needs it
+        inter = set().union(*pieces) & set(output).union(*operands)
+        operands.append(inter)
+        res.append(inter)
+
+    return res
+
+
+def peak_size(inputs: Sequence[str], output: str, size_dict: Dict[str, int], path, sliced: FrozenSet[str] = frozenset()) -> int:
+    "Number of elements of the largest tensor in a slice of the contraction."
+    return max(prod(size_dict[c] for c in term if c not in sliced) for term in terms(inputs, output, path))
+
+
+def cost(inputs: Sequence[str], output: str, size_dict: Dict[str, int], path, sliced: FrozenSet[str] = frozenset()) -> int:
+    """Number of multiply-adds of all the slices of the contraction.
+
+    As in `rosnet.contract`, every step is computed once per value of the sliced indices it depends on, and sliced indices are summed out as soon as they are contracted.
+    """
+    operands = [(set(term), set(term) & sliced) for term in inputs]
+
+    total = 0
+    for ids, inter in zip(path, terms(inputs, output, path)[len(inputs) :]):
+        pieces = [operands.pop(i) for i in sorted(ids, reverse=True)]
+        deps = set().union(*(d for _, d in pieces))
+        total += prod(size_dict[c] for c in set().union(*(t for t, _ in pieces)) if c not in sliced) * prod(size_dict[c] for c in deps)
+        operands.append((inter, deps & inter))
+
+    return total
+
+
+def find_slices(
+    inputs: Sequence[str],
+    output: str,
+    size_dict: Dict[str, int],
+    path,
+    itemsize: int = 8,
+    memory_limit: Optional[int] = None,
+    target_slices: Optional[int] = None,
+    method: str = "auto",
+    **kwargs,
+) -> FrozenSet[str]:
+    """Selects the indices to slice so that every slice of the contraction fits in memory.
+
+    Arguments
+    ---------
+    - inputs: Sequence[str]. Indices of the input tensors.
+    - output: str. Indices of the output tensor.
+    - size_dict: Dict[str, int]. Dimension of every index.
+    - path: Sequence[Tuple[int, ...]]. Contraction path, as in `opt_einsum`.
+    - itemsize: int. Size in bytes of an element.
+    - memory_limit: int, optional. Maximum size in bytes of a tensor in a slice.
+    - target_slices: int, optional. Minimum number of slices.
+    - method: "auto", "greedy" or "cotengra". "auto" uses `cotengra.SliceFinder` if available or the greedy slicer otherwise.
+    - kwargs: passed to `cotengra.SliceFinder` (i.e. `target_overhead`, `minimize` or `temperature`). Only for "cotengra".
+    """
+    if memory_limit is None and target_slices is None and kwargs.get("target_overhead") is None:
+        return frozenset()
+
+    if method == "auto":
+        method = "cotengra" if ctg is not None else "greedy"
+
+    if method == "cotengra":
+        if ctg is None:
+            raise ImportError("method='cotengra' requires cotengra")
+
+        tree = ctg.ContractionTree.from_path(inputs, output, size_dict, path=path)
+        target_size = memory_limit // itemsize if memory_limit is not None else None
+        ix, _ = ctg.SliceFinder(tree, target_size=target_size, target_slices=target_slices, **kwargs).search()
+        return frozenset(ix)
+
+    if method == "greedy":
+        if kwargs:
+            raise ValueError(f"options {list(kwargs)} are only supported by method='cotengra'")
+        return _greedy(inputs, output, size_dict, path, itemsize, memory_limit, target_slices)
+
+    raise ValueError(f"method must be one of 'auto', 'greedy' or 'cotengra' but is {method}")
+
+
+def _greedy(inputs, output, size_dict, path, itemsize, memory_limit, target_slices) -> FrozenSet[str]:
+    """Slices one index at a time until both targets are met.
+
+    While the largest tensor exceeds `memory_limit`, the index that shrinks it the most is sliced. Then, until there are `target_slices` slices, the index with the smallest flop overhead is sliced. Ties are broken by the flop overhead.
+    """
+    sliced = frozenset()
+    candidates = sorted(c for c, n in size_dict.items() if n > 1)
+
+    def fits(sliced):
+        return memory_limit is None or peak_size(inputs, output, size_dict, path, sliced) * itemsize <= memory_limit
+
+    def enough(sliced):
+        return target_slices is None or prod(size_dict[c] for c in sliced) >= target_slices
+
+    while not (fits(sliced) and enough(sliced)):
+        candidates = [c for c in candidates if c not in sliced]
+        if not candidates:
+            if not fits(sliced):
+                raise MemoryError(f"contraction does not fit in {memory_limit} bytes even with all indices sliced")
+            break
+
+        if not fits(sliced):
+            key = lambda c: (peak_size(inputs, output, size_dict, path, sliced | {c}), cost(inputs, output, size_dict, path, sliced | {c}))
+        else:
+            key = lambda c: cost(inputs, output, size_dict, path, sliced | {c})
+
+        sliced = sliced | {min(candidates, key=key)}
+
+    return sliced
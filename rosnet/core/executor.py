@@ -0,0 +1,141 @@
+import abc
+import contextvars
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Type, Union
+
+logger = logging.getLogger(__name__)
+
+
+class Executor(metaclass=abc.ABCMeta):
+    """Runs independent block operations.
+
+    Block-level routines of `BlockArray` submit their per-block work through `Executor.map`, so the same code runs sequentially, on a local pool of workers or (for `COMPSsArray` blocks) as asynchronous COMPSs tasks.
+    """
+
+    @abc.abstractmethod
+    def map(self, fn: Callable, *iterables: Iterable) -> List:
+        "Applies `fn` to the items of `iterables` and returns the results in order."
+        pass
+
+    def shutdown(self):
+        "Releases the resources held by the executor."
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+
+class SequentialExecutor(Executor):
+    """Runs block operations one after another in the calling thread.
+
+    This is the default executor. Operations on `COMPSsArray` blocks are still parallel, as they only submit tasks.
+    """
+
+    def map(self, fn: Callable, *iterables: Iterable) -> List:
+        return list(map(fn, *iterables))
+
+
+class ThreadExecutor(Executor):
+    """Runs block operations on a pool of threads.
+
+    NumPy and BLAS release the GIL on large operations, so blocks of `BlockArray[numpy.ndarray]` are processed concurrently.
+
+    Arguments
+    ---------
+    - max_workers: int, optional. Number of threads. Defaults to the number of cores.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.__pool = None
+
+    @property
+    def pool(self) -> ThreadPoolExecutor:
+        if self.__pool is None:
+            self.__pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="rosnet")
+        return self.__pool
+
+    def map(self, fn: Callable, *iterables: Iterable) -> List:
+        args = [list(it) for it in iterables]
+
+        # not worth dispatching a single block to the pool
+        if self.max_workers == 1 or min((len(i) for i in args), default=0) <= 1:
+            return list(map(fn, *args))
+
+        return list(self.pool.map(fn, *args))
+
+    def shutdown(self):
+        if self.__pool is not None:
+            self.__pool.shutdown(wait=True)
+            self.__pool = None
+
+
+EXECUTORS: Dict[str, Type[Executor]] = {
+    "sequential": SequentialExecutor,
+    "threads": ThreadExecutor,
+}
+
+# executors selected by name are shared, so that their pools are reused between calls
+__shared: Dict[str, Executor] = {}
+
+__current: contextvars.ContextVar = contextvars.ContextVar("rosnet.executor", default=SequentialExecutor())
+
+
+def get_executor(executor: Union[None, str, Executor] = None) -> Executor:
+    """Resolves the executor to use.
+
+    Arguments
+    ---------
+    - executor: None, str or Executor. If None, returns the executor of the current context. If str, returns a shared executor of that kind (one of `EXECUTORS`).
+    """
+    if executor is None:
+        return __current.get()
+
+    if isinstance(executor, Executor):
+        return executor
+
+    if isinstance(executor, str):
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {list(EXECUTORS)} but is {executor}")
+
+        if executor not in __shared:
+            __shared[executor] = EXECUTORS[executor]()
+        return __shared[executor]
+
+    raise TypeError(f"invalid executor: {executor}")
+
+
+@contextmanager
+def executor(executor: Union[str, Executor] = "threads", **kwargs):
+    """Sets the executor of block operations within the context.
+
+    Arguments
+    ---------
+    - executor: str or Executor. Kind of executor (one of `EXECUTORS`) or an `Executor` instance.
+    - kwargs: passed to the constructor of the executor. If given, a private executor is created and shut down on exit.
+
+    Example
+    -------
+    >>> with rosnet.executor("threads", max_workers=8):
+    ...     c = np.tensordot(a, b, axes)
+    """
+    if isinstance(executor, str) and kwargs:
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of {list(EXECUTORS)} but is {executor}")
+        instance, owned = EXECUTORS[executor](**kwargs), True
+    else:
+        instance, owned = get_executor(executor), False
+
+    token = __current.set(instance)
+    try:
+        yield instance
+    finally:
+        __current.reset(token)
+        if owned:
+            instance.shutdown()
@@ -0,0 +1,104 @@
+import functools
+import itertools
+from math import prod
+from typing import List, Optional, Sequence
+
+import numpy as np
+from rosnet.core.util import normalize_axes
+
+try:
+    from scipy.linalg.blas import get_blas_funcs
+except ImportError:
+    get_blas_funcs = None
+
+BLAS_DTYPES = (np.float32, np.float64, np.complex64, np.complex128)
+
+
+def _as_matrix(x: np.ndarray, outer, inner, transpose: bool) -> np.ndarray:
+    "Reshapes `x` into the (outer, inner) matrix of `numpy.tensordot`, or (inner, outer) if `transpose`."
+    axes = list(inner) + list(outer) if transpose else list(outer) + list(inner)
+    m, k = prod(x.shape[i] for i in outer), prod(x.shape[i] for i in inner)
+    return x.transpose(axes).reshape((k, m) if transpose else (m, k))
+
+
+def tensordot_accumulate(a: Sequence[np.ndarray], b: Sequence[np.ndarray], axes, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Computes `sum(np.tensordot(ai, bi, axes) for ai, bi in zip(a, b))` without temporaries.
+
+    Operands are reshaped into matrices (as `numpy.tensordot` does) and every partial product is accumulated into a single output. With SciPy, partial products are written by BLAS GEMM with `beta=1`. Otherwise, they go through one reusable buffer.
+
+    Arguments
+    ---------
+    - a, b: Sequence[numpy.ndarray]. Pairs of blocks to contract.
+    - axes: int or (Sequence[int], Sequence[int]). Same as in `numpy.tensordot`.
+    - out: numpy.ndarray, optional. C-contiguous array that the result is added to. If None, a new array is returned.
+    """
+    axes_a, axes_b = normalize_axes(axes, a[0].ndim)
+    axes_a = [i % a[0].ndim for i in axes_a]
+    axes_b = [i % b[0].ndim for i in axes_b]
+    outer_a = [i for i in range(a[0].ndim) if i not in axes_a]
+    outer_b = [i for i in range(b[0].ndim) if i not in axes_b]
+
+    shape = tuple(a[0].shape[i] for i in outer_a) + tuple(b[0].shape[i] for i in outer_b)
+    # NOTE `numpy.result_type` takes a limited number of arguments, so dtypes are promoted pairwise
+    dtype = functools.reduce(np.promote_types, (x.dtype for x in itertools.chain(a, b))) if out is None else out.dtype
+
+    if out is not None and (out.shape != shape or not out.flags.c_contiguous):
+        raise ValueError(f"'out' must be a C-contiguous array of shape {shape}")
+
+    m, n = prod(shape[: len(outer_a)]), prod(shape[len(outer_a) :])
+    acc = np.zeros((m, n), dtype=dtype) if out is None else out.reshape(m, n)
+
+    # NOTE C-ordered (m, n) accumulator is the F-ordered (n, m) transpose, so GEMM computes acc.T += b.T @ a.T in-place
+    gemm = get_blas_funcs("gemm", dtype=dtype) if get_blas_funcs is not None and dtype in BLAS_DTYPES else None
+    buffer = None
+
+    for i, (ai, bi) in enumerate(zip(a, b)):
+        ma = _as_matrix(np.asarray(ai, dtype=dtype), outer_a, axes_a, transpose=False)
+        mb = _as_matrix(np.asarray(bi, dtype=dtype), outer_b, axes_b, transpose=True)
+
+        if i == 0 and out is None:
+            np.matmul(ma, mb, out=acc)
+        elif gemm is not None:
+            gemm(1.0, mb.T, ma.T, beta=1.0, c=acc.T, overwrite_c=True)
+        else:
+            buffer = np.empty_like(acc) if buffer is None else buffer
+            np.matmul(ma, mb, out=buffer)
+            acc += buffer
+
+    return acc.reshape(shape)
+
+
+def tensordot_batched(a: Sequence[Sequence[np.ndarray]], b: Sequence[Sequence[np.ndarray]], axes) -> List[np.ndarray]:
+    """Computes `tensordot_accumulate(a[i], b[i], axes)` for every `i` with a few batched `numpy.matmul` calls.
+
+    Pairs of blocks with the same shapes are stacked into 3-D arrays and contracted by a single `numpy.matmul`, which amortizes the per-call overhead when blocks are small.
+    """
+    ndim_a, ndim_b = a[0][0].ndim, b[0][0].ndim
+    axes_a, axes_b = normalize_axes(axes, ndim_a)
+    axes_a = [i % ndim_a for i in axes_a]
+    axes_b = [i % ndim_b for i in axes_b]
+    outer_a = [i for i in range(ndim_a) if i not in axes_a]
+    outer_b = [i for i in range(ndim_b) if i not in axes_b]
+
+    groups = {}
+    for i, (ai, bi) in enumerate(zip(a, b)):
+        for x, y in zip(ai, bi):
+            groups.setdefault((x.shape, y.shape), []).append((i, x, y))
+
+    res = [None] * len(a)
+    for (shape_a, shape_b), pairs in groups.items():
+        ma = np.stack([_as_matrix(x, outer_a, axes_a, transpose=False) for _, x, _ in pairs])
+        mb = np.stack([_as_matrix(y, outer_b, axes_b, transpose=True) for _, _, y in pairs])
+        products = np.matmul(ma, mb)
+
+        # sum the partial products of each output block
+        ids, inverse = np.unique([i for i, _, _ in pairs], return_inverse=True)
+        acc = np.zeros((len(ids),) + products.shape[1:], dtype=products.dtype)
+        np.add.at(acc, inverse, products)
+
+        shape = tuple(shape_a[i] for i in outer_a) + tuple(shape_b[i] for i in outer_b)
+        for i, block in zip(ids, acc):
+            block = block.reshape(shape)
+            res[i] = block if res[i] is None else res[i] + block
+
+    return res
@@ -1,3 +1,4 @@
+import contextvars
 import inspect
 from typing import Literal
 
@@ -5,6 +6,9 @@ import numpy as np
 from rosnet import dispatch
 from typing_extensions import Self
 
+# graph recording operations in lazy mode (see `rosnet.lazy`), or None if operations run eagerly
+recording: contextvars.ContextVar = contextvars.ContextVar("rosnet.recording", default=None)
+
 EXPLICITLY_DISPATCH = [
     np.zeros,
     np.ones,
@@ -22,6 +26,8 @@ class ArrayFunctionMixin:
         For numpy functions zeros, ones, full, random.rand and other functions defined in EXPLICITLY_DISPATCH, multimethod has no hint of the type in the arguments. We give two solutions for this problem:
         - Prepend a `Literal[cls]` object to the positional arguments list.
         - Inspect the module of the class and match the function name.
+
+        In lazy mode (see `rosnet.lazy`), other functions are recorded into the expression graph instead of being dispatched.
         """
         if func in EXPLICITLY_DISPATCH:
             cls = type(self)
@@ -34,6 +40,14 @@ class ArrayFunctionMixin:
             else:
                 return NotImplemented
 
+        # defer to lazy arrays, and record instead of running in lazy mode
+        if any(getattr(t, "__lazy__", False) for t in types):
+            return NotImplemented
+
+        graph = recording.get()
+        if graph is not None:
+            return graph.record(func, None, args, kwargs)
+
         module = dispatch
         if inspect.getmodule(func) == np.linalg:
             module = dispatch.linalg
@@ -1,7 +1,8 @@
+import bisect
 import functools
 import itertools
 import operator as op
-from typing import Sequence
+from typing import List, Sequence, Tuple
 
 import numpy as np
 from multimethod import multimethod
@@ -24,6 +25,37 @@ def result_shape(a, b, axes):
     return functools.reduce(op.add, (tuple(i[ax] for ax in outer_ax) for outer_ax, i in zip(outer_axes, (a, b))))
 
 
+def normalize_axes(axes, ndim: int) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    "Returns the `axes` argument of `tensordot` as a pair of tuples, being `ndim` the number of dimensions of the first operand."
+    if isinstance(axes, int):
+        return tuple(range(ndim - axes, ndim)), tuple(range(axes))
+
+    axes_a, axes_b = axes
+    axes_a = (axes_a,) if isinstance(axes_a, int) else tuple(axes_a)
+    axes_b = (axes_b,) if isinstance(axes_b, int) else tuple(axes_b)
+
+    if len(axes_a) != len(axes_b):
+        raise ValueError(f"shape-mismatch for sum: axes={axes}")
+
+    return axes_a, axes_b
+
+
+def normalize_axis(axis, ndim: int) -> Tuple[int, ...]:
+    "Returns `axis` (None, int or Sequence[int]) as a tuple of non-negative axes."
+    if axis is None:
+        return tuple(range(ndim))
+
+    axis = (axis,) if isinstance(axis, int) else tuple(axis)
+    if any(not -ndim <= i < ndim for i in axis):
+        raise ValueError(f"axis {axis} is out of bounds for array of dimension {ndim}")
+
+    axis = tuple(i % ndim for i in axis)
+    if not isunique(axis):
+        raise ValueError(f"repeated axis: {axis}")
+
+    return axis
+
+
 def join_idx(outer, inner, axes):
     n = len(outer) + len(inner)
     outer_axes = filter(lambda i: i not in axes, set(range(n)))
@@ -52,7 +84,9 @@ def __recurse(x: list):
 
 @__recurse.register
 def __recurse(x: np.ndarray):
-    if isinstance(x.flat[0], np.ndarray):
+    if x.size == 0:
+        return
+    elif isinstance(x.flat[0], np.ndarray):
         yield x
         yield from recurse(x.flat[0])
     # NOTE NumPy's scalar types fulfill the ArrayConvertable interface, and we don't want that
@@ -70,3 +104,99 @@ def nest_level(x):
 
 def measure_shape(x):
     return tuple(len(i) for i in recurse(x))
+
+
+def normalize_chunks(shape: Sequence[int], blockshape=None) -> Tuple[Tuple[int, ...], ...]:
+    """Returns the chunk table of an array of shape `shape`, i.e. the size of the blocks along each axis.
+
+    Arguments
+    ---------
+    - shape: Sequence[int]. Shape of the array.
+    - blockshape: Sequence[int | Sequence[int]], optional. For each axis, either the size of the blocks (the last block keeps the remainder) or the explicit size of every block. Defaults to a single block.
+    """
+    if blockshape is None:
+        blockshape = shape
+
+    if len(blockshape) != len(shape):
+        raise ValueError(f"blockshape and shape must have the same length: blockshape={blockshape}, shape={shape}")
+
+    chunks = []
+    for s, bs in zip(shape, blockshape):
+        if isinstance(bs, Sequence):
+            bs = tuple(int(i) for i in bs)
+            if sum(bs) != s:
+                raise ValueError(f"chunks {bs} do not add up to dimension {s}")
+        else:
+            bs = int(bs)
+            if bs <= 0:
+                raise ValueError(f"block size must be positive: {bs}")
+            bs = (bs,) * (s // bs) + ((s % bs,) if s % bs else ())
+        chunks.append(bs or (0,))
+
+    return tuple(chunks)
+
+
+def split_bounds(n: int, indices_or_sections) -> List[Tuple[int, int]]:
+    "Returns the (start, stop) bounds of the pieces of `numpy.split` along an axis of length `n`."
+    if isinstance(indices_or_sections, int):
+        if indices_or_sections <= 0:
+            raise ValueError("number sections must be larger than 0.")
+        if n % indices_or_sections != 0:
+            raise ValueError("array split does not result in an equal division")
+        step = n // indices_or_sections
+        indices = range(step, n, step) if step else [0] * (indices_or_sections - 1)
+    else:
+        indices = indices_or_sections
+
+    bounds = [0] + [min(max(i if i >= 0 else n + i, 0), n) for i in indices] + [n]
+    return [(start, max(start, stop)) for start, stop in zip(bounds[:-1], bounds[1:])]
+
+
+def chunk_offsets(chunks: Sequence[Sequence[int]]) -> Tuple[Tuple[int, ...], ...]:
+    "Returns the offset of each block along each axis, plus the dimension of the axis as the last offset."
+    return tuple(tuple(itertools.accumulate(c, initial=0)) for c in chunks)
+
+
+def rechunk_plan(src: Sequence[Sequence[int]], dst: Sequence[Sequence[int]]):
+    """Computes which blocks of an array with chunks `src` feed each block of the same array with chunks `dst`.
+
+    Yields, for every target block in C-order, its index, its shape and a list of `(source block index, source key, target key)` pieces. Keys are tuples of slices, being `slice(None)` if the whole axis of the block is used.
+    """
+    axes = []
+    for s, d in zip(chunk_offsets(src), chunk_offsets(dst)):
+        runs = []
+        for t0, t1 in zip(d[:-1], d[1:]):
+            pieces = []
+            j = max(bisect.bisect_right(s, t0) - 1, 0)
+            while j < len(s) - 1 and s[j] < t1:
+                lo, hi = max(s[j], t0), min(s[j + 1], t1)
+                if hi > lo:
+                    src_key = slice(None) if (lo, hi) == (s[j], s[j + 1]) else slice(lo - s[j], hi - s[j])
+                    dst_key = slice(None) if (lo, hi) == (t0, t1) else slice(lo - t0, hi - t0)
+                    pieces.append((j, src_key, dst_key))
+                j += 1
+            runs.append((t1 - t0, pieces))
+        axes.append(runs)
+
+    for tid in space(len(runs) for runs in axes):
+        runs = [axes[axis][i] for axis, i in enumerate(tid)]
+        shape = tuple(n for n, _ in runs)
+        pieces = [tuple(zip(*piece)) for piece in itertools.product(*(p for _, p in runs))]
+        yield tid, shape, pieces
+
+
+def summa_plan(rows: int, cols: int, inner: int, procs: Tuple[int, int]):
+    """Schedules a SUMMA blocked product of a grid of `rows` x `inner` blocks by a grid of `inner` x `cols` blocks on a `procs` grid of processes.
+
+    The output blocks are divided into contiguous tiles, one per process. At step `l`, the process of each tile receives the blocks of column `l` of the first operand in the rows of its tile (the row panel) and the blocks of row `l` of the second operand in the columns of its tile (the column panel). So each block of the first operand is sent once per column of processes and each block of the second operand once per row of processes.
+
+    Yields (step, rows of the tile, columns of the tile) for every step and tile.
+    """
+    pr, pc = max(1, min(procs[0], rows)), max(1, min(procs[1], cols))
+    row_tiles = [range(rows * p // pr, rows * (p + 1) // pr) for p in range(pr)]
+    col_tiles = [range(cols * q // pc, cols * (q + 1) // pc) for q in range(pc)]
+
+    for l in range(inner):
+        for tile_rows in row_tiles:
+            for tile_cols in col_tiles:
+                yield l, tile_rows, tile_cols
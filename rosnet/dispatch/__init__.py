@@ -1,3 +1,5 @@
+import builtins
+
 import numpy as np
 from multimethod import multimethod
 
@@ -13,6 +15,16 @@ def _(a):
     return a
 
 
+@multimethod
+def rechunk(*args, **kwargs):
+    raise NotImplementedError()
+
+
+@multimethod
+def schmidt(*args, **kwargs):
+    raise NotImplementedError()
+
+
 from .numpy import (
     tensordot,
     einsum,
@@ -20,12 +32,21 @@ from .numpy import (
     transpose,
     stack,
     split,
+    concatenate,
     block,
     zeros_like,
     ones_like,
     full_like,
     empty_like,
     cumsum,
+    sum,
+    prod,
+    max,
+    min,
+    amax,
+    amin,
+    mean,
+    kron,
     count_nonzero,
 )
 
@@ -36,3 +57,6 @@ __ufuncs = filter(lambda x: isinstance(x[1], np.ufunc), {attr: getattr(np, attr)
 
 for attr, ufunc in __ufuncs:
     globals()[attr] = ufunc
+
+# NOTE names that shadow builtins (i.e. `sum`, `max`, `abs`) are left out of `from rosnet import *`, but remain accessible as `rosnet.dispatch.sum`
+__all__ = [name for name in globals() if not name.startswith("_") and name not in vars(builtins)]
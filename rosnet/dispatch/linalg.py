@@ -1,4 +1,5 @@
 from multimethod import multimethod
+from rosnet.dispatch.numpy import kron as _kron
 
 
 @multimethod
@@ -51,23 +52,28 @@ def matrix_power(*args, **kwargs):
     raise NotImplementedError()
 
 
+# NOTE `numpy.kron` is not in `numpy.linalg`, but share its implementations
+kron = _kron
+
+
 @multimethod
-def kron():
+def cholesky():
     raise NotImplementedError()
 
 
 @multimethod
-def cholesky():
+def qr(*args, **kwargs):
     raise NotImplementedError()
 
 
 @multimethod
-def qr():
+def svd(*args, **kwargs):
     raise NotImplementedError()
 
 
+# NOTE not in numpy.linalg
 @multimethod
-def svd():
+def rsvd(*args, **kwargs):
     raise NotImplementedError()
 
 
@@ -92,7 +98,7 @@ def eigvalsh(*args, **kwargs):
 
 
 @multimethod
-def norm():
+def norm(*args, **kwargs):
     raise NotImplementedError()
 
 
@@ -31,6 +31,11 @@ def split(*args, **kwargs):
     raise NotImplementedError()
 
 
+@multimethod
+def concatenate(*args, **kwargs):
+    raise NotImplementedError()
+
+
 @multimethod
 def block(*args, **kwargs):
     raise NotImplementedError()
@@ -62,6 +67,43 @@ def cumsum(*args, **kwargs):
     raise NotImplementedError()
 
 
+@multimethod
+def sum(*args, **kwargs):
+    raise NotImplementedError()
+
+
+@multimethod
+def prod(*args, **kwargs):
+    raise NotImplementedError()
+
+
+# linalg
+@multimethod
+def kron(*args, **kwargs):
+    raise NotImplementedError()
+
+
+# statistics
+@multimethod
+def max(*args, **kwargs):
+    raise NotImplementedError()
+
+
+@multimethod
+def min(*args, **kwargs):
+    raise NotImplementedError()
+
+
+@multimethod
+def mean(*args, **kwargs):
+    raise NotImplementedError()
+
+
+# NOTE on NumPy < 2.0, `np.max` and `np.min` are named `amax` and `amin`
+amax = max
+amin = min
+
+
 # sorting, searching and counting
 @multimethod
 def count_nonzero(*args, **kwargs):
@@ -1,5 +1,5 @@
 from math import prod
-from typing import Sequence
+from typing import Sequence, Tuple
 
 import numpy as np
 from opt_einsum.parser import find_output_shape, parse_einsum_input
@@ -81,3 +81,45 @@ def einsum(pattern: str, *operands: Array, **kwargs) -> int:
     dtype = np.result_type(*[op.dtype for op in operands])
 
     return sum(a.nbytes for a in arrays) + dtype * prod(output_shape)
+
+
+def tensordot_blockshape(shape_a, shape_b, axes, dtype, memory_limit: int) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Returns the blockshapes in which `a` and `b` must be split so that contracting a pair of blocks fits in `memory_limit` bytes.
+
+    The footprint of a pair (both blocks and their output) is reduced by repeatedly halving the free axis of `a` or `b`, or the pair of contracted axes, that shrinks it the most. Splitting free axes gives more output blocks while splitting contracted axes gives more partial products to accumulate.
+    """
+    itemsize = np.dtype(dtype).itemsize
+    axes_a, axes_b = (tuple(i % len(shape_a) for i in axes[0]), tuple(i % len(shape_b) for i in axes[1]))
+    bs_a, bs_b = list(shape_a), list(shape_b)
+
+    def footprint(bs_a, bs_b):
+        out = [n for i, n in enumerate(bs_a) if i not in axes_a] + [n for i, n in enumerate(bs_b) if i not in axes_b]
+        return (prod(bs_a) + prod(bs_b) + prod(out)) * itemsize
+
+    # candidates: list of (axes of a, axes of b) halved together
+    candidates = [([i], []) for i in range(len(shape_a)) if i not in axes_a]
+    candidates += [([], [j]) for j in range(len(shape_b)) if j not in axes_b]
+    candidates += [([i], [j]) for i, j in zip(axes_a, axes_b)]
+
+    while footprint(bs_a, bs_b) > memory_limit:
+        best = None
+        for ia, ib in candidates:
+            if any(bs_a[i] == 1 for i in ia) or any(bs_b[j] == 1 for j in ib):
+                continue
+
+            new_a, new_b = list(bs_a), list(bs_b)
+            for i in ia:
+                new_a[i] = -(-new_a[i] // 2)
+            for j in ib:
+                new_b[j] = -(-new_b[j] // 2)
+
+            cost = footprint(new_a, new_b)
+            if best is None or cost < best[0]:
+                best = (cost, new_a, new_b)
+
+        if best is None:
+            raise MemoryError(f"contraction does not fit in {memory_limit} bytes even with blocks of single elements")
+
+        _, bs_a, bs_b = best
+
+    return tuple(bs_a), tuple(bs_b)
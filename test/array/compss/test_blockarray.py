@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+
+pycompss = pytest.importorskip("pycompss")
+import rosnet
+
+
+class TestTensordot:
+    @pytest.mark.parametrize(
+        "method,splits",
+        [
+            ("blocks", 1),
+            ("accumulate", 1),
+            ("accumulate", 2),
+            ("accumulate", 8),
+            ("tree", 1),
+        ],
+    )
+    def test_method(self, method, splits):
+        x, y = np.random.rand(4, 6), np.random.rand(6, 5)
+        a = rosnet.array(x, blockshape=(2, 2), inner="rosnet.array.compss")
+        b = rosnet.array(y, blockshape=(2, 3), inner="rosnet.array.compss")
+
+        c = rosnet.tensordot(a, b, 1, method=method, splits=splits)
+
+        assert c.chunks == ((2, 2), (3, 2))
+        assert np.allclose(np.array(c), x @ y)
+
+    @pytest.mark.parametrize("procs", [None, (1, 1), (2, 1), (2, 2)])
+    def test_summa(self, procs):
+        x, y = np.random.rand(6, 8), np.random.rand(8, 4)
+        a = rosnet.array(x, blockshape=(2, 2), inner="rosnet.array.compss")
+        b = rosnet.array(y, blockshape=(2, 2), inner="rosnet.array.compss")
+
+        c = rosnet.tensordot(a, b, 1, method="summa", procs=procs)
+
+        assert c.chunks == ((2, 2, 2), (2, 2))
+        assert np.allclose(np.array(c), x @ y)
+
+    @pytest.mark.parametrize("fanin", [2, 3])
+    def test_tree(self, fanin):
+        x, y = np.random.rand(4, 10), np.random.rand(10, 5)
+        a = rosnet.array(x, blockshape=(4, 2), inner="rosnet.array.compss")
+        b = rosnet.array(y, blockshape=(2, 5), inner="rosnet.array.compss")
+
+        c = rosnet.tensordot(list(a.data.flat), list(b.data.flat), 1, method="tree", fanin=fanin)
+
+        assert np.allclose(np.array(c), x @ y)
+
+    def test_memory_limit(self):
+        x, y = np.random.rand(8, 12), np.random.rand(12, 10)
+        a = rosnet.array(x, blockshape=(8, 12), inner="rosnet.array.compss")
+        b = rosnet.array(y, blockshape=(12, 10), inner="rosnet.array.compss")
+
+        c = rosnet.tensordot(a, b, 1, memory_limit=8 * 200)
+
+        assert c.nblock > 1
+        assert np.allclose(np.array(c), x @ y)
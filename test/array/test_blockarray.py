@@ -2,7 +2,9 @@ import pytest
 from typing import Tuple
 from math import prod
 import numpy as np
+import rosnet
 from rosnet import BlockArray
+from rosnet.core.util import normalize_chunks
 from test.mock import MockArray
 
 
@@ -123,3 +125,662 @@ def test_tensordot():
     assert c.shape == (2, 2)
     assert c.blockshape == (1, 1)
     assert c.grid == (2, 2)
+
+
+class TestChunks:
+    @pytest.mark.parametrize(
+        "shape,blockshape,chunks",
+        [
+            ((4, 6), (2, 3), ((2, 2), (3, 3))),
+            ((5, 7), (2, 3), ((2, 2, 1), (3, 3, 1))),
+            ((5, 7), ((1, 4), 7), ((1, 4), (7,))),
+            ((5, 7), None, ((5,), (7,))),
+        ],
+    )
+    def test_full(self, shape, blockshape, chunks):
+        arr = rosnet.zeros(shape, blockshape=blockshape)
+
+        assert arr.shape == shape
+        assert arr.chunks == chunks
+        assert arr.grid == tuple(len(c) for c in chunks)
+        assert np.array(arr).shape == shape
+
+    def test_invalid_blocks(self):
+        with pytest.raises(ValueError):
+            BlockArray([np.zeros((2, 2)), np.zeros((2, 3)), np.zeros((1, 2)), np.zeros((1, 2))], grid=(2, 2))
+
+    def test_invalid_chunks(self):
+        with pytest.raises(ValueError):
+            rosnet.zeros((5, 7), blockshape=((1, 3), 7))
+
+    def test_tensordot(self):
+        a = rosnet.rand((5, 7), blockshape=(2, 3))
+        b = rosnet.rand((7, 4), blockshape=(3, (1, 3)))
+        c = np.tensordot(a, b, 1)
+
+        assert c.chunks == ((2, 2, 1), (1, 3))
+        assert np.allclose(np.array(c), np.array(a) @ np.array(b))
+
+    def test_tensordot_mismatch(self):
+        a = rosnet.rand((5, 7), blockshape=(2, 3))
+        b = rosnet.rand((7, 4), blockshape=(2, 4))
+
+        with pytest.raises(ValueError):
+            np.tensordot(a, b, 1)
+
+    def test_transpose(self):
+        a = rosnet.rand((5, 7, 3), blockshape=(2, 3, 3))
+        b = np.transpose(a, (2, 0, 1))
+
+        assert b.chunks == ((3,), (2, 2, 1), (3, 3, 1))
+        assert np.array_equal(np.array(b), np.transpose(np.array(a), (2, 0, 1)))
+
+
+class TestIndexing:
+    shape = (7, 9, 5)
+    blockshape = (3, 4, 2)
+    keys = [
+        (1, 2, 3),
+        (-1, -2, -3),
+        np.s_[1:6],
+        np.s_[::-1],
+        np.s_[::2, 3:1:-1],
+        np.s_[..., 1],
+        np.s_[2, ..., 1:4],
+        np.s_[3:3],
+        np.s_[6:2:-2, ::-3],
+        # advanced indexing
+        np.s_[[0, 5, 2, 2]],
+        np.s_[:, [8, 0, 4], 1],
+        np.s_[:, 1, [0, 3]],
+        np.s_[1, :, [0, 3]],
+        np.s_[:, []],
+        np.s_[[1, 2], :, [0, 3]],
+        np.s_[..., [[0, 1], [1, 2]]],
+    ]
+
+    @pytest.fixture
+    def arrays(self):
+        a = rosnet.rand(self.shape, blockshape=self.blockshape)
+        return a, np.array(a)
+
+    @pytest.mark.parametrize("key", keys)
+    def test_getitem(self, arrays, key):
+        a, expected = arrays
+
+        assert np.array_equal(np.asarray(a[key]), expected[key])
+
+    def test_getitem_mask(self, arrays):
+        a, expected = arrays
+
+        assert np.array_equal(np.asarray(a[expected[:, 0, 0] > 0.5]), expected[expected[:, 0, 0] > 0.5])
+        assert np.array_equal(np.asarray(a[expected > 0.5]), expected[expected > 0.5])
+
+    def test_getitem_aligned(self, arrays):
+        a, _ = arrays
+        b = a[0:3, 4:8]
+
+        assert b.chunks == ((3,), (4,), (2, 2, 1))
+        assert all(block is a.data[0, 1, i] for i, block in enumerate(b.data.flat))
+
+    def test_getitem_views(self, arrays):
+        a, _ = arrays
+        b = a[1:5, 2:7]
+
+        assert b.chunks == ((2, 2), (2, 3), (2, 2, 1))
+        assert all(np.shares_memory(block, a.data[(i, j, k)]) for (i, j, k), block in zip(np.ndindex(2, 2, 3), b.data.flat))
+
+    @pytest.mark.parametrize("key", [(7, 0, 0), (0, -10, 0), np.s_[:, [0, 9]], np.s_[0, 0, 0, 0]])
+    def test_getitem_out_of_bounds(self, arrays, key):
+        a, _ = arrays
+
+        with pytest.raises(IndexError):
+            a[key]
+
+    @pytest.mark.parametrize("key", [True, False, np.True_, (0, False)])
+    def test_getitem_bool_scalar(self, arrays, key):
+        a, _ = arrays
+
+        with pytest.raises(IndexError):
+            a[key]
+
+    @pytest.mark.parametrize("key", keys)
+    @pytest.mark.parametrize("scalar", [True, False])
+    def test_setitem(self, arrays, key, scalar):
+        a, expected = arrays
+        value = 7.0 if scalar else np.random.rand(*np.shape(expected[key]))
+
+        a[key] = value
+        expected[key] = value
+
+        assert np.array_equal(np.array(a), expected)
+
+
+class TestRechunk:
+    @pytest.mark.parametrize("src", [(3, 4), (2, 9), (7, 1), ((1, 6), (4, 5))])
+    @pytest.mark.parametrize("dst", [(3, 4), (2, 2), (7, 9), ((5, 2), (1, 1, 7))])
+    def test_rechunk(self, src, dst):
+        a = rosnet.rand((7, 9), blockshape=src)
+        b = rosnet.rechunk(a, dst)
+
+        assert b.chunks == normalize_chunks((7, 9), dst)
+        assert np.array_equal(np.array(b), np.array(a))
+
+    def test_reuse_blocks(self):
+        a = rosnet.rand((6, 8), blockshape=(3, 4))
+        b = rosnet.rechunk(a, ((3, 3), (4, 2, 2)))
+
+        assert b.data[0, 0] is a.data[0, 0]
+        assert b.data[1, 0] is a.data[1, 0]
+        assert not np.shares_memory(b.data[0, 1], a.data[0, 1])
+
+    def test_executor(self):
+        a = rosnet.rand((7, 9), blockshape=(2, 2))
+        b = rosnet.rechunk(a, (3, 3), executor="threads")
+
+        assert np.array_equal(np.array(b), np.array(a))
+
+
+class TestUfunc:
+    @pytest.fixture
+    def arrays(self):
+        a = rosnet.rand((5, 6), blockshape=(2, 4))
+        b = rosnet.rand((5, 6), blockshape=(3, 3))
+        return a, b, np.array(a), np.array(b)
+
+    def test_binary(self, arrays):
+        a, b, ea, eb = arrays
+        c = a + b
+
+        assert isinstance(c, BlockArray)
+        assert c.chunks == a.chunks
+        assert np.allclose(np.array(c), ea + eb)
+
+    @pytest.mark.parametrize("scalar", [2, 0.5, np.float32(3)])
+    def test_scalar(self, arrays, scalar):
+        a, _, ea, _ = arrays
+
+        assert np.allclose(np.array(a * scalar), ea * scalar)
+        assert np.allclose(np.array(scalar - a), scalar - ea)
+
+    def test_unary(self, arrays):
+        a, _, ea, _ = arrays
+
+        assert np.allclose(np.array(np.conj(a)), np.conj(ea))
+        assert np.allclose(np.array(-a), -ea)
+
+    @pytest.mark.parametrize(
+        "shape,blockshape",
+        [
+            ((6,), (4,)),
+            ((5, 1), (2, 1)),
+            ((1, 6), (1, 3)),
+            ((3, 5, 6), (1, 2, 4)),
+        ],
+    )
+    def test_broadcast(self, arrays, shape, blockshape):
+        a, _, ea, _ = arrays
+        b = rosnet.rand(shape, blockshape=blockshape)
+
+        assert np.allclose(np.array(a * b), ea * np.array(b))
+
+    def test_broadcast_ndarray(self, arrays):
+        a, _, ea, _ = arrays
+        x = np.random.rand(5, 1)
+
+        assert np.allclose(np.array(a + x), ea + x)
+        assert np.allclose(np.array(np.arange(6) * a), np.arange(6) * ea)
+
+    def test_out(self, arrays):
+        a, b, ea, eb = arrays
+        out = rosnet.zeros((5, 6), blockshape=(5, 3))
+
+        assert np.add(a, b, out=out) is out
+        assert out.chunks == ((5,), (3, 3))
+        assert np.allclose(np.array(out), ea + eb)
+
+    def test_inplace(self, arrays):
+        a, b, ea, eb = arrays
+        blocks = list(a.data.flat)
+
+        a += b
+        a *= 2
+
+        assert all(x is y for x, y in zip(blocks, a.data.flat))
+        assert np.allclose(np.array(a), (ea + eb) * 2)
+
+    def test_multiple_outputs(self, arrays):
+        a, _, ea, _ = arrays
+        q, r = np.divmod(a, 0.3)
+
+        assert np.allclose(np.array(q), np.divmod(ea, 0.3)[0])
+        assert np.allclose(np.array(r), np.divmod(ea, 0.3)[1])
+
+    def test_threads(self, arrays):
+        a, b, ea, eb = arrays
+
+        with rosnet.executor("threads"):
+            c = np.exp(a) * b
+
+        assert np.allclose(np.array(c), np.exp(ea) * eb)
+
+
+class TestReduction:
+    @pytest.fixture
+    def array(self):
+        a = rosnet.rand((7, 5, 6), blockshape=(2, 2, 4))
+        return a, np.array(a)
+
+    @pytest.mark.parametrize("func", [np.sum, np.prod, np.max, np.min, np.mean])
+    @pytest.mark.parametrize("axis", [None, 0, -1, (0, 2)])
+    @pytest.mark.parametrize("keepdims", [False, True])
+    def test_reduce(self, array, func, axis, keepdims):
+        a, ea = array
+        res = func(a, axis=axis, keepdims=keepdims)
+        expected = func(ea, axis=axis, keepdims=keepdims)
+
+        if isinstance(res, BlockArray):
+            assert res.shape == expected.shape
+            res = np.array(res)
+        else:
+            assert np.ndim(res) == 0
+
+        assert np.allclose(res, expected)
+
+    def test_chunks(self, array):
+        a, _ = array
+        assert np.sum(a, axis=1).chunks == ((2, 2, 2, 1), (4, 2))
+
+    def test_dtype(self):
+        a = rosnet.full((4, 4), 3, dtype=int, blockshape=(3, 3))
+
+        assert np.sum(a) == 48
+        assert np.mean(a) == 3.0
+        assert np.mean(a, axis=0).dtype == np.float64
+
+    @pytest.mark.parametrize("ord", [None, 1, 2, 3, 0, np.inf, -np.inf])
+    def test_norm(self, array, ord):
+        a, ea = array
+        assert np.allclose(np.array(np.linalg.norm(a, ord, axis=1)), np.linalg.norm(ea, ord, axis=1))
+
+    def test_norm_fro(self, array):
+        a, ea = array
+
+        assert np.isclose(np.linalg.norm(a), np.linalg.norm(ea))
+        assert np.allclose(np.array(np.linalg.norm(a, "fro", axis=(0, 1))), np.linalg.norm(ea, "fro", axis=(0, 1)))
+
+    def test_threads(self, array):
+        a, ea = array
+        with rosnet.executor("threads", max_workers=4):
+            assert np.allclose(np.array(np.sum(a, axis=(0, 1))), np.sum(ea, axis=(0, 1)))
+
+
+class TestToNumpy:
+    @pytest.fixture
+    def array(self):
+        return rosnet.rand((5, 7), blockshape=(2, 3))
+
+    def test_blocks(self, array):
+        res = rosnet.to_numpy(array)
+
+        assert res.shape == (5, 7)
+        assert np.array_equal(res[:2, :3], array.data[0, 0])
+        assert np.array_equal(res[4:, 6:], array.data[2, 2])
+
+    def test_out(self, array):
+        out = np.zeros((5, 7))
+
+        assert rosnet.to_numpy(array, out=out) is out
+        assert np.array_equal(out, np.array(array))
+
+        with pytest.raises(ValueError):
+            rosnet.to_numpy(array, out=np.zeros((7, 5)))
+
+    def test_memmap(self, array, tmp_path):
+        path = tmp_path / "array.npy"
+        res = rosnet.to_numpy(array, memmap=path)
+
+        assert isinstance(res, np.memmap)
+        assert np.array_equal(np.load(path), np.array(array))
+
+
+class TestArray:
+    def test_views(self):
+        x = np.random.rand(5, 7)
+        a = rosnet.array(x, blockshape=(2, 3))
+
+        assert a.chunks == ((2, 2, 1), (3, 3, 1))
+        assert all(np.shares_memory(block, x) for block in a.data.flat)
+        assert np.array_equal(np.array(a), x)
+
+    def test_default_blockshape(self):
+        x = np.random.rand(3, 4)
+        a = rosnet.array(x)
+
+        assert a.grid == (1, 1)
+        assert a.data.flat[0].base is x
+
+    @pytest.mark.parametrize("x", [np.float64(3), np.array(3.0), np.array(2 + 1j, dtype=np.complex64)])
+    def test_0d(self, x):
+        a = rosnet.array(x)
+
+        assert a.shape == () and a.grid == ()
+        assert a.dtype == np.asarray(x).dtype
+        assert np.array_equal(np.array(a), x)
+
+    def test_memmap(self, tmp_path):
+        x = np.random.rand(6, 4)
+        path = tmp_path / "array.npy"
+        np.save(path, x)
+
+        a = rosnet.array(path, blockshape=(4, 2))
+
+        assert all(isinstance(block, np.memmap) for block in a.data.flat)
+        assert np.array_equal(np.array(a), x)
+
+    def test_inner(self):
+        from rosnet.array.shared import SharedArray
+
+        x = np.random.rand(4, 4)
+        a = rosnet.array(x, blockshape=(2, 2), inner="rosnet.array.shared")
+
+        assert all(isinstance(block, SharedArray) for block in a.data.flat)
+        assert np.array_equal(np.array(a), x)
+
+
+class TestTensordot:
+    @pytest.mark.parametrize(
+        "shape_b,blockshape_b,axes",
+        [
+            ((5, 3), (2, 3), 1),
+            ((6, 5, 4), (2, 2, 3), 2),
+            ((6, 5, 4), (2, 2, 3), ([1], [0])),
+            ((5, 4, 6), (2, 3, 2), ([0, 2], [1, 0])),
+            ((7, 5, 3), (2, 2, 3), ([-1], [-2])),
+        ],
+    )
+    def test_axes(self, shape_b, blockshape_b, axes):
+        a = rosnet.rand((4, 6, 5), blockshape=(3, 2, 2))
+        b = rosnet.rand(shape_b, blockshape=blockshape_b)
+
+        c = np.tensordot(a, b, axes)
+        expected = np.tensordot(np.array(a), np.array(b), axes)
+
+        assert c.shape == expected.shape
+        assert np.allclose(np.array(c), expected)
+
+    @pytest.mark.parametrize("batch", [False, True])
+    def test_batch(self, batch):
+        a = rosnet.rand((4, 7, 5), blockshape=(1, 3, 2))
+        b = rosnet.rand((7, 5, 3), blockshape=(3, 2, 1))
+
+        c = rosnet.tensordot(a, b, 2, batch=batch)
+
+        assert c.chunks == ((1, 1, 1, 1), (1, 1, 1))
+        assert np.allclose(np.array(c), np.tensordot(np.array(a), np.array(b), 2))
+
+    def test_memory_limit(self):
+        a = rosnet.rand((8, 12), blockshape=(8, 12))
+        b = rosnet.rand((12, 6), blockshape=(12, 6))
+
+        c = rosnet.tensordot(a, b, 1, memory_limit=8 * 100)
+
+        assert c.grid != (1, 1)
+        assert np.allclose(np.array(c), np.array(a) @ np.array(b))
+
+    def test_plan_cache(self):
+        from rosnet.array.block import _tensordot_plan
+
+        a = rosnet.rand((4, 6), blockshape=(2, 2))
+        b = rosnet.rand((6, 4), blockshape=(2, 2))
+
+        np.tensordot(a, b, 1)
+        hits = _tensordot_plan.cache_info().hits
+        np.tensordot(a, b, 1)
+
+        assert _tensordot_plan.cache_info().hits == hits + 1
+
+
+class TestQR:
+    @pytest.fixture(params=[((40, 5), (7, 5)), ((12, 5), (3, 2)), ((9, 4), (9, 4))])
+    def array(self, request):
+        shape, blockshape = request.param
+        a = rosnet.rand(shape, blockshape=blockshape)
+        return a, np.array(a)
+
+    def test_reduced(self, array):
+        a, x = array
+        q, r = np.linalg.qr(a)
+        eq = np.array(q)
+
+        assert isinstance(q, BlockArray)
+        assert q.chunks[0] == a.chunks[0]
+        assert r.shape == (x.shape[1], x.shape[1])
+        assert np.allclose(np.triu(r), r)
+        assert np.allclose(eq.T @ eq, np.eye(x.shape[1]))
+        assert np.allclose(eq @ r, x)
+
+    def test_r(self, array):
+        a, x = array
+        r = np.linalg.qr(a, mode="r")
+
+        assert np.allclose(np.abs(r), np.abs(np.linalg.qr(x, mode="r")))
+
+    def test_complete(self, array):
+        a, x = array
+        q, r = np.linalg.qr(a, mode="complete")
+        eq, er = np.array(q), np.array(r)
+
+        assert eq.shape == (x.shape[0], x.shape[0])
+        assert er.shape == x.shape
+        assert np.allclose(np.triu(er), er)
+        assert np.allclose(eq.T @ eq, np.eye(x.shape[0]))
+        assert np.allclose(np.array(rosnet.tensordot(q, r, 1)), x)
+
+
+class TestSVD:
+    def test_rsvd(self):
+        rng = np.random.default_rng(0)
+        x = rng.standard_normal((60, 5)) @ rng.standard_normal((5, 40))
+        a = rosnet.array(x, blockshape=(13, 9))
+
+        u, s, vh = rosnet.linalg.rsvd(a, 5, seed=1)
+
+        assert u.shape == (60, 5) and vh.shape == (5, 40)
+        assert u.chunks[0] == a.chunks[0] and vh.chunks[1] == a.chunks[1]
+        assert np.allclose(s, np.linalg.svd(x, compute_uv=False)[:5])
+        assert np.allclose(np.array(u) * s @ np.array(vh), x)
+
+    def test_rsvd_complex(self):
+        rng = np.random.default_rng(0)
+        x = rng.standard_normal((20, 8)) + 1j * rng.standard_normal((20, 8))
+        u, s, vh = rosnet.linalg.rsvd(rosnet.array(x, blockshape=(6, 3)), 8)
+
+        assert np.allclose(np.array(u) * s @ np.array(vh), x)
+
+    @pytest.mark.parametrize("axes_v", [[1], [0, 2]])
+    @pytest.mark.parametrize("absorb", ["u", "v", "both"])
+    def test_schmidt(self, axes_v, absorb):
+        x = np.random.rand(4, 5, 6)
+        a = rosnet.array(x, blockshape=(2, 3, 4))
+        axes_u = [i for i in range(3) if i not in axes_v]
+
+        u, v = rosnet.schmidt(a, axes_v, absorb=absorb)
+
+        assert u.shape[:-1] == tuple(x.shape[i] for i in axes_u)
+        assert v.shape[:-1] == tuple(x.shape[i] for i in axes_v)
+        assert np.allclose(np.array(rosnet.tensordot(u, v, ([-1], [-1]))), np.transpose(x, axes_u + axes_v))
+
+    def test_schmidt_chi(self):
+        a = rosnet.rand((30, 20), blockshape=(7, 6))
+        u, v = rosnet.schmidt(a, [1], chi=5)
+
+        assert u.shape == (30, 5) and v.shape == (20, 5)
+
+
+class TestKron:
+    @pytest.mark.parametrize(
+        "shape_a,blockshape_a,shape_b,blockshape_b,grid",
+        [
+            ((4, 6), (2, 3), (3, 2), (3, 2), (2, 2)),
+            ((4, 6), (2, 3), (5, 4), (2, 3), (2, 2)),
+            ((3,), (2,), (4,), (3,), (2,)),
+            ((2, 3, 2), (1, 2, 2), (2, 2, 3), (2, 1, 2), (2, 2, 1)),
+        ],
+    )
+    def test_kron(self, shape_a, blockshape_a, shape_b, blockshape_b, grid):
+        a = rosnet.rand(shape_a, blockshape=blockshape_a)
+        b = rosnet.rand(shape_b, blockshape=blockshape_b)
+
+        c = np.kron(a, b)
+
+        assert isinstance(c, BlockArray)
+        assert c.grid == grid
+        assert np.allclose(np.array(c), np.kron(np.array(a), np.array(b)))
+
+
+class TestJoinSplit:
+    @pytest.mark.parametrize(
+        "shapes,blockshapes,axis,grid",
+        [
+            ([(4, 6), (2, 6)], [(2, 3), (2, 3)], 0, (3, 2)),
+            ([(4, 6), (4, 2)], [(2, 3), (2, 2)], 1, (2, 3)),
+            ([(4, 6), (5, 6)], [(2, 3), (5, 4)], 0, (3, 2)),
+            ([(3, 2), (3, 2), (3, 2)], [(3, 1), (1, 2), (3, 2)], -1, (1, 4)),
+        ],
+    )
+    def test_concatenate(self, shapes, blockshapes, axis, grid):
+        arrays = [rosnet.rand(shape, blockshape=blockshape) for shape, blockshape in zip(shapes, blockshapes)]
+
+        c = np.concatenate(arrays, axis=axis)
+
+        assert isinstance(c, BlockArray)
+        assert c.grid == grid
+        assert np.allclose(np.array(c), np.concatenate([np.array(a) for a in arrays], axis=axis))
+
+    def test_concatenate_reuses_blocks(self):
+        a = rosnet.rand((4, 6), blockshape=(2, 3))
+        b = rosnet.rand((2, 6), blockshape=(2, 3))
+
+        c = np.concatenate([a, b])
+
+        assert all(c.data[idx] is a.data[idx] for idx in np.ndindex(a.grid))
+        assert all(c.data[2 + i, j] is b.data[i, j] for i, j in np.ndindex(b.grid))
+
+    def test_concatenate_dtype(self):
+        a = rosnet.array(np.arange(6).reshape(2, 3), blockshape=(1, 3))
+        b = rosnet.rand((2, 3), blockshape=(1, 3))
+
+        c = np.concatenate([a, b])
+
+        assert c.dtype == np.float64
+        assert all(block.dtype == np.float64 for block in c.data.flat)
+
+    def test_concatenate_mismatch(self):
+        with pytest.raises(ValueError):
+            np.concatenate([rosnet.rand((2, 3)), rosnet.rand((2, 4))])
+
+    @pytest.mark.parametrize("axis", [0, 1, 2, -1])
+    def test_stack(self, axis):
+        a = rosnet.rand((4, 6), blockshape=(2, 3))
+        b = rosnet.rand((4, 6), blockshape=(4, 2))
+
+        c = np.stack([a, b], axis=axis)
+
+        assert isinstance(c, BlockArray)
+        assert np.allclose(np.array(c), np.stack([np.array(a), np.array(b)], axis=axis))
+
+    def test_stack_views(self):
+        a = rosnet.rand((4, 6), blockshape=(2, 3))
+
+        c = np.stack([a, a])
+
+        assert c.grid == (2, 2, 2)
+        assert all(np.shares_memory(c.data[(0,) + idx], a.data[idx]) for idx in np.ndindex(a.grid))
+
+    @pytest.mark.parametrize(
+        "indices_or_sections,axis",
+        [
+            (2, 0),
+            (3, 1),
+            ([2, 4], 0),
+            ([1, 5, 9], 1),
+            ([-2], -1),
+        ],
+    )
+    def test_split(self, indices_or_sections, axis):
+        x = np.random.rand(6, 9)
+        a = rosnet.array(x, blockshape=(2, 3))
+
+        pieces = np.split(a, indices_or_sections, axis=axis)
+        expected = np.split(x, indices_or_sections, axis=axis)
+
+        assert len(pieces) == len(expected)
+        for piece, ref in zip(pieces, expected):
+            assert isinstance(piece, BlockArray)
+            assert np.array_equal(np.array(piece), ref)
+
+    def test_split_aligned(self):
+        a = rosnet.rand((6, 9), blockshape=(2, 3))
+
+        pieces = np.split(a, 3, axis=1)
+
+        for i, piece in enumerate(pieces):
+            assert all(piece.data[j, 0] is a.data[j, i] for j in range(a.grid[0]))
+
+    def test_split_unequal(self):
+        with pytest.raises(ValueError):
+            np.split(rosnet.rand((6, 9), blockshape=(2, 3)), 4, axis=1)
+
+    @pytest.mark.parametrize("sections", [0, -1])
+    def test_split_no_sections(self, sections):
+        with pytest.raises(ValueError, match="number sections must be larger than 0."):
+            np.split(rosnet.rand((6, 9), blockshape=(2, 3)), sections, axis=1)
+
+
+class TestScan:
+    @pytest.mark.parametrize(
+        "shape,blockshape,axis",
+        [
+            ((20,), (6,), None),
+            ((20,), (6,), 0),
+            ((10, 7), (3, 2), 0),
+            ((10, 7), (3, 2), 1),
+            ((4, 5, 6), (2, 2, 4), -1),
+            ((4, 5, 6), (4, 5, 6), 1),
+        ],
+    )
+    def test_cumsum(self, shape, blockshape, axis):
+        x = np.random.rand(*shape)
+        a = rosnet.array(x, blockshape=blockshape)
+
+        c = np.cumsum(a, axis=axis)
+
+        assert isinstance(c, BlockArray)
+        assert c.chunks == a.chunks
+        assert np.allclose(np.array(c), np.cumsum(x, axis=axis))
+
+    def test_cumsum_dtype(self):
+        x = np.arange(20, dtype=np.int32)
+        a = rosnet.array(x, blockshape=(7,))
+
+        c = np.cumsum(a, dtype=np.float32)
+
+        assert c.dtype == np.float32
+        assert np.array_equal(np.array(c), np.cumsum(x, dtype=np.float32))
+
+    def test_cumsum_flatten(self):
+        with pytest.raises(NotImplementedError):
+            np.cumsum(rosnet.rand((4, 4), blockshape=(2, 2)))
+
+    @pytest.mark.parametrize("axis", [None, 0, 1, (0, 1)])
+    @pytest.mark.parametrize("keepdims", [False, True])
+    def test_count_nonzero(self, axis, keepdims):
+        x = np.random.rand(10, 7)
+        x[x < 0.5] = 0
+        a = rosnet.array(x, blockshape=(3, 2))
+
+        res = np.count_nonzero(a, axis=axis, keepdims=keepdims)
+        expected = np.count_nonzero(x, axis=axis, keepdims=keepdims)
+
+        assert np.array_equal(np.array(res), expected)
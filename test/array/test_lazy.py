@@ -0,0 +1,134 @@
+import numpy as np
+import rosnet
+from rosnet.array.lazy import LazyArray
+from rosnet.core.executor import SequentialExecutor, executor
+
+
+class CountingExecutor(SequentialExecutor):
+    def __init__(self):
+        self.calls = 0
+
+    def map(self, fn, *iterables):
+        self.calls += 1
+        return super().map(fn, *iterables)
+
+
+class TestLazy:
+    def setup_method(self):
+        self.a = rosnet.rand((4, 6), blockshape=(2, 3))
+        self.b = rosnet.rand((6, 5), blockshape=(3, 5))
+
+    def test_deferred(self):
+        counter = CountingExecutor()
+        with executor(counter), rosnet.lazy():
+            c = np.tensordot(self.a, self.b, 1) + 1
+
+        assert isinstance(c, LazyArray)
+        assert c.shape == (4, 5)
+        assert counter.calls == 0
+
+    def test_compute(self):
+        with rosnet.lazy():
+            c = np.tensordot(self.a, self.b, 1) * 2 - self.a[:, :5]
+            s = np.sum(c)
+
+        expected = np.asarray(self.a) @ np.asarray(self.b) * 2 - np.asarray(self.a)[:, :5]
+        res, total = rosnet.compute(c, s)
+        assert np.allclose(np.asarray(res), expected)
+        assert np.isclose(float(total), expected.sum())
+        assert np.allclose(np.asarray(c), expected)
+
+    def test_common_subexpression(self, monkeypatch):
+        calls = []
+        tensordot = rosnet.dispatch.tensordot
+        monkeypatch.setattr(rosnet.dispatch, "tensordot", lambda *args, **kwargs: calls.append(args) or tensordot(*args, **kwargs))
+
+        with rosnet.lazy() as graph:
+            c = np.tensordot(self.a, self.b, 1)
+            d = np.tensordot(self.a, self.b, 1)
+            e = c + d
+
+        assert c is d
+        assert len(graph.nodes) == 2
+        assert not calls
+
+        e.compute()
+        assert len(calls) == 1
+
+    def test_transpose_cancels(self):
+        with rosnet.lazy():
+            c = np.tensordot(self.a, self.b, 1)
+            assert np.transpose(np.transpose(c)) is c
+            assert c.T.T is c
+            assert np.transpose(np.transpose(c, (1, 0)), (1, 0)) is c
+
+            t = np.transpose(np.transpose(np.tensordot(self.a, self.a, 0), (1, 0, 2, 3)), (0, 2, 1, 3))
+            assert t.args[1] == (1, 2, 0, 3)
+
+    def test_reshape_cancels(self):
+        x = rosnet.rand((4, 6), blockshape=(4, 6))
+        with rosnet.lazy():
+            assert np.reshape(np.reshape(x, (24,)), (4, 6)) is x
+            assert np.reshape(np.reshape(x, (2, 12)), (3, -1)).args[0] is x
+
+            y = np.reshape(x, (3, 8))
+        assert np.array_equal(np.asarray(y), np.asarray(np.reshape(x, (3, 8))))
+
+    def test_reshape_order(self):
+        x = rosnet.rand((4, 6), blockshape=(4, 6))
+        with rosnet.lazy():
+            # NOTE `BlockArray` reshapes in "F" order by default
+            y = np.reshape(np.reshape(x, (6, 4)), (4, 6), order="C")
+            z = np.reshape(np.reshape(x, (6, 4), order="C"), (4, 6), order="C")
+
+        assert y is not x
+        assert z is x
+        assert np.array_equal(np.asarray(y), np.asarray(np.reshape(np.reshape(x, (6, 4)), (4, 6), order="C")))
+
+    def test_inplace(self):
+        a = rosnet.full((2, 2), 1.0, blockshape=(1, 2))
+        orig = a
+        with rosnet.lazy():
+            c = a * 2
+            a += 1
+            d = orig * 2
+
+        assert a is orig
+        assert d is not c
+        assert np.allclose(np.asarray(c), 2.0)
+        assert np.allclose(np.asarray(d), 4.0)
+
+    def test_inplace_lazy(self):
+        a = rosnet.full((2, 2), 1.0, blockshape=(1, 2))
+        with rosnet.lazy():
+            x = a * 2
+            y = x + 1
+            x += 1
+            z = x + 1
+            w = np.multiply(a, 3, out=rosnet.zeros((2, 2), blockshape=(1, 2)))
+
+        assert isinstance(x, LazyArray)
+        assert np.allclose(np.asarray(y), 3.0)
+        assert np.allclose(np.asarray(z), 4.0)
+        assert np.allclose(np.asarray(w), 3.0)
+
+    def test_setitem(self):
+        a = rosnet.full((2, 2), 1.0, blockshape=(1, 2))
+        with rosnet.lazy():
+            c = a * 2
+            t = np.transpose(a) + 1
+            a[0, 0] = 100
+            d = a * 2
+
+        assert d is not c
+        assert np.allclose(np.asarray(c), 2.0)
+        assert np.allclose(np.asarray(t), 2.0)
+        assert np.asarray(a)[0, 0] == 100
+        assert np.asarray(d)[0, 0] == 200
+
+    def test_eager_outside(self):
+        with rosnet.lazy():
+            pass
+
+        assert not isinstance(np.tensordot(self.a, self.b, 1), LazyArray)
+        assert not isinstance(self.a + 1, LazyArray)
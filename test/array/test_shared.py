@@ -0,0 +1,82 @@
+import pickle
+
+import numpy as np
+import pytest
+import rosnet
+from rosnet.array.shared import ProcessExecutor, SharedArray
+from rosnet.core.executor import executor
+
+
+class TestSharedArray:
+    def test_from_array(self):
+        data = np.arange(12.0).reshape(3, 4)
+        arr = SharedArray.from_array(data)
+
+        assert arr.segment is not None
+        assert np.array_equal(arr, data)
+
+    def test_view(self):
+        arr = SharedArray.from_array(np.arange(12.0).reshape(3, 4))
+        view = arr.T[1:]
+
+        assert isinstance(view, SharedArray)
+        assert view.segment is arr.segment
+
+    def test_result_not_shared(self):
+        arr = SharedArray.from_array(np.ones((2, 2)))
+
+        assert type(arr + 1) is np.ndarray
+        assert type(np.tensordot(arr, arr, 1)) is np.ndarray
+
+    @pytest.mark.parametrize("key", [(), (slice(1, None),), (slice(None), 2)])
+    def test_pickle_attaches(self, key):
+        arr = SharedArray.from_array(np.arange(12.0).reshape(3, 4))
+        view = arr.T[key]
+        res = pickle.loads(pickle.dumps(view))
+
+        assert res.segment is arr.segment
+        assert np.array_equal(res, view)
+
+
+def test_blockarray_inner():
+    a = rosnet.ones((4, 4), blockshape=(2, 2), inner="rosnet.array.shared")
+
+    assert all(isinstance(block, SharedArray) for block in a.data.flat)
+
+
+class TestProcessExecutor:
+    def test_map(self):
+        blocks = [SharedArray.from_array(np.full((2, 2), i)) for i in range(4)]
+
+        with ProcessExecutor(2) as ex:
+            res = ex.map(np.transpose, blocks)
+
+        assert all(isinstance(block, SharedArray) and block.segment.owner for block in res)
+        assert all(np.array_equal(block, np.full((2, 2), i)) for i, block in enumerate(res))
+
+    def test_tensordot(self):
+        a = rosnet.rand((160, 120), blockshape=(80, 60), inner="rosnet.array.shared")
+        b = rosnet.rand((120, 80), blockshape=(60, 80), inner="rosnet.array.shared")
+
+        with executor("processes", max_workers=2):
+            c = np.tensordot(a, b, [(1,), (0,)])
+
+        # results come back through shared memory, so they were computed by the workers
+        assert all(isinstance(block, SharedArray) and block.segment.owner for block in c.data.flat)
+        assert np.allclose(np.array(c), np.array(a) @ np.array(b))
+
+    def test_linalg(self):
+        a = rosnet.rand((8, 6), blockshape=(4, 6), inner="rosnet.array.shared")
+
+        with executor("processes", max_workers=2):
+            q, r = np.linalg.qr(a)
+            u, s, vh = rosnet.linalg.rsvd(a, 6, seed=0)
+
+        assert np.allclose(np.array(q) @ np.array(r), np.array(a))
+        assert np.allclose(np.array(u) @ np.diag(np.array(s)) @ np.array(vh), np.array(a))
+
+    def test_rand_independent(self):
+        with ProcessExecutor(2) as ex:
+            a = rosnet.rand((8, 8), blockshape=(2, 2), executor=ex)
+
+        assert len({float(block.flat[0]) for block in a.data.flat}) == a.nblock
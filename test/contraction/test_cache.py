@@ -0,0 +1,127 @@
+import os
+
+import numpy as np
+import opt_einsum as oe
+import pytest
+import rosnet
+from rosnet.contraction.cache import PathCache, settings
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return PathCache(tmp_path)
+
+
+def test_roundtrip(cache):
+    key = PathCache.key(eq="ab,bc->ac", shapes=[(2, 3), (3, 4)])
+
+    assert cache.get(key) is None
+
+    cache.put(key, {"path": [[0, 1]], "sliced": ["b"]})
+
+    assert cache.get(key) == {"path": [[0, 1]], "sliced": ["b"]}
+    assert len(cache) == 1
+
+
+def test_key():
+    assert PathCache.key(eq="ab,bc->ac", shapes=[(2, 3)]) == PathCache.key(shapes=[(2, 3)], eq="ab,bc->ac")
+    assert PathCache.key(eq="ab,bc->ac", shapes=[(2, 3)]) != PathCache.key(eq="ab,bc->ac", shapes=[(2, 4)])
+
+
+def test_corrupted(cache):
+    key = PathCache.key(eq="ab->a")
+    cache.put(key, {})
+    (cache.directory / f"{key}.json").write_text("{")
+
+    assert cache.get(key) is None
+
+
+def test_vanished(cache, monkeypatch):
+    key = PathCache.key(eq="ab->a")
+    cache.put(key, {})
+
+    def utime(*args):
+        raise PermissionError()
+
+    monkeypatch.setattr(os, "utime", utime)
+    assert cache.get(key) is None
+
+
+def test_put_failure(cache):
+    key = PathCache.key(eq="ab->a")
+
+    with pytest.raises(TypeError):
+        cache.put(key, {"path": object()})
+
+    assert list(cache.directory.iterdir()) == []
+
+
+def test_evict(tmp_path):
+    cache = PathCache(tmp_path)
+    value = {"path": [[0, 1]] * 10}
+
+    keys = [PathCache.key(i=i) for i in range(5)]
+    for i, key in enumerate(keys):
+        cache.put(key, value)
+        # NOTE force distinct modification times
+        os.utime(cache.directory / f"{key}.json", (i, i))
+
+    cache.get(keys[0])
+    cache.max_size = 200
+    cache.evict()
+
+    assert sum(path.stat().st_size for path in tmp_path.glob("*.json")) <= 200
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+
+
+def test_default_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv("ROSNET_CACHE_DIR", str(tmp_path))
+
+    assert PathCache().directory == tmp_path
+
+
+def test_settings():
+    assert settings("greedy") == "greedy"
+    assert settings(oe.DynamicProgramming(minimize="flops")) == settings(oe.DynamicProgramming(minimize="flops"))
+    assert settings(oe.DynamicProgramming(minimize="flops")) != settings(oe.DynamicProgramming(minimize="size"))
+
+
+def test_contract(tmp_path, monkeypatch):
+    calls = []
+    contract_path = oe.contract_path
+    monkeypatch.setattr(oe, "contract_path", lambda *args, **kwargs: calls.append(kwargs["optimize"]) or contract_path(*args, **kwargs))
+
+    cache = PathCache(tmp_path)
+    arrays = [np.random.rand(4, 5), np.random.rand(5, 6), np.random.rand(6, 4)]
+
+    a = rosnet.contract("ab,bc,ca->", *arrays, optimize="greedy", target_slices=4, cache=cache)
+    b = rosnet.contract("ab,bc,ca->", *arrays, optimize="greedy", target_slices=4, cache=cache)
+
+    assert len(cache) == 1
+    assert calls[0] == "greedy" and isinstance(calls[1], list)
+    assert np.allclose(a, b)
+    assert np.allclose(a, np.einsum("ab,bc,ca->", *arrays))
+
+
+@pytest.mark.parametrize("entry", [{"path": [[0, 5]], "sliced": []}, {"path": [[0, 1]], "sliced": []}, {"path": [[0, 1], [0, 1]], "sliced": ["z"]}, {"sliced": []}, []])
+def test_contract_invalid(tmp_path, entry):
+    cache = PathCache(tmp_path)
+    arrays = [np.random.rand(4, 5), np.random.rand(5, 6), np.random.rand(6, 4)]
+    rosnet.contract("ab,bc,ca->", *arrays, optimize="greedy", cache=cache)
+    (key,) = (path.stem for path in tmp_path.glob("*.json"))
+    cache.put(key, entry)
+
+    res = rosnet.contract("ab,bc,ca->", *arrays, optimize="greedy", cache=cache)
+
+    assert np.allclose(res, np.einsum("ab,bc,ca->", *arrays))
+    # the entry is replaced by a valid one
+    assert len(cache.get(key)["path"]) == 2
+
+
+def test_contract_disabled(tmp_path, monkeypatch):
+    monkeypatch.setenv("ROSNET_CACHE_DIR", str(tmp_path))
+
+    rosnet.contract("ab,bc->ac", np.random.rand(2, 3), np.random.rand(3, 4), cache=False)
+
+    assert len(PathCache()) == 0
@@ -0,0 +1,148 @@
+import numpy as np
+import opt_einsum as oe
+import pytest
+import rosnet
+from rosnet import BlockArray
+from rosnet.contraction import execute
+from rosnet.contraction.plan import Plan
+from rosnet.contraction.slicing import cost, find_slices, peak_size
+
+EQ = "ab,bcd,de,ea,cf->f"
+SHAPES = [(4, 5), (5, 6, 3), (3, 4), (4, 4), (6, 7)]
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("ROSNET_CACHE_DIR", str(tmp_path))
+    return tmp_path
+
+
+def network(eq=EQ, shapes=SHAPES):
+    path, info = oe.contract_path(eq, *shapes, shapes=True)
+    return info.input_subscripts.split(","), info.output_subscript, dict(info.size_dict), path
+
+
+@pytest.mark.parametrize(
+    "memory_limit,target_slices",
+    [
+        (None, None),
+        (None, 8),
+        (8 * 20, None),
+        (8 * 8, 30),
+    ],
+)
+def test_find_slices(memory_limit, target_slices):
+    inputs, output, size_dict, path = network()
+
+    sliced = find_slices(inputs, output, size_dict, path, memory_limit=memory_limit, target_slices=target_slices, method="greedy")
+
+    if memory_limit is not None:
+        assert peak_size(inputs, output, size_dict, path, sliced) * 8 <= memory_limit
+    if target_slices is not None:
+        assert np.prod([size_dict[c] for c in sliced]) >= target_slices
+    if memory_limit is None and target_slices is None:
+        assert sliced == frozenset()
+
+
+def test_find_slices_unfeasible():
+    inputs, output, size_dict, path = network()
+
+    with pytest.raises(MemoryError):
+        find_slices(inputs, output, size_dict, path, memory_limit=1, method="greedy")
+
+
+def test_find_slices_options_greedy():
+    inputs, output, size_dict, path = network()
+
+    with pytest.raises(ValueError):
+        find_slices(inputs, output, size_dict, path, target_slices=2, method="greedy", temperature=0.1)
+
+
+def test_cost():
+    inputs, output, size_dict, path = network()
+
+    assert cost(inputs, output, size_dict, path) <= cost(inputs, output, size_dict, path, frozenset("c"))
+
+
+@pytest.mark.parametrize(
+    "memory_limit,target_slices",
+    [
+        (None, None),
+        (None, 8),
+        (8 * 20, None),
+        (8 * 8, 30),
+    ],
+)
+def test_contract(memory_limit, target_slices):
+    arrays = [np.random.rand(*shape) for shape in SHAPES]
+
+    res = rosnet.contract(EQ, *arrays, memory_limit=memory_limit, target_slices=target_slices)
+
+    assert isinstance(res, BlockArray)
+    assert np.allclose(np.array(res), np.einsum(EQ, *arrays))
+
+
+def test_contract_sliced_output():
+    a, b = np.random.rand(4, 6), np.random.rand(6, 5)
+
+    res = rosnet.contract("ab,bc->ac", a, b, memory_limit=8 * 6)
+
+    assert res.grid != (1, 1)
+    assert np.allclose(np.array(res), a @ b)
+
+
+def test_contract_scalar():
+    arrays = [np.random.rand(3, 3) for _ in range(3)]
+
+    res = rosnet.contract("ab,bc,ca->", *arrays, target_slices=4)
+
+    assert np.ndim(res) == 0 and not isinstance(res, np.ndarray)
+    assert np.allclose(res, np.einsum("ab,bc,ca->", *arrays))
+
+
+def test_contract_blockarray():
+    a = rosnet.rand((4, 6), blockshape=(2, 3))
+    b = rosnet.rand((6, 5), blockshape=(6, 5))
+
+    res = rosnet.contract("ab,bc->ac", a, b, target_slices=6)
+
+    assert np.allclose(np.array(res), np.array(a) @ np.array(b))
+
+
+def test_contract_hadamard():
+    a, b = np.random.rand(3, 4), np.random.rand(4, 3)
+
+    res = rosnet.contract("ab,ba->a", a, b, target_slices=2)
+
+    assert np.allclose(np.array(res), np.einsum("ab,ba->a", a, b))
+
+
+def test_contract_threads():
+    arrays = [np.random.rand(*shape) for shape in SHAPES]
+
+    with rosnet.executor("threads", max_workers=4):
+        res = rosnet.contract(EQ, *arrays, target_slices=8)
+
+    assert np.allclose(np.array(res), np.einsum(EQ, *arrays))
+
+
+def test_reuse_invariant():
+    eq, shapes, path = "ab,bc,cd,de->ae", [(2, 3), (3, 4), (4, 5), (5, 6)], [(0, 1), (0, 2), (0, 1)]
+    arrays = [np.random.rand(*shape) for shape in shapes]
+    _, info = oe.contract_path(eq, *shapes, shapes=True, optimize=path)
+    steps = [(ids, eq) for ids, _, eq, _, _ in info.contraction_list]
+
+    # slice 'd' and 'e': 'ab,bc->ac' is invariant and 'ac,cd->ad' only depends on 'd'
+    plan = Plan.compile(info.input_subscripts.split(","), "ae", steps, ["d", "e"], dict(info.size_dict))
+
+    assert [sum(task.eq == eq for task in plan.tasks) for _, eq in steps] == [1, 5, 30]
+    assert plan.result[0] == ("e",)
+    assert np.allclose(np.array(execute(plan, arrays)), np.einsum(eq, *arrays))
+
+
+def test_cost_reuse():
+    inputs, output, size_dict = ["ab", "bc", "cd", "de"], "ae", {"a": 2, "b": 3, "c": 4, "d": 5, "e": 6}
+    path = [(0, 1), (0, 1), (0, 1)]
+
+    # only the last step depends on 'e', so slicing it costs nothing
+    assert cost(inputs, output, size_dict, path, frozenset("e")) == cost(inputs, output, size_dict, path)
@@ -0,0 +1,86 @@
+import weakref
+
+import numpy as np
+import opt_einsum as oe
+import pytest
+from rosnet.contraction import compile_plan, execute
+from rosnet.contraction.plan import Plan
+
+EQ = "ab,bcd,de,ea,cf->f"
+SHAPES = [(4, 5), (5, 6, 3), (3, 4), (4, 4), (6, 7)]
+
+
+def build(eq, shapes, path, sliced, itemsize=8):
+    _, info = oe.contract_path(eq, *shapes, shapes=True, optimize=path)
+    steps = [(ids, eq) for ids, _, eq, _, _ in info.contraction_list]
+    return Plan.compile(info.input_subscripts.split(","), info.output_subscript, steps, sliced, dict(info.size_dict), itemsize)
+
+
+@pytest.mark.parametrize("sliced", [[], ["c"], ["a", "d"], ["b", "c", "f"]])
+def test_lifetimes(sliced):
+    plan = build(EQ, SHAPES, "greedy", sliced)
+    consumers = {}
+    for i, stage in enumerate(plan.stages):
+        for task in stage:
+            for ref in task.inputs:
+                consumers.setdefault(ref, []).append(i)
+
+    released = [ref for release in plan.release for ref in release]
+
+    # every block is released exactly once, after the stage of its last consumer
+    assert sorted(released) == sorted(consumers)
+    for i, release in enumerate(plan.release):
+        assert all(max(consumers[ref]) == i for ref in release)
+
+    # result blocks are never released
+    assert not set(plan.result[1].values()) & set(released)
+
+
+def test_memory():
+    # 'ab,bc->ac' and then 'ac,cd->ad', all of size 2
+    plan = build("ab,bc,cd->ad", [(2, 2)] * 3, [(0, 1), (0, 1)], [], itemsize=1)
+
+    assert plan.memory() == [4 * 4, 4 * 3]
+    assert plan.peak_memory() == 16
+    assert plan.peak_memory(nodes=4) == 12
+
+
+def test_peak_memory_sliced():
+    unsliced = build(EQ, SHAPES, "greedy", [])
+    sliced = build(EQ, SHAPES, "greedy", ["d"])
+
+    largest = lambda plan: max(task.nbytes for task in plan.tasks)
+    assert largest(sliced) < largest(unsliced)
+
+
+def test_compile_plan():
+    arrays = [np.random.rand(*shape) for shape in SHAPES]
+
+    plan = compile_plan(EQ, *arrays, target_slices=8, cache=False)
+
+    assert np.prod([plan.size_dict[c] for c in plan.sliced]) >= 8
+    assert "peak memory" in plan.report()
+    assert np.allclose(np.array(execute(plan, arrays)), np.einsum(EQ, *arrays))
+
+
+def test_execute_releases(monkeypatch):
+    import rosnet.contraction as contraction
+
+    plan = build(EQ, SHAPES, "greedy", ["c", "d"])
+    arrays = [np.random.rand(*shape) for shape in SHAPES]
+
+    refs = []
+    run = contraction._run
+
+    def spy(task, operands):
+        res = run(task, operands)
+        refs.append(weakref.ref(res))
+        return res
+
+    monkeypatch.setattr(contraction, "_run", spy)
+    res = execute(plan, arrays)
+
+    # only the blocks of the result are still alive
+    assert len(refs) == len(plan.tasks)
+    assert sum(ref() is not None for ref in refs) == len(plan.result[1])
+    assert np.allclose(np.array(res), np.einsum(EQ, *arrays))
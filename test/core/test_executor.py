@@ -0,0 +1,86 @@
+import threading
+
+import numpy as np
+import pytest
+import rosnet
+from rosnet.core.executor import SequentialExecutor, ThreadExecutor, executor, get_executor
+
+
+class TestGetExecutor:
+    def test_default(self):
+        assert isinstance(get_executor(), SequentialExecutor)
+
+    def test_by_name(self):
+        assert isinstance(get_executor("threads"), ThreadExecutor)
+        assert get_executor("threads") is get_executor("threads")
+
+    def test_instance(self):
+        ex = ThreadExecutor(2)
+        assert get_executor(ex) is ex
+
+    def test_invalid(self):
+        with pytest.raises(ValueError):
+            get_executor("gpu")
+
+
+class TestContext:
+    def test_context(self):
+        with executor("threads", max_workers=2) as ex:
+            assert get_executor() is ex
+            assert ex.max_workers == 2
+        assert isinstance(get_executor(), SequentialExecutor)
+
+    def test_nested(self):
+        with executor("threads") as outer:
+            with executor("sequential") as inner:
+                assert get_executor() is inner
+            assert get_executor() is outer
+
+
+class TestThreadExecutor:
+    def test_map_order(self):
+        with ThreadExecutor(4) as ex:
+            assert ex.map(lambda x, y: x * y, range(16), range(16)) == [i * i for i in range(16)]
+
+    def test_map_threads(self):
+        with ThreadExecutor(4) as ex:
+            names = ex.map(lambda _: threading.current_thread().name, range(8))
+        assert all(name.startswith("rosnet") for name in names)
+
+
+class CountingExecutor(ThreadExecutor):
+    def __init__(self, max_workers=None):
+        super().__init__(max_workers)
+        self.calls = []
+
+    def map(self, fn, *iterables):
+        args = [list(it) for it in iterables]
+        self.calls.append(len(args[0]))
+        return super().map(fn, *args)
+
+
+@pytest.mark.parametrize("ex", ["sequential", "threads"])
+@pytest.mark.parametrize("n,blockshape", [(1, (2, 3)), (40, (80, 60))])
+def test_blockarray_tensordot(ex, n, blockshape):
+    # NOTE blocks of the second case are above `BATCH_THRESHOLD`
+    a = rosnet.rand((4 * n, 6 * n), blockshape=blockshape, executor=ex)
+    b = rosnet.rand((6 * n, 8 * n), blockshape=blockshape[::-1], executor=ex)
+
+    with executor(ex):
+        c = np.tensordot(a, b, [(1,), (0,)])
+
+    assert c.grid == (2, 4)
+    assert np.allclose(np.array(c), np.array(a) @ np.array(b))
+
+
+@pytest.mark.parametrize("batch", [None, True])
+def test_blockarray_tensordot_uses_executor(batch):
+    a = rosnet.rand((4, 6), blockshape=(2, 3))
+    b = rosnet.rand((6, 8), blockshape=(3, 2))
+
+    with CountingExecutor(2) as ex:
+        c = rosnet.tensordot(a, b, [(1,), (0,)], executor=ex, batch=batch)
+
+    # small blocks are not batched into a single call in the calling thread
+    assert ex.calls == ([2] if batch else [8])
+    assert np.allclose(np.array(c), np.array(a) @ np.array(b))
@@ -49,3 +49,12 @@ class TestArrayInterface:
         from rosnet import DataClayArray
 
         assert issubclass(DataClayArray, Array)
+
+
+class TestNamespace:
+    def test_builtins_not_shadowed(self):
+        namespace = {}
+        exec("from rosnet import *", namespace)
+
+        assert all(name not in namespace for name in ("sum", "max", "min", "abs", "pow"))
+        assert "tensordot" in namespace and "prod" in namespace
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from rosnet.core.kernel import tensordot_accumulate, tensordot_batched
+
+
+@pytest.mark.parametrize(
+    "shape_a,shape_b,axes",
+    [
+        ((4, 3), (3, 5), 1),
+        ((2, 3, 4), (3, 4, 5), 2),
+        ((3, 2, 4), (4, 5, 3), ([0, 2], [2, 0])),
+        ((3, 2), (4, 5), 0),
+        ((2, 3), (3, 2), ([-1], [0])),
+    ],
+)
+def test_tensordot_accumulate(shape_a, shape_b, axes):
+    a = [np.random.rand(*shape_a) for _ in range(3)]
+    b = [np.random.rand(*shape_b) for _ in range(3)]
+
+    expected = sum(np.tensordot(ai, bi, axes) for ai, bi in zip(a, b))
+    assert np.allclose(tensordot_accumulate(a, b, axes), expected)
+
+
+def test_out():
+    a = [np.random.rand(4, 3) for _ in range(2)]
+    b = [np.random.rand(3, 5) for _ in range(2)]
+    out = np.ones((4, 5))
+
+    res = tensordot_accumulate(a, b, 1, out=out)
+
+    assert np.shares_memory(res, out)
+    assert np.allclose(out, 1 + a[0] @ b[0] + a[1] @ b[1])
+
+
+def test_out_invalid():
+    with pytest.raises(ValueError):
+        tensordot_accumulate([np.ones((2, 3))], [np.ones((3, 2))], 1, out=np.zeros((4, 4))[::2, ::2])
+
+
+def test_dtype():
+    a = [np.arange(6).reshape(2, 3)] * 2
+    b = [np.arange(6, dtype=np.complex128).reshape(3, 2)] * 2
+
+    res = tensordot_accumulate(a, b, 1)
+
+    assert res.dtype == np.complex128
+    assert np.allclose(res, 2 * a[0] @ b[0])
+
+
+def test_many_blocks():
+    a = [np.random.rand(2, 3).astype(np.float32) for _ in range(40)]
+    b = [np.random.rand(3, 2) for _ in range(40)]
+
+    res = tensordot_accumulate(a, b, 1)
+
+    assert res.dtype == np.float64
+    assert np.allclose(res, sum(ai @ bi for ai, bi in zip(a, b)), rtol=1e-5)
+
+
+def test_tensordot_batched():
+    # irregular shapes along the contracted axis produce several batches per output block
+    a = [[np.random.rand(2, 3), np.random.rand(2, 1)] for _ in range(4)]
+    b = [[np.random.rand(3, 5), np.random.rand(1, 5)] for _ in range(4)]
+
+    res = tensordot_batched(a, b, 1)
+
+    assert len(res) == 4
+    for r, ai, bi in zip(res, a, b):
+        assert np.allclose(r, tensordot_accumulate(ai, bi, 1))
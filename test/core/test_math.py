@@ -1,7 +1,7 @@
 import pytest
 from typing import Tuple
 import numpy as np
-from rosnet.core.util import recurse, nest_level, measure_shape
+from rosnet.core.util import recurse, nest_level, measure_shape, summa_plan
 
 
 class MockArray:
@@ -108,3 +108,24 @@ class TestRecurseShapeTracker:
         arr.flat[0] = MockArray((1,))
 
         assert measure_shape(arr.tolist()) == tuple([1] * level)
+
+
+@pytest.mark.parametrize("rows,cols,inner,procs", [(4, 6, 3, (2, 3)), (5, 7, 2, (2, 2)), (3, 3, 4, (1, 1)), (2, 2, 2, (4, 4))])
+def test_summa_plan(rows, cols, inner, procs):
+    inputs_a, inputs_b, updates = {}, {}, {}
+    for l, tile_rows, tile_cols in summa_plan(rows, cols, inner, procs):
+        for i in tile_rows:
+            inputs_a[i, l] = inputs_a.get((i, l), 0) + 1
+        for j in tile_cols:
+            inputs_b[l, j] = inputs_b.get((l, j), 0) + 1
+        for i in tile_rows:
+            for j in tile_cols:
+                updates[i, j, l] = updates.get((i, j, l), 0) + 1
+
+    pr, pc = min(procs[0], rows), min(procs[1], cols)
+
+    # every block of `a` is sent to one task per column of processes, and every block of `b` to one per row
+    assert inputs_a == {(i, l): pc for i in range(rows) for l in range(inner)}
+    assert inputs_b == {(l, j): pr for l in range(inner) for j in range(cols)}
+    # every block product is computed exactly once
+    assert updates == {(i, j, l): 1 for i in range(rows) for j in range(cols) for l in range(inner)}
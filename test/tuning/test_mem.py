@@ -0,0 +1,31 @@
+from math import prod
+
+import numpy as np
+import pytest
+from rosnet.tuning import mem
+
+
+def footprint(bs_a, bs_b, out):
+    return (prod(bs_a) + prod(bs_b) + prod(out)) * 8
+
+
+class TestTensordotBlockshape:
+    def test_fits(self):
+        assert mem.tensordot_blockshape((10, 20), (20, 5), ((1,), (0,)), np.float64, 10**6) == ((10, 20), (20, 5))
+
+    @pytest.mark.parametrize("memory_limit", [20000, 5000, 1000, 100])
+    def test_split(self, memory_limit):
+        bs_a, bs_b = mem.tensordot_blockshape((40, 30), (30, 20), ((1,), (0,)), np.float64, memory_limit)
+
+        assert bs_a[1] == bs_b[0]
+        assert footprint(bs_a, bs_b, (bs_a[0], bs_b[1])) <= memory_limit
+
+    def test_contracted_axes(self):
+        # output is small, so the contracted axes must be split
+        bs_a, bs_b = mem.tensordot_blockshape((2, 1000), (1000, 2), ((1,), (0,)), np.float64, 8000)
+
+        assert bs_a[1] == bs_b[0] < 1000
+
+    def test_impossible(self):
+        with pytest.raises(MemoryError):
+            mem.tensordot_blockshape((4, 4), (4, 4), ((1,), (0,)), np.float64, 16)